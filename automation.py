@@ -0,0 +1,513 @@
+"""
+Job Application Automation - Browser Flow
+=========================================
+Opening URLs in the user's Chrome, and the Selenium open/auto-login flow
+shared by the web UI and the command line. Importing this module does not
+load Gradio or Selenium; Selenium is only imported when a browser starts.
+"""
+
+import subprocess
+import time
+import json
+
+from devtools_tabs import DEVTOOLS, DevToolsUnavailable, find_chrome
+from driver_pool import DriverPool
+from form_fill import AUTO_FILL_FORMS, fill_form, format_report, is_application_form
+from history_store import HISTORY, SKIP_DUPLICATES
+import lean_profile
+from lean_profile import PROFILE_STATS, apply_request_blocking, browser_rss, clear_request_blocking, missing_resources, profile_name
+from login_detection import detect_login_fields, platform_login_fields
+from page_classifier import classify_page, format_evidence
+from platforms import REGISTRY, path_label
+from selector_cache import SELECTOR_CACHE, host_of
+from session_store import SESSION_STORE, clear_restore_script, restore_session
+from tab_manager import TABS, login_realm
+from tracing import record_span, span
+from page_readiness import (
+    any_of,
+    credential_field_present,
+    document_ready,
+    dom_quiescent,
+    element_visible,
+    mark_activity,
+    network_idle,
+    url_changed,
+    wait_for,
+)
+
+# Warm Chrome sessions shared by every auto-login request
+DRIVER_POOL = DriverPool()
+
+# How "Open in Same Browser" reaches the user's Chrome: "devtools" (one persistent
+# DevTools connection; falls back to the command line if Chrome has no debugging
+# endpoint) or "subprocess" (`chrome --new-tab URL` per URL)
+OPEN_MODE = "devtools"
+
+def _report(progress, message):
+    """Print a phase message and forward it to a streaming handler, if any"""
+    print(message)
+    if progress:
+        progress(message)
+
+def auto_login_if_needed(driver, progress=None, host=None, platform=None):
+    """Detect if login is needed and automatically login using credentials from JSON.
+    
+    platform is the registry entry for the requested URL (None = generic path).
+    """
+    route = {}
+    status = _auto_login(driver, progress, host, platform, route)
+    REGISTRY.note_path(path_label(route.get("platform"), route.get("fell_back")))
+    return status
+
+def _auto_login(driver, progress, host, platform, route):
+    """auto_login_if_needed, recording the platform path taken in `route`"""
+    
+    # Spans are tagged with the requested site's host (the login page may live elsewhere)
+    trace_host = host or ""
+    route.update(platform=None, fell_back=False)
+    
+    try:
+        # Load login credentials from personal_data.json
+        with open('personal_data.json', 'r', encoding='utf-8') as file:
+            data = json.load(file)
+        
+        username = data['login_credentials']['username']
+        password = data['login_credentials']['password']
+        
+        _report(progress, "🔍 Checking for login page...")
+        
+        # Wait until the page is loaded and shows the platform's app-ready marker or a
+        # credential field (unknown sites: a credential field or a DOM that stops changing)
+        with span("page_ready", host=trace_host) as s:
+            if platform is not None and platform.ready_selector:
+                signal = any_of(
+                    element_visible(platform.ready_selector, "platform_ready", platform.ready_timeout),
+                    credential_field_present(),
+                )
+            else:
+                signal = any_of(credential_field_present(), dom_quiescent())
+            ready = wait_for(driver, "login detection", [document_ready(), signal])
+            s.outcome = "ok" if ready["met"] else "timeout"
+        
+        # A recognized platform (or the SSO page it redirected to) skips page classification
+        fast = None
+        if platform is not None and ready["met"]:
+            current_url = driver.current_url
+            fast = REGISTRY.resolve(current_url) or platform
+            route["platform"] = fast
+        elif platform is not None:
+            print(f"⚠️ {platform.label} never signalled ready, falling back to generic detection")
+            route.update(platform=platform, fell_back=True)
+        
+        if fast is not None:
+            is_login_page = fast.needs_login and (
+                element_visible(fast.login_field_selector).check(driver)
+                or credential_field_present().check(driver)
+            )
+            trace_host = trace_host or host_of(current_url)
+            print(f"🧩 {fast.label} fast path: {'login form' if is_login_page else 'no login form'} at {current_url}")
+        else:
+            # Classify the page in-browser (title, forms, labels, alerts) instead of pulling the full DOM
+            with span("classify", host=trace_host) as s:
+                page = classify_page(driver)
+                s.outcome = page["verdict"]
+            current_url = page["url"]
+            trace_host = trace_host or host_of(current_url)
+            print(f"📍 Current URL: {current_url}")
+            print(f"📄 Page Title: {page['title']}")
+            print(f"🔍 Login indicators found: {format_evidence({'login': page['evidence']['login']})}")
+            
+            # Check if it's a login page
+            is_login_page = page["is_login_page"]
+        
+        if is_login_page:
+            _report(progress, "🔐 Login page detected! Attempting automatic login...")
+            
+            login_host = host_of(current_url)
+            with span("field_detection", host=trace_host) as s:
+                fields = None
+                if fast is not None:
+                    # Known platform: resolve its selectors directly
+                    fields = platform_login_fields(driver, fast.login_selectors, fast.label)
+                    if not (fields["username"] and fields["password"]):
+                        print(f"⚠️ {fast.label} selectors did not match, falling back to generic detection")
+                        route["fell_back"] = True
+                        fields = None
+                if fields is None:
+                    # Try selectors learned for this host first, else score every input/button in one pass
+                    fields = detect_login_fields(driver, host=login_host, cache=SELECTOR_CACHE)
+                s.tags["mode"] = fields["mode"]
+                s.outcome = "ok" if fields["username"] and fields["password"] else "missing"
+            username_field = fields["username"]
+            password_field = fields["password"]
+            submit_button = fields["submit"]
+            
+            for role in ("username", "password", "submit"):
+                if fields["selectors"][role]:
+                    score = fields["scores"][role]
+                    score_text = f" (score {score:.0f})" if score is not None else ""
+                    print(f"✅ Best {role} candidate: {fields['selectors'][role]}{score_text}")
+            
+            # Show what we found
+            print(f"📊 Fields found - Username: {'✅' if username_field else '❌'}, Password: {'✅' if password_field else '❌'}, Submit: {'✅' if submit_button else '❌'}")
+            
+            # Perform login if we found the necessary fields
+            if username_field and password_field:
+                _report(progress, "🔑 Filling in login credentials...")
+                
+                try:
+                    with span("credential_fill", host=trace_host):
+                        # Clear and fill username
+                        username_field.clear()
+                        username_field.send_keys(username)
+                        print(f"✅ Entered username: {username}")
+                        
+                        # Clear and fill password
+                        password_field.clear()
+                        password_field.send_keys(password)
+                        print("✅ Entered password: ••••••••")
+                    
+                    # Submit the form
+                    with span("submit", host=trace_host):
+                        mark_activity(driver)
+                        if submit_button:
+                            _report(progress, "🚀 Clicking submit button...")
+                            driver.execute_script("arguments[0].click();", submit_button)
+                        else:
+                            # Try pressing Enter on password field if no submit button found
+                            from selenium.webdriver.common.keys import Keys
+                            _report(progress, "⏎ Pressing Enter to submit...")
+                            password_field.send_keys(Keys.RETURN)
+                    
+                    with span("verification", host=trace_host) as s:
+                        # Wait for the submit to navigate (or the SPA to settle), then for the new page to load
+                        _report(progress, "⏳ Waiting for login to complete...")
+                        signals = [url_changed(current_url), dom_quiescent(quiet_ms=1000)]
+                        success_marker = None
+                        if fields["mode"] == "platform" and fast.success_selector:
+                            success_marker = element_visible(fast.success_selector, "success_marker")
+                            signals.insert(0, success_marker)
+                        wait_for(driver, "login submit", [any_of(*signals)])
+                        wait_for(driver, "post-login load", [document_ready(), network_idle()])
+                        
+                        if success_marker is not None and success_marker.check(driver):
+                            # The platform's signed-in marker is proof enough
+                            result = {"verdict": "success", "url": driver.current_url, "evidence": {}}
+                        else:
+                            # Check if login was successful by looking at URL change, login form and error regions
+                            result = classify_page(driver, start_url=current_url)
+                        s.outcome = result["verdict"]
+                    
+                    print(f"📍 New URL after login: {result['url']}")
+                    print(f"🔍 Evidence: {format_evidence(result['evidence'])}")
+                    
+                    if result["verdict"] == "error":
+                        return "⚠️ Login attempted but failed - error detected on page"
+                    elif result["verdict"] == "login":
+                        if fields["mode"] == "cache":
+                            # The learned selectors led nowhere - relearn them next time
+                            SELECTOR_CACHE.invalidate(login_host, fields["fingerprint"])
+                        return "⚠️ Login attempted but still on login page - may have failed"
+                    else:
+                        # Remember what worked so the next visit to this host skips detection
+                        if fields["mode"] != "platform":
+                            SELECTOR_CACHE.record(
+                                login_host,
+                                fields["fingerprint"],
+                                fields["css"],
+                                None if fields["mode"] == "cache" else fields["elapsed_ms"],
+                            )
+                        return "✅ Login completed successfully! Page changed after login."
+                        
+                except Exception as e:
+                    return f"❌ Error during login form submission: {str(e)}"
+                    
+            else:
+                missing = []
+                if not username_field:
+                    missing.append("username")
+                if not password_field:
+                    missing.append("password")
+                return f"⚠️ Login page detected but couldn't find {', '.join(missing)} field(s) - please login manually"
+        
+        else:
+            return "ℹ️ No login required - page loaded directly"
+            
+    except Exception as e:
+        return f"⚠️ Error during login process: {str(e)}"
+
+def open_url_in_chrome(url, skip_duplicates=None):
+    """Open the provided URL as a new tab of the user's Chrome"""
+    
+    if not url:
+        return "❌ Please enter a URL"
+    
+    return open_urls_in_chrome([url], skip_duplicates)[0]
+
+def open_urls_in_chrome(urls, skip_duplicates=None):
+    """Open URLs as new tabs of the user's Chrome in one batch; returns one status per URL"""
+    
+    urls = [url if url.startswith(('http://', 'https://')) else 'https://' + url for url in urls]
+    
+    # Skip postings that were already opened (same canonical URL)
+    skip = SKIP_DUPLICATES if skip_duplicates is None else skip_duplicates
+    statuses = [HISTORY.skip_message(url) if skip else None for url in urls]
+    todo = [url for url, status in zip(urls, statuses) if status is None]
+    
+    opened = iter(_open_in_chrome(todo) if todo else [])
+    for index, status in enumerate(statuses):
+        if status is None:
+            url = urls[index]
+            status, elapsed_ms = next(opened)
+            HISTORY.record(url, "open", "failed" if status.startswith("❌") else "opened", status, elapsed_ms)
+            statuses[index] = status
+    return statuses
+
+def _record_duration(phase, elapsed_ms, **tags):
+    """Record a span whose duration was measured elsewhere"""
+    record_span(phase, time.perf_counter() - elapsed_ms / 1000, **tags)
+
+def _open_in_chrome(urls):
+    """Open urls as new tabs of the user's Chrome; returns [(status, elapsed ms)]"""
+    
+    if OPEN_MODE == "devtools":
+        try:
+            results = DEVTOOLS.open_tabs(urls)
+        except DevToolsUnavailable as e:
+            print(f"ℹ️ {e} - using the Chrome command line instead")
+        else:
+            opened = []
+            for result in results:
+                host = host_of(result["url"])
+                if result["error"]:
+                    _record_duration("open_devtools", 0, host=host, outcome="error")
+                    opened.append((f"❌ Error opening in existing Chrome: {result['error']}", None))
+                    continue
+                _record_duration("open_devtools", result["open_ms"], host=host)
+                if result["loaded"]:
+                    _record_duration("tab_load", result["load_ms"], host=host)
+                    load_line = f"⏱️ Tab opened in {result['open_ms']:.0f} ms, page loaded in {result['load_ms']:.0f} ms"
+                else:
+                    load_line = f"⚠️ Tab opened in {result['open_ms']:.0f} ms but the page has not finished loading"
+                opened.append((_opened_status(result["url"], load_line), result["load_ms"] or result["open_ms"]))
+            return opened
+    
+    return [_open_with_subprocess(url) for url in urls]
+
+def _open_with_subprocess(url):
+    """Open url with `chrome --new-tab` (no load feedback); returns (status, elapsed ms)"""
+    
+    started = time.perf_counter()
+    try:
+        chrome_path = find_chrome()
+        if chrome_path is None:
+            raise FileNotFoundError("Chrome executable not found")
+        
+        # Open URL in new tab of existing Chrome
+        subprocess.run([chrome_path, "--new-tab", url], check=False)
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        record_span("open_subprocess", started, host=host_of(url))
+        return _opened_status(url, f"⏱️ Chrome command returned in {elapsed_ms:.0f} ms"), elapsed_ms
+        
+    except Exception as e:
+        record_span("open_subprocess", started, host=host_of(url), outcome="error")
+        return (f"❌ Error opening in existing Chrome: {str(e)}\n🔄 Falling back to separate browser with auto-login...",
+                (time.perf_counter() - started) * 1000)
+
+def _opened_status(url, timing_line):
+    """Status text for a tab opened in the user's Chrome"""
+    
+    # Check if URL likely needs login (known ATS platforms via the registry's host index)
+    if REGISTRY.needs_login_likely(url):
+        return f"✅ Successfully opened in new tab: {url}\n{timing_line}\n🌐 Check your Chrome browser for the new tab!\n⚠️ **IMPORTANT**: This opened in your existing Chrome browser (same tabs).\n🔐 **Manual Login Required**: You'll need to login manually as auto-login requires a separate browser.\n\n💡 **Tip**: If you need auto-login, click 'Force Auto-Login' button below."
+    return f"✅ Successfully opened in new tab: {url}\n{timing_line}\n🌐 Check your Chrome browser for the new tab!\n✅ Gradio interface remains open for more URLs."
+
+def _login_outcome(login_status):
+    """Short outcome tag for a login status string"""
+    if login_status.startswith("✅ Restored"):
+        return "restored"
+    if login_status.startswith("✅ Reused"):
+        return "reused"
+    if login_status.startswith("✅"):
+        return "logged_in"
+    if login_status.startswith("ℹ️"):
+        return "no_login"
+    return "failed"
+
+def _on_application_form(driver, platform):
+    """Whether the page the flow ended on is a known platform's application form"""
+    try:
+        return is_application_form(driver, REGISTRY.resolve(driver.current_url) or platform)
+    except Exception as e:
+        print(f"⚠️ Could not check for an application form: {e}")
+        return False
+
+def open_url_with_autologin(url, progress=None, skip_duplicates=None, interactive=True):
+    """Force open URL with Selenium auto-login (separate browser).
+
+    interactive=False (batches) never reloads the page after lifting lean blocking.
+    """
+    
+    if not url:
+        return "❌ Please enter a URL"
+    
+    if not url.startswith(('http://', 'https://')):
+        url = 'https://' + url
+    
+    # Skip postings already logged into (same canonical URL) before borrowing a browser
+    if SKIP_DUPLICATES if skip_duplicates is None else skip_duplicates:
+        skipped = HISTORY.skip_message(url, actions=("login",))
+        if skipped:
+            _report(progress, skipped)
+            return skipped
+    
+    started = time.perf_counter()
+    host = host_of(url)
+    platform = REGISTRY.resolve(url)
+    realm = login_realm(url)
+    path = None
+    
+    try:
+        print("🎯 Using Selenium with auto-login (separate browser)...")
+        
+        # Borrow a warm Chrome session from the pool instead of cold-starting one,
+        # preferably one already signed into this URL's login realm
+        _report(progress, "🪟 Borrowing a browser session...")
+        with span("driver_acquire", host=host):
+            driver = DRIVER_POOL.acquire(prefer=TABS.prefer(realm))
+        
+        tab = None
+        ok = False
+        try:
+            # Each URL gets its own tab; earlier postings stay open in theirs
+            with span("tab_open", host=host):
+                tab = TABS.open_tab(driver, url)
+            reuse_login = TABS.is_logged_in(driver, realm)
+            _report(progress, f"🌐 Opening {url} in a new tab with auto-login capability...")
+            
+            # Restore a saved session for this host (cookies + localStorage) before navigating,
+            # unless another tab of this browser is already signed into the realm
+            snapshot = None if reuse_login else SESSION_STORE.load(host)
+            restore_script = None
+            if snapshot:
+                _report(progress, f"♻️ Restoring saved session for {host}...")
+                try:
+                    with span("session_restore", host=host):
+                        restore_script = restore_session(driver, snapshot)
+                except Exception as e:
+                    print(f"⚠️ Could not restore saved session: {e}")
+                    snapshot = None
+            
+            # Lean sessions skip images, fonts and analytics tags (SSO hosts stay allowlisted)
+            profile = profile_name()
+            blocked = 0
+            if profile == "lean":
+                try:
+                    blocked = apply_request_blocking(driver, url)
+                    print(f"🪶 Lean profile: blocking {blocked} URL pattern(s) for {host}")
+                except Exception as e:
+                    print(f"⚠️ Could not enable request blocking: {e}")
+            
+            # Navigate to the URL
+            with span("navigation", host=host, profile=profile) as s:
+                driver.get(url)
+                loaded = wait_for(driver, "navigation", [document_ready(), network_idle()])
+                s.outcome = "ok" if loaded["met"] else "timeout"
+            load_ms = (time.perf_counter() - s.started) * 1000
+            rss = browser_rss(driver)
+            TABS.record_memory(driver, rss)
+            clear_restore_script(driver, restore_script)
+            
+            login_status = None
+            if reuse_login:
+                # Cookies are shared by every tab: only check that the realm's login still holds
+                with span("login_reuse", host=host) as s:
+                    rejected = classify_page(driver)["is_login_page"]
+                    s.outcome = "rejected" if rejected else "ok"
+                TABS.note_reused(driver, realm, accepted=not rejected)
+                if rejected:
+                    _report(progress, f"🚫 Login for {realm} from another tab has expired, running full login...")
+                else:
+                    login_status = f"✅ Reused login for {realm} from another tab - login skipped"
+            elif snapshot:
+                # Only trust the restored session if the site did not bounce us to a login page
+                with span("session_verify", host=host) as s:
+                    rejected = classify_page(driver)["is_login_page"]
+                    s.outcome = "rejected" if rejected else "ok"
+                if rejected:
+                    _report(progress, "🚫 Saved session was rejected, running full login...")
+                    SESSION_STORE.discard(host, rejected=True)
+                else:
+                    SESSION_STORE.note_restored()
+                    login_status = "✅ Restored saved session - login skipped"
+            
+            if login_status is None:
+                # ALWAYS check for login and handle it automatically
+                _report(progress, "🔍 Checking for login requirements...")
+                login_started = time.perf_counter()
+                route = {}
+                login_status = _auto_login(driver, progress, host, platform, route)
+                path = path_label(route.get("platform"), route.get("fell_back"))
+                REGISTRY.note_path(path)
+                record_span("auto_login", login_started, host=host, outcome=_login_outcome(login_status), path=path)
+                
+                # Snapshot the verified login so the next visit can skip it
+                if login_status.startswith("✅ Login completed"):
+                    SESSION_STORE.save(host, driver)
+            
+            ok = _login_outcome(login_status) != "failed"
+            
+            # Later tabs on the same realm in this browser skip login
+            if _login_outcome(login_status) in ("logged_in", "restored"):
+                TABS.note_login(driver, realm)
+            
+            # The user works in this tab next: lift blocking, and (opt-in) reload what it kept out
+            if blocked:
+                try:
+                    clear_request_blocking(driver)
+                    if (lean_profile.RELOAD_AFTER_UNBLOCK and interactive and not lean_profile.HEADLESS_MODE
+                            and missing_resources(driver)):
+                        _report(progress, "🖼️ Reloading to bring back blocked images and fonts...")
+                        with span("unblock_reload", host=host) as s:
+                            driver.get(driver.current_url)  # a GET, so a login POST is not resubmitted
+                            wait_for(driver, "navigation", [document_ready()])
+                        # The reload is part of what lean mode costs
+                        load_ms += (time.perf_counter() - s.started) * 1000
+                except Exception as e:
+                    print(f"⚠️ Could not lift request blocking: {e}")
+            PROFILE_STATS.record(profile, load_ms, rss)
+            
+            # Fill the application form from personal_data.json in one injected script
+            # (only on a known platform's application form, never on other pages)
+            fill_status = None
+            if AUTO_FILL_FORMS and _login_outcome(login_status) != "failed" and _on_application_form(driver, platform):
+                _report(progress, "📝 Filling application form from your profile...")
+                try:
+                    with span("form_fill", host=host) as s:
+                        fill = fill_form(driver)
+                        s.tags.update(filled=len(fill["filled"]) + len(fill["fallback"]),
+                                      fallback=len(fill["fallback"]), skipped=len(fill["skipped"]))
+                    fill_status = format_report(fill)
+                except Exception as e:
+                    fill_status = f"⚠️ Form fill failed: {e}"
+        finally:
+            # The tab stays open for the user (a failed one may be closed once the browser is full
+            # if the user never touched it); the browser is reused for later URLs
+            if tab is not None:
+                TABS.finish(driver, tab, ok=ok)
+            DRIVER_POOL.release(driver)
+        
+        print("✅ Browser is ready for your use! Auto-login process completed.")
+        record_span("open_url", started, host=host, outcome=_login_outcome(login_status))
+        HISTORY.record(url, "login", _login_outcome(login_status), login_status,
+                       (time.perf_counter() - started) * 1000)
+        
+        path_line = f"🧩 Platform Path: {path}\n" if path else ""
+        fill_line = f"📝 Form Fill: {fill_status}\n" if fill_status else ""
+        return f"✅ Successfully opened: {url}\n🔐 Login Status: {login_status}\n{path_line}{fill_line}🌐 **Separate Chrome window** opened with auto-login capability!\n✅ Gradio interface remains open for more URLs.\n⚠️ Note: This tab stays open until you close it, or until the browser needs room if you never click or type in it."
+        
+    except Exception as e:
+        record_span("open_url", started, host=host, outcome="error")
+        status = f"❌ Error with Selenium automation: {str(e)}"
+        HISTORY.record(url, "login", "error", status, (time.perf_counter() - started) * 1000)
+        return status
@@ -0,0 +1,199 @@
+"""
+Batch URL Runner
+================
+Runs many job URLs through the auto-login flow with a bounded worker pool.
+
+Results stream back as each URL completes, failed URLs are retried with
+exponential backoff, and the batch ends with a summary (wall time, URLs/min).
+"""
+
+import csv
+import heapq
+import io
+import ipaddress
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlparse
+
+from history_store import canonical_url
+
+DEFAULT_CONCURRENCY = 3
+DEFAULT_RETRIES = 2
+BACKOFF_SECONDS = 2.0  # first retry delay, doubled on every further attempt
+
+_HOST_RE = re.compile(r"(?:[\w-]+\.)+[a-z]{2,}", re.IGNORECASE)
+
+
+def looks_like_url(token):
+    """Whether a pasted token is a web address (scheme optional; port, query and fragment allowed)"""
+    has_scheme = "://" in token
+    try:
+        parsed = urlparse(token if has_scheme else "https://" + token)
+        parsed.port  # raises ValueError for a malformed port
+    except ValueError:
+        return False
+    if parsed.scheme not in ("http", "https") or not parsed.hostname:
+        return False
+    if not has_scheme and parsed.username is not None:
+        return False  # an e-mail address, not a URL
+    host = parsed.hostname
+    if host == "localhost" or _HOST_RE.fullmatch(host):
+        return True
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def is_failure_status(status):
+    """Handler status strings start with ❌ when the attempt failed"""
+    return not status or status.lstrip().startswith("❌")
+
+
+def _urls_from_text(text):
+    urls = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith("#"):
+            continue
+        for token in re.split(r"[\s,;]+", line):
+            token = token.strip().strip('"\'')
+            if token and looks_like_url(token):
+                urls.append(token)
+    return urls
+
+
+def _urls_from_csv(text):
+    urls = []
+    for row in csv.reader(io.StringIO(text)):
+        for cell in row:
+            cell = cell.strip()
+            if cell and looks_like_url(cell):
+                urls.append(cell)
+    return urls
+
+
+def parse_urls(text="", file_path=None):
+    """Collect URLs from pasted text and/or an uploaded .txt/.csv file, de-duplicated in order.
+
+    Two URLs are duplicates when their canonical forms match (tracking
+    parameters, fragments and Workday URL variants don't count).
+    """
+    urls = _urls_from_text(text or "")
+
+    if file_path:
+        with open(file_path, "r", encoding="utf-8-sig") as file:
+            content = file.read()
+        if str(file_path).lower().endswith(".csv"):
+            urls += _urls_from_csv(content)
+        else:
+            urls += _urls_from_text(content)
+
+    seen = set()
+    unique = []
+    for url in urls:
+        key = canonical_url(url)
+        if key not in seen:
+            seen.add(key)
+            unique.append(url)
+    return unique
+
+
+def run_batch(urls, worker, concurrency=DEFAULT_CONCURRENCY, max_retries=DEFAULT_RETRIES,
+              backoff=BACKOFF_SECONDS, submit=None):
+    """Run worker(url) over urls with at most `concurrency` in flight.
+
+    Yields event dicts as they happen: "retry" events while a URL is backing
+    off, one "result" event per URL, and a final "summary" event.
+
+    submit(fn, *args) -> Future runs each attempt; by default the batch gets
+    its own thread pool, the UI passes its shared browser queue instead.
+    Attempts still queued when the caller stops iterating are cancelled.
+    """
+    started = time.perf_counter()
+    total = len(urls)
+    concurrency = max(1, int(concurrency))
+
+    executor = None
+    if submit is None:
+        executor = ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="batch")
+        submit = executor.submit
+
+    def attempt_once(url):
+        try:
+            status = worker(url)
+        except Exception as e:
+            status = f"❌ {e}"
+        return status
+
+    waiting = list(enumerate(urls))[::-1]  # (index, url), popped from the end
+    backing_off = []   # heap of (retry at, index, url, attempts so far, first started)
+    in_flight = {}     # future -> (index, url, attempt, first started)
+    succeeded = failed = retries = 0
+    try:
+        while waiting or backing_off or in_flight:
+            now = time.perf_counter()
+            # Retries whose backoff is over go first, then new URLs, up to the concurrency limit
+            while len(in_flight) < concurrency and (waiting or (backing_off and backing_off[0][0] <= now)):
+                if backing_off and backing_off[0][0] <= now:
+                    _, index, url, attempts, url_started = heapq.heappop(backing_off)
+                else:
+                    index, url = waiting.pop()
+                    attempts, url_started = 0, time.perf_counter()
+                in_flight[submit(attempt_once, url)] = (index, url, attempts + 1, url_started)
+
+            timeout = max(backing_off[0][0] - now, 0) if backing_off else None
+            if not in_flight:
+                time.sleep(timeout)
+                continue
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                index, url, attempt, url_started = in_flight.pop(future)
+                try:
+                    status = future.result()
+                except Exception as e:  # cancelled by a queue shutdown
+                    status = f"❌ {e or type(e).__name__}"
+                ok = not is_failure_status(status)
+                if not ok and attempt <= max_retries:
+                    delay = backoff * 2 ** (attempt - 1)
+                    retries += 1
+                    heapq.heappush(backing_off, (time.perf_counter() + delay, index, url, attempt, url_started))
+                    yield {"type": "retry", "index": index, "url": url, "attempt": attempt,
+                           "delay": delay, "status": status}
+                    continue
+                if ok:
+                    succeeded += 1
+                else:
+                    failed += 1
+                yield {"type": "result", "index": index, "url": url, "ok": ok, "attempts": attempt,
+                       "status": status, "elapsed": time.perf_counter() - url_started}
+    finally:
+        # The caller may stop iterating early (client gone): drop what has not started yet
+        for future in in_flight:
+            future.cancel()
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    wall = time.perf_counter() - started
+    yield {
+        "type": "summary",
+        "total": total,
+        "succeeded": succeeded,
+        "failed": failed,
+        "retries": retries,
+        "wall_seconds": wall,
+        "urls_per_minute": (total / wall * 60) if wall > 0 else 0.0,
+        "concurrency": concurrency,
+    }
+
+
+def format_summary(summary):
+    """One-paragraph batch summary for the UI"""
+    return (
+        f"**Batch finished** — {summary['succeeded']}/{summary['total']} succeeded, "
+        f"{summary['failed']} failed, {summary['retries']} retries\n\n"
+        f"⏱️ Wall time: {summary['wall_seconds']:.1f}s · "
+        f"🚀 {summary['urls_per_minute']:.1f} URLs/min · concurrency {summary['concurrency']}"
+    )
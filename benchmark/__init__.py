@@ -0,0 +1 @@
+"""Offline benchmark for the login flow (fixture pages, fixture server, fake driver)"""
@@ -0,0 +1,93 @@
+"""
+Cold Start Benchmark
+====================
+Times fresh Python processes from launch to exit for the CLI and for the
+old entry point (importing gradio_frontend, which pulls in Gradio and
+Selenium before the UI is even built).
+
+    python -m benchmark.cold_start                    # compare with cold_start.json
+    python -m benchmark.cold_start --update-baseline  # record a new baseline
+
+The CLI commands run with empty stdin, so they stop right after loading
+everything the command needs, without opening a browser.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "cold_start.json")
+
+# name -> command line, run from the repository root
+COMMANDS = {
+    "script (import gradio_frontend)": [sys.executable, "-c", "import gradio_frontend"],
+    "jobauto --help": [sys.executable, "jobauto.py", "--help"],
+    "jobauto open": [sys.executable, "jobauto.py", "open"],
+    "jobauto login": [sys.executable, "jobauto.py", "login"],
+    "jobauto batch": [sys.executable, "jobauto.py", "batch"],
+}
+
+DEFAULT_RUNS = 5
+
+# A command regresses when its median grows past both limits
+TOLERANCE = 1.25
+SLACK_MS = 50
+
+
+def time_command(command, runs):
+    """Median wall time of `runs` fresh processes, in ms"""
+    samples = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run(command, cwd=ROOT, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                       stderr=subprocess.DEVNULL, check=False)
+        samples.append((time.perf_counter() - started) * 1000)
+    return round(statistics.median(samples), 1)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure CLI cold start against the Gradio script")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = {name: time_command(command, args.runs) for name, command in COMMANDS.items()}
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, "r", encoding="utf-8") as file:
+            baseline = json.load(file)
+
+    script_ms = results["script (import gradio_frontend)"]
+    regressed = []
+    print(f"{'command':<34}{'median ms':>10}{'base':>8}{'vs script':>11}")
+    for name, ms in results.items():
+        base = baseline.get(name)
+        note = ""
+        if base is not None and ms > base * TOLERANCE and ms - base > SLACK_MS:
+            regressed.append(name)
+            note = "  regression"
+        base_text = f"{base:.0f}" if base is not None else "-"
+        print(f"{name:<34}{ms:>10.0f}{base_text:>8}{ms / script_ms:>10.0%}{note}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+            file.write("\n")
+        print(f"💾 Baseline updated: {args.baseline}")
+        return 0
+
+    if regressed:
+        print(f"❌ Regressions: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
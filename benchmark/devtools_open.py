@@ -0,0 +1,116 @@
+"""
+DevTools vs Command-Line Tab Opening
+====================================
+Starts a Chrome with a temporary profile and remote debugging, then opens
+the same pages three ways and reports per-URL latency:
+
+  subprocess       `chrome --new-tab URL` per URL (what the UI used to do);
+                   the time until the command returns, with no load feedback
+  devtools         Target.createTarget per URL over one kept connection
+  devtools batch   all URLs pipelined in one batch
+
+For the DevTools modes both the time until the tab exists and the time
+until its load event are shown.
+
+    python -m benchmark.devtools_open                      # fixture pages
+    python -m benchmark.devtools_open https://example.com  # real sites
+
+Needs Chrome/Chromium (found like devtools_tabs.find_chrome) and the
+websockets package.
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmark.fixture_server import FixtureServer
+from benchmark.run_benchmark import FIXTURES
+from devtools_tabs import DevToolsClient, _version_info, find_chrome
+from profile_manager import free_port
+
+STARTUP_TIMEOUT = 20
+
+
+def start_chrome(chrome, profile_dir, port):
+    process = subprocess.Popen(
+        [chrome, f"--user-data-dir={profile_dir}", f"--remote-debugging-port={port}", "--no-first-run",
+         "--no-default-browser-check", "about:blank"],
+        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    deadline = time.monotonic() + STARTUP_TIMEOUT
+    while time.monotonic() < deadline:
+        if _version_info(f"http://127.0.0.1:{port}"):
+            return process
+        time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("Chrome did not open its debugging port")
+
+
+def _median(values):
+    values = [value for value in values if value is not None]
+    return statistics.median(values) if values else None
+
+
+def _ms(value):
+    return f"{value:.0f}" if value is not None else "-"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare per-URL tab opening latency: DevTools vs chrome --new-tab")
+    parser.add_argument("urls", nargs="*", help="pages to open (default: the benchmark fixtures)")
+    parser.add_argument("--copies", type=int, default=3, help="open every URL this many times per mode")
+    args = parser.parse_args(argv)
+
+    chrome = find_chrome()
+    if chrome is None:
+        print("❌ Could not find Chrome or Chromium")
+        return 1
+
+    rows = []
+    with FixtureServer() as server, tempfile.TemporaryDirectory(prefix="jobauto-devtools-") as profile_dir:
+        urls = (args.urls or [server.url(fixture) for fixture in FIXTURES]) * max(args.copies, 1)
+        port = free_port()
+        try:
+            process = start_chrome(chrome, profile_dir, port)
+        except Exception as e:
+            print(f"❌ Could not start Chrome: {e}")
+            return 1
+        try:
+            spawn = []
+            for url in urls:
+                started = time.perf_counter()
+                subprocess.run([chrome, f"--user-data-dir={profile_dir}", "--new-tab", url], check=False,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+                spawn.append((time.perf_counter() - started) * 1000)
+            rows.append(("subprocess", _median(spawn), None))
+
+            client = DevToolsClient(endpoint=f"http://127.0.0.1:{port}")
+            client.call("Browser.getVersion")  # connect outside the timed loop
+            single = [client.open_tabs([url])[0] for url in urls]
+            rows.append(("devtools", _median(r["open_ms"] for r in single), _median(r["load_ms"] for r in single)))
+
+            started = time.perf_counter()
+            batch = client.open_tabs(urls)
+            total_ms = (time.perf_counter() - started) * 1000
+            last_open = max((r["open_ms"] for r in batch if r["open_ms"] is not None), default=None)
+            rows.append(("devtools batch", last_open / len(urls) if last_open else None, total_ms / len(urls)))
+            client.close()
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+
+    print(f"{'mode':<18}{'URLs':>6}{'open ms/URL':>13}{'loaded ms/URL':>15}")
+    for mode, open_ms, load_ms in rows:
+        print(f"{mode:<18}{len(urls):>6}{_ms(open_ms):>13}{_ms(load_ms):>15}")
+    print("(batch: time until the last tab existed / until every tab loaded, divided by the URL count)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,637 @@
+"""
+Fake WebDriver
+==============
+In-process stand-in for Chrome used when no browser is installed.
+
+It fetches fixture pages over HTTP, parses them with html.parser, and answers
+the scripts the login flow injects (scan, cached lookup, classifier and
+readiness probes) with Python ports of the same logic. Delayed rendering
+(<template data-render-delay=... data-render-into=...>) is simulated on a real
+clock, so readiness waits behave like they would in a browser. Every call
+that would be a WebDriver round trip is counted in `round_trips`.
+"""
+
+import re
+import time
+import urllib.parse
+import urllib.request
+from html.parser import HTMLParser
+
+import login_detection
+import page_classifier
+import page_readiness
+
+VOID_TAGS = {"area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta", "source", "track", "wbr"}
+NON_RENDERED_TAGS = {"head", "script", "style", "template", "title", "meta", "link", "noscript"}
+
+RETURN_KEYS = ("", "")  # Keys.RETURN, Keys.ENTER
+
+
+class FakeDriverError(Exception):
+    """Raised for anything the fake driver does not emulate"""
+
+
+# ---------------------------------------------------------------- DOM model
+
+class Node:
+    def __init__(self, tag, attrs=None, parent=None):
+        self.tag = tag
+        self.attrs = dict(attrs or {})
+        self.parent = parent
+        self.children = []
+        self.value = None  # typed value, like the .value property
+
+    def elements(self):
+        for child in self.children:
+            if isinstance(child, Node):
+                yield child
+
+    def descendants(self):
+        """Rendered descendant elements in document order (template content excluded)"""
+        for child in self.elements():
+            yield child
+            if child.tag != "template":
+                yield from child.descendants()
+
+    @property
+    def type(self):
+        if self.tag == "input":
+            return (self.attrs.get("type") or "text").lower()
+        if self.tag == "button":
+            return (self.attrs.get("type") or "submit").lower()
+        if self.tag == "select":
+            return "select-one"
+        return self.tag if self.tag == "textarea" else ""
+
+    @property
+    def form(self):
+        node = self.parent
+        while node is not None and node.tag != "form":
+            node = node.parent
+        return node
+
+    def text_content(self):
+        parts = []
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif child.tag not in ("script", "style", "template"):
+                parts.append(child.text_content())
+        return "".join(parts)
+
+    def inner_text(self):
+        parts = []
+        for child in self.children:
+            if isinstance(child, str):
+                parts.append(child)
+            elif _self_visible(child):
+                parts.append(child.inner_text())
+        return re.sub(r"\s+", " ", "".join(parts))
+
+
+def _self_visible(node):
+    if node.tag in NON_RENDERED_TAGS or "hidden" in node.attrs:
+        return False
+    if node.tag == "input" and node.type == "hidden":
+        return False
+    style = (node.attrs.get("style") or "").replace(" ", "").lower()
+    return "display:none" not in style and "visibility:hidden" not in style
+
+
+def is_visible(node):
+    while node is not None and node.tag != "#document":
+        if not _self_visible(node):
+            return False
+        node = node.parent
+    return True
+
+
+class _TreeBuilder(HTMLParser):
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.document = Node("#document")
+        self.current = self.document
+        self.title = ""
+
+    def handle_starttag(self, tag, attrs):
+        node = Node(tag, {name: value if value is not None else "" for name, value in attrs}, self.current)
+        self.current.children.append(node)
+        if tag not in VOID_TAGS:
+            self.current = node
+
+    def handle_startendtag(self, tag, attrs):
+        self.handle_starttag(tag, attrs)
+        if tag not in VOID_TAGS:
+            self.current = self.current.parent
+
+    def handle_endtag(self, tag):
+        node = self.current
+        while node is not None and node.tag != tag:
+            node = node.parent
+        if node is not None and node.parent is not None:
+            self.current = node.parent
+
+    def handle_data(self, data):
+        if self.current.tag == "title":
+            self.title += data
+        self.current.children.append(data)
+
+
+# ---------------------------------------------------------- CSS selectors
+
+_COMPOUND_TOKEN = re.compile(
+    r"(?P<tag>^[a-zA-Z*][\w-]*)"
+    r"|#(?P<id>[\w-]+)"
+    r"|\.(?P<cls>[\w-]+)"
+    r"|\[(?P<attr>[\w-]+)(?:(?P<op>[*^$]?=)(?:'(?P<sq>[^']*)'|\"(?P<dq>(?:[^\"\\\\]|\\\\.)*)\"))?\]"
+    r"|:first-of-type"
+    r"|:nth-of-type\((?P<nth>\d+)\)"
+)
+
+
+def _parse_compound(text):
+    tests = []
+    position = 0
+    while position < len(text):
+        match = _COMPOUND_TOKEN.match(text, position)
+        if not match or match.end() == position:
+            raise FakeDriverError(f"unsupported selector: {text!r}")
+        position = match.end()
+        token = match.group(0)
+        if match.group("tag"):
+            tag = match.group("tag").lower()
+            if tag != "*":
+                tests.append(lambda node, tag=tag: node.tag == tag)
+        elif match.group("id"):
+            tests.append(lambda node, value=match.group("id"): node.attrs.get("id") == value)
+        elif match.group("cls"):
+            tests.append(lambda node, value=match.group("cls"): value in (node.attrs.get("class") or "").split())
+        elif match.group("attr"):
+            name, op = match.group("attr").lower(), match.group("op")
+            value = match.group("sq") if match.group("sq") is not None else (match.group("dq") or "")
+            value = re.sub(r"\\(.)", r"\1", value)
+            tests.append(lambda node, name=name, op=op, value=value: _attr_test(node, name, op, value))
+        elif token == ":first-of-type":
+            tests.append(lambda node: _index_of_type(node) == 1)
+        else:
+            tests.append(lambda node, nth=int(match.group("nth")): _index_of_type(node) == nth)
+    return tests
+
+
+def _attr_test(node, name, op, value):
+    actual = node.attrs.get(name)
+    if name == "type" and node.tag in ("input", "button") and actual is None:
+        actual = node.type
+    if actual is None:
+        return False
+    if op is None:
+        return True
+    if op == "=":
+        return actual == value
+    if op == "*=":
+        return value in actual
+    if op == "^=":
+        return actual.startswith(value)
+    return actual.endswith(value)
+
+
+def _index_of_type(node):
+    if node.parent is None:
+        return 1
+    index = 0
+    for sibling in node.parent.elements():
+        if sibling.tag == node.tag:
+            index += 1
+        if sibling is node:
+            return index
+    return 0
+
+
+def _parse_selector(selector):
+    """'a, b > c' -> [[(combinator, tests), ...], ...] (right-most compound last)"""
+    groups = []
+    steps = []
+    combinator = None
+    # Attribute values may contain spaces, commas or '>', so [...] is one token
+    for token in re.findall(r">|,|(?:\[[^\]]*\]|[^\s>,\[])+", selector) + [","]:
+        if token == ",":
+            if not steps:
+                raise FakeDriverError(f"empty selector: {selector!r}")
+            groups.append(steps)
+            steps, combinator = [], None
+        elif token == ">":
+            combinator = ">"
+        else:
+            steps.append((combinator or " ", _parse_compound(token)))
+            combinator = None
+    return groups
+
+
+def _matches_steps(node, steps):
+    combinator, tests = steps[-1]
+    if not all(test(node) for test in tests):
+        return False
+    if len(steps) == 1:
+        return True
+    parent = node.parent
+    if combinator == ">":
+        return parent is not None and parent.tag != "#document" and _matches_steps(parent, steps[:-1])
+    while parent is not None and parent.tag != "#document":
+        if _matches_steps(parent, steps[:-1]):
+            return True
+        parent = parent.parent
+    return False
+
+
+def query_all(document, selector):
+    groups = _parse_selector(selector)
+    return [node for node in document.descendants() if any(_matches_steps(node, steps) for steps in groups)]
+
+
+# -------------------------------------------------------------- elements
+
+class FakeElement:
+    """WebElement stand-in; every method is one counted round trip"""
+
+    def __init__(self, driver, node):
+        self._driver = driver
+        self._node = node
+
+    def __eq__(self, other):
+        return isinstance(other, FakeElement) and other._node is self._node
+
+    def __hash__(self):
+        return id(self._node)
+
+    @property
+    def tag_name(self):
+        self._driver._round_trip()
+        return self._node.tag
+
+    def get_attribute(self, name):
+        self._driver._round_trip()
+        if name == "value":
+            return self._node.value if self._node.value is not None else self._node.attrs.get("value")
+        return self._node.attrs.get(name)
+
+    def is_displayed(self):
+        self._driver._round_trip()
+        return is_visible(self._node)
+
+    def clear(self):
+        self._driver._round_trip()
+        self._node.value = ""
+
+    def send_keys(self, *values):
+        self._driver._round_trip()
+        text = "".join(str(value) for value in values)
+        submit = any(key in text for key in RETURN_KEYS)
+        for key in RETURN_KEYS:
+            text = text.replace(key, "")
+        self._node.value = (self._node.value if self._node.value is not None else self._node.attrs.get("value", "")) + text
+        if submit and self._node.form is not None:
+            self._driver._submit(self._node.form, None)
+
+    def click(self):
+        self._driver._round_trip()
+        self._driver._click(self._node)
+
+
+# ---------------------------------------------------------------- driver
+
+class FakeDriver:
+    """Minimal WebDriver emulation for the login flow"""
+
+    def __init__(self):
+        self.round_trips = 0
+        self._url = "about:blank"
+        self._html = ""
+        self._document = Node("#document")
+        self._title = ""
+        self._pending = []  # [(due, template node)]
+        self._network_mark = time.monotonic()
+        self._dom_mark = time.monotonic()
+        self._scripts = {
+            login_detection.SCAN_SCRIPT: self._scan,
+            login_detection.CACHED_LOOKUP_SCRIPT: self._cached_lookup,
+            login_detection.PLATFORM_LOOKUP_SCRIPT: self._platform_lookup,
+            page_classifier.CLASSIFY_SCRIPT: self._classify,
+            page_readiness.QUIET_SCRIPT: self._quiet,
+            page_readiness.MARK_ACTIVITY_SCRIPT: self._mark_activity,
+            page_readiness.CREDENTIAL_SCRIPT: self._credential_present,
+            "return document.readyState": lambda: "complete",
+            "arguments[0].click();": lambda element: self._click(element._node),
+        }
+
+    # ----------------------------------------------------------- plumbing
+
+    def _round_trip(self):
+        self.round_trips += 1
+        self._render_due()
+
+    def _render_due(self):
+        """Reveal delayed <template> content whose render time has come"""
+        now = time.monotonic()
+        for due, template in list(self._pending):
+            if due > now:
+                continue
+            self._pending.remove((due, template))
+            target = self._find_by_id(template.attrs.get("data-render-into"))
+            if target is None:
+                continue
+            target.children = []
+            for child in template.children:
+                target.children.append(child)
+                if isinstance(child, Node):
+                    child.parent = target
+            self._dom_mark = self._network_mark = due
+
+    def _find_by_id(self, element_id):
+        for node in self._document.descendants():
+            if node.attrs.get("id") == element_id:
+                return node
+        return None
+
+    def _load(self, response):
+        self._url = response.geturl()
+        self._html = response.read().decode("utf-8", errors="replace")
+        builder = _TreeBuilder()
+        builder.feed(self._html)
+        self._document = builder.document
+        self._title = builder.title.strip()
+        now = time.monotonic()
+        self._network_mark = self._dom_mark = now
+        self._pending = []
+        for node in self._document.descendants():
+            if node.tag == "template" and node.attrs.get("data-render-delay"):
+                self._pending.append((now + int(node.attrs["data-render-delay"]) / 1000, node))
+
+    def _submit(self, form, submitter):
+        fields = []
+        for node in form.descendants():
+            name = node.attrs.get("name")
+            if not name or "disabled" in node.attrs:
+                continue
+            if node.tag == "input" and node.type not in ("submit", "button", "image", "reset", "checkbox", "radio"):
+                fields.append((name, node.value if node.value is not None else node.attrs.get("value", "")))
+            elif node is submitter:
+                fields.append((name, node.attrs.get("value", "")))
+        action = urllib.parse.urljoin(self._url, form.attrs.get("action", ""))
+        data = urllib.parse.urlencode(fields)
+        if (form.attrs.get("method") or "get").lower() == "post":
+            request = urllib.request.Request(action, data=data.encode("utf-8"), method="POST")
+        else:
+            request = urllib.request.Request(action.split("?")[0] + "?" + data)
+        with urllib.request.urlopen(request, timeout=10) as response:
+            self._load(response)
+
+    def _click(self, node):
+        form = node.form
+        if form is None:
+            return
+        if node.tag == "button" or (node.tag == "input" and node.type in ("submit", "image")):
+            self._submit(form, node)
+
+    def _element(self, node):
+        return FakeElement(self, node) if node is not None else None
+
+    # ------------------------------------------------------ WebDriver API
+
+    def get(self, url):
+        self._round_trip()
+        with urllib.request.urlopen(url, timeout=10) as response:
+            self._load(response)
+
+    @property
+    def current_url(self):
+        self._round_trip()
+        return self._url
+
+    @property
+    def title(self):
+        self._round_trip()
+        return self._title
+
+    @property
+    def page_source(self):
+        self._round_trip()
+        return self._html
+
+    @property
+    def window_handles(self):
+        self._round_trip()
+        return ["fake-window"]
+
+    def find_element(self, by, value):
+        self._round_trip()
+        if by != "css selector":
+            raise FakeDriverError(f"locator strategy {by!r} is not emulated")
+        nodes = query_all(self._document, value)
+        if not nodes:
+            raise FakeDriverError(f"no element matches {value!r}")
+        return FakeElement(self, nodes[0])
+
+    def find_elements(self, by, value):
+        self._round_trip()
+        if by != "css selector":
+            raise FakeDriverError(f"locator strategy {by!r} is not emulated")
+        return [FakeElement(self, node) for node in query_all(self._document, value)]
+
+    def execute_script(self, script, *args):
+        self._round_trip()
+        handler = self._scripts.get(script)
+        if handler is None:
+            raise FakeDriverError(f"script not emulated: {script.strip()[:60]!r}")
+        return handler(*args)
+
+    def execute_cdp_cmd(self, cmd, params):
+        self._round_trip()
+        raise FakeDriverError(f"CDP command {cmd} is not emulated")
+
+    def quit(self):
+        pass
+
+    # ------------------------------------------------- injected scripts
+
+    def _quiet(self):
+        now = time.monotonic()
+        return {"network": (now - self._network_mark) * 1000, "dom": (now - self._dom_mark) * 1000, "inflight": 0}
+
+    def _mark_activity(self):
+        self._network_mark = self._dom_mark = time.monotonic()
+
+    def _credential_present(self, selector):
+        return any(is_visible(node) for node in query_all(self._document, selector))
+
+    def _controls(self):
+        return [node for node in self._document.descendants()
+                if node.tag in ("input", "button", "select", "textarea")]
+
+    def _fingerprint(self):
+        parts = sorted(f"{node.tag}|{node.type}|{node.attrs.get('name', '')}"
+                       for node in self._controls()[:200] if node.type != "hidden")
+        shape = ";".join(part for i, part in enumerate(parts) if i == 0 or part != parts[i - 1])
+        value = 5381
+        for char in shape:
+            value = (value * 33 + ord(char)) & 0xFFFFFFFF
+        return format(value, "x")
+
+    def _unique_selector(self, node):
+        if node.attrs.get("id"):
+            selector = "#" + node.attrs["id"]
+            if len(query_all(self._document, selector)) == 1:
+                return selector
+        name = node.attrs.get("name")
+        if name:
+            selector = f'{node.tag}[name="{name}"]'
+            if len(query_all(self._document, selector)) == 1:
+                return selector
+        path = []
+        while node is not None and node.tag not in ("#document", "html"):
+            path.insert(0, f"{node.tag}:nth-of-type({_index_of_type(node)})")
+            node = node.parent
+        return "html > " + " > ".join(path)
+
+    def _collect(self, rules):
+        found = {}
+        total = len(rules)
+        for index, rule in enumerate(rules):
+            try:
+                if rule["kind"] == "css":
+                    matches = query_all(self._document, rule["selector"])
+                elif rule["kind"] == "text":
+                    matches = [node for node in self._document.descendants()
+                               if node.tag == rule["tag"] and rule["text"] in node.text_content()]
+                else:
+                    matches = []  # XPath rules are not emulated
+            except FakeDriverError:
+                continue
+            weight = (total - index) * rule["weight"]
+            for node in matches:
+                entry = found.setdefault(id(node), {"node": node, "score": 0, "selector": rule["label"]})
+                if weight > entry["score"]:
+                    entry["score"] = weight
+                    entry["selector"] = rule["label"]
+        return list(found.values())
+
+    def _pick(self, candidates, exclude, form, needs_enabled):
+        best = None
+        for entry in candidates:
+            node = entry["node"]
+            if node is exclude or (needs_enabled and "disabled" in node.attrs):
+                continue
+            score = entry["score"] + (1000 if is_visible(node) else -1000)
+            if form is not None and node.form is form:
+                score += 500
+            if best is None or score > best["score"]:
+                best = {"node": node, "score": score, "selector": entry["selector"]}
+        if best is None or best["score"] < 0:
+            return None
+        return best
+
+    def _scan(self, catalogue):
+        password = self._pick(self._collect(catalogue["password"]), None, None, False)
+        form = password["node"].form if password else None
+        username = self._pick(self._collect(catalogue["username"]), password and password["node"], form, False)
+        submit = self._pick(self._collect(catalogue["submit"]), None, form, True)
+
+        result = {}
+        for role, candidate in (("username", username), ("password", password), ("submit", submit)):
+            if candidate:
+                result[role] = {
+                    "element": self._element(candidate["node"]),
+                    "score": candidate["score"],
+                    "selector": candidate["selector"],
+                    "css": self._unique_selector(candidate["node"]),
+                }
+            else:
+                result[role] = None
+        controls = self._controls()
+        result["fingerprint"] = self._fingerprint()
+        result["inputs"] = sum(1 for node in controls if node.tag == "input")
+        result["buttons"] = sum(1 for node in controls if node.tag == "button")
+        return result
+
+    def _cached_lookup(self, entries):
+        fingerprint = self._fingerprint()
+        entry = entries.get(fingerprint)
+        if not entry:
+            return {"fingerprint": fingerprint, "known": False, "hit": False}
+
+        def resolve(selector):
+            if not selector:
+                return None
+            try:
+                nodes = query_all(self._document, selector)
+            except FakeDriverError:
+                return None
+            return self._element(nodes[0]) if nodes and is_visible(nodes[0]) else None
+
+        username, password, submit = (resolve(entry.get(role)) for role in ("username", "password", "submit"))
+        return {
+            "fingerprint": fingerprint,
+            "known": True,
+            "hit": bool(username and password and (submit or not entry.get("submit"))),
+            "username": username,
+            "password": password,
+            "submit": submit,
+        }
+
+    def _platform_lookup(self, selectors):
+        result = {"fingerprint": self._fingerprint()}
+        for role in ("username", "password", "submit"):
+            result[role] = None
+            if not selectors.get(role):
+                continue
+            for node in query_all(self._document, selectors[role]):
+                if is_visible(node) and "disabled" not in node.attrs:
+                    result[role] = {"element": self._element(node), "css": self._unique_selector(node)}
+                    break
+        return result
+
+    def _visible_text(self, selector, max_chars):
+        parts = []
+        length = 0
+        for node in query_all(self._document, selector):
+            if length >= max_chars:
+                break
+            if not is_visible(node):
+                continue
+            text = node.inner_text().strip()
+            if text:
+                parts.append(text)
+                length += len(text)
+        return " ".join(parts)[:max_chars]
+
+    def _classify(self, login_pattern, error_pattern, login_regions, error_regions, max_chars, alert_selector):
+        attributes = []
+        for node in query_all(self._document, "form, input, select, textarea, button"):
+            for attr in ("name", "id", "type", "placeholder", "aria-label", "autocomplete", "action"):
+                if node.attrs.get(attr):
+                    attributes.append(node.attrs[attr])
+            if node.type in ("submit", "button"):
+                attributes.append(node.attrs.get("value", ""))
+
+        regions = {
+            "title": self._title,
+            "form_fields": " ".join(attributes)[:max_chars],
+            "labels": self._visible_text("label", max_chars),
+            "form_text": self._visible_text("form", max_chars),
+            "alerts": self._visible_text(alert_selector, max_chars),
+        }
+
+        evidence = {"login": {}, "error": {}}
+        for kind, pattern, names in (("login", login_pattern, login_regions), ("error", error_pattern, error_regions)):
+            compiled = re.compile(pattern, re.IGNORECASE)
+            for name in names:
+                hits = compiled.findall(regions[name])
+                if hits:
+                    evidence[kind][name] = list(dict.fromkeys(hit.lower() for hit in hits))
+
+        return {
+            "url": self._url,
+            "title": self._title,
+            "password_fields": sum(1 for node in query_all(self._document, 'input[type="password"]') if is_visible(node)),
+            "evidence": evidence,
+            "scanned_chars": sum(len(text) for text in regions.values()),
+        }
@@ -0,0 +1,83 @@
+"""
+Fixture Server
+==============
+Serves the local login fixture pages with the standard library HTTP server.
+
+GET /<fixture>.html returns the page. POSTing a login form back to a fixture
+either redirects to landing.html (successful login) or, for
+error_on_submit.html, re-renders the page with an error alert at the same URL.
+"""
+
+import os
+import threading
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# Fixtures whose login POST is rejected, and the page shown instead
+FAILING_LOGINS = {
+    "/error_on_submit.html": "error_on_submit_failed.html",
+}
+
+LANDING_PAGE = "/landing.html"
+
+
+class FixtureHandler(SimpleHTTPRequestHandler):
+    """Static fixture pages plus a fake login endpoint on POST"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, directory=FIXTURES_DIR, **kwargs)
+
+    def log_message(self, format, *args):
+        # Keep benchmark output readable
+        pass
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        form = parse_qs(self.rfile.read(length).decode("utf-8"))
+        path = urlparse(self.path).path
+
+        values = [value for values in form.values() for value in values if value]
+        failed_page = FAILING_LOGINS.get(path)
+
+        if failed_page or len(values) < 2:
+            page = failed_page or os.path.basename(path)
+            with open(os.path.join(FIXTURES_DIR, page), "rb") as file:
+                body = file.read()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/html; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+            return
+
+        self.send_response(303)
+        self.send_header("Location", LANDING_PAGE)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class FixtureServer:
+    """Runs the fixture server on a free localhost port in a background thread"""
+
+    def __init__(self, host="127.0.0.1", port=0):
+        self._server = ThreadingHTTPServer((host, port), FixtureHandler)
+        self._thread = None
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def url(self, fixture):
+        return f"{self.base_url}/{fixture}"
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,99 @@
+"""
+Lean Profile Comparison
+=======================
+Loads the same pages in a full and a lean Chrome session and reports
+page-load time and browser RSS for each.
+
+    python -m benchmark.profile_compare                      # fixture pages
+    python -m benchmark.profile_compare https://example.com  # real sites
+    python -m benchmark.profile_compare --headless new URL...
+
+Needs a local Chrome and chromedriver on PATH (the fake driver has no
+network stack or memory footprint worth comparing).
+"""
+
+import argparse
+import statistics
+import sys
+import tempfile
+import time
+
+import lean_profile
+from benchmark.fixture_server import FixtureServer
+from benchmark.run_benchmark import FIXTURES
+from page_readiness import document_ready, network_idle, wait_for
+
+DEFAULT_RUNS = 3
+
+
+def launch(lean, profile_dir):
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument("--no-sandbox")
+    if lean:
+        lean_profile.add_lean_arguments(options)
+    elif lean_profile.HEADLESS_MODE:
+        # Compare like with like: both sessions headless when asked
+        options.add_argument("--headless=new" if lean_profile.HEADLESS_MODE == "new" else "--headless")
+    return webdriver.Chrome(options=options)
+
+
+def measure(lean, urls, runs):
+    """Median load time per URL and peak browser RSS for one profile"""
+    loads = {url: [] for url in urls}
+    peak_rss = None
+    with tempfile.TemporaryDirectory(prefix="jobauto-profile-") as profile_dir:
+        driver = launch(lean, profile_dir)
+        try:
+            for _ in range(runs):
+                for url in urls:
+                    if lean:
+                        lean_profile.apply_request_blocking(driver, url)
+                    started = time.perf_counter()
+                    driver.get(url)
+                    wait_for(driver, "navigation", [document_ready(), network_idle()])
+                    loads[url].append((time.perf_counter() - started) * 1000)
+                    rss = lean_profile.browser_rss(driver)
+                    if rss is not None:
+                        peak_rss = max(peak_rss or 0, rss)
+                    driver.get("about:blank")
+        finally:
+            driver.quit()
+    return {url: statistics.median(samples) for url, samples in loads.items()}, peak_rss
+
+
+def _mb(value):
+    return f"{value / (1024 * 1024):.0f} MB" if value is not None else "n/a"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare page-load time and RSS of the full and lean Chrome profiles")
+    parser.add_argument("urls", nargs="*", help="pages to load (default: the benchmark fixtures)")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--headless", choices=["new", "old"], help="run both sessions headless")
+    args = parser.parse_args(argv)
+
+    lean_profile.HEADLESS_MODE = args.headless
+
+    with FixtureServer() as server:
+        urls = args.urls or [server.url(fixture) for fixture in FIXTURES]
+        try:
+            full_loads, full_rss = measure(False, urls, args.runs)
+            lean_loads, lean_rss = measure(True, urls, args.runs)
+        except Exception as e:
+            print(f"❌ Could not run Chrome: {e}")
+            return 1
+
+    print(f"{'page':<50}{'full ms':>10}{'lean ms':>10}{'saved':>8}")
+    for url in urls:
+        full, lean = full_loads[url], lean_loads[url]
+        saved = (1 - lean / full) if full else 0.0
+        print(f"{url[-50:]:<50}{full:>10.0f}{lean:>10.0f}{saved:>8.0%}")
+    print(f"{'peak browser RSS':<50}{_mb(full_rss):>10}{_mb(lean_rss):>10}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
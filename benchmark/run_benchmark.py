@@ -0,0 +1,234 @@
+"""
+Login Flow Benchmark
+====================
+Runs the detect/classify/fill/verify flow against local fixture pages and
+reports latency, WebDriver round trips and success rate per fixture.
+
+    python -m benchmark.run_benchmark                    # compare with baseline.json
+    python -m benchmark.run_benchmark --update-baseline  # record a new baseline
+    python -m benchmark.run_benchmark --driver fake      # force the in-process driver
+
+Headless Chrome is used when it can be started; otherwise the fake driver
+(benchmark/fake_driver.py) answers the injected scripts in Python. Baselines
+are kept per driver, since their timings are not comparable.
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import sys
+import tempfile
+import time
+
+from benchmark.fixture_server import FixtureServer
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Fixture page -> status prefix auto_login_if_needed must return
+FIXTURES = {
+    "asurite_shibboleth.html": "✅ Login completed",
+    "cas_login.html": "✅ Login completed",
+    "workday_spa.html": "✅ Login completed",
+    "generic_text.html": "✅ Login completed",
+    "error_on_submit.html": "⚠️ Login attempted but failed",
+    "no_login.html": "ℹ️ No login required",
+}
+
+# Fixtures standing in for a known platform (all fixtures share one localhost host)
+FIXTURE_PLATFORMS = {
+    "asurite_shibboleth.html": "asu_shibboleth",
+    "workday_spa.html": "workday",
+}
+
+DEFAULT_RUNS = 3
+
+# A fixture regresses when its median latency grows past both limits, needs
+# more round trips than the baseline (readiness polling adds a little jitter)
+# or succeeds less often
+LATENCY_TOLERANCE = 1.25
+LATENCY_SLACK_MS = 100
+ROUND_TRIP_SLACK = 2
+
+BENCHMARK_CREDENTIALS = {"login_credentials": {"username": "benchuser", "password": "bench-pass-123"}}
+
+
+def _chrome_driver():
+    """Headless Chrome with every WebDriver command counted"""
+    from selenium import webdriver
+
+    options = webdriver.ChromeOptions()
+    options.add_argument("--headless=new")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-gpu")
+    driver = webdriver.Chrome(options=options)
+
+    driver.round_trips = 0
+    execute = driver.execute
+
+    def counted(*args, **kwargs):
+        driver.round_trips += 1
+        return execute(*args, **kwargs)
+
+    driver.execute = counted
+    return driver
+
+
+def _fake_driver():
+    from benchmark.fake_driver import FakeDriver
+    return FakeDriver()
+
+
+def make_driver_factory(kind):
+    """Returns (driver name, factory); 'auto' probes Chrome once and falls back to the fake"""
+    if kind == "fake":
+        return "fake", _fake_driver
+    if kind == "chrome":
+        return "chrome", _chrome_driver
+    try:
+        _chrome_driver().quit()
+        return "chrome", _chrome_driver
+    except Exception as e:
+        print(f"ℹ️ Headless Chrome unavailable ({type(e).__name__}), using the fake driver")
+        return "fake", _fake_driver
+
+
+def run_fixture(server, fixture, expected, runs, new_driver):
+    """Open the fixture and run auto-login `runs` times; returns aggregated results"""
+    import automation
+    from platforms import REGISTRY, path_label
+
+    url = server.url(fixture)
+    platform = REGISTRY.resolve(url)
+    latencies, trips, statuses = [], [], []
+    successes = 0
+    for _ in range(runs):
+        driver = new_driver()
+        try:
+            started = time.perf_counter()
+            driver.get(url)
+            route = {}
+            status = automation._auto_login(driver, None, "", platform, route)
+            latencies.append((time.perf_counter() - started) * 1000)
+            trips.append(driver.round_trips)
+        finally:
+            driver.quit()
+        statuses.append(status)
+        if status.startswith(expected):
+            successes += 1
+
+    return {
+        "median_ms": round(statistics.median(latencies), 1),
+        "round_trips": int(statistics.median(trips)),
+        "success_rate": round(successes / runs, 3),
+        "last_status": statuses[-1],
+        "path": path_label(route.get("platform"), route.get("fell_back")),
+    }
+
+
+def compare(results, baseline):
+    """Per-fixture regression notes against a stored baseline"""
+    notes = {}
+    for fixture, result in results.items():
+        base = baseline.get(fixture)
+        if not base:
+            notes[fixture] = ["new fixture"]
+            continue
+        problems = []
+        if (result["median_ms"] > base["median_ms"] * LATENCY_TOLERANCE
+                and result["median_ms"] - base["median_ms"] > LATENCY_SLACK_MS):
+            problems.append(f"latency {base['median_ms']:.0f} → {result['median_ms']:.0f} ms")
+        if result["round_trips"] > base["round_trips"] + ROUND_TRIP_SLACK:
+            problems.append(f"round trips {base['round_trips']} → {result['round_trips']}")
+        if result["success_rate"] < base["success_rate"]:
+            problems.append(f"success {base['success_rate']:.0%} → {result['success_rate']:.0%}")
+        notes[fixture] = problems
+    return notes
+
+
+def format_report(driver_name, results, baseline, notes):
+    lines = [
+        f"Login flow benchmark ({driver_name} driver)",
+        f"{'fixture':<26}{'path':<16}{'median ms':>10}{'base':>8}{'trips':>7}{'base':>6}{'success':>9}  notes",
+    ]
+    for fixture, result in results.items():
+        base = baseline.get(fixture) or {}
+        lines.append(
+            f"{fixture:<26}{result['path']:<16}{result['median_ms']:>10.0f}{base.get('median_ms', float('nan')):>8.0f}"
+            f"{result['round_trips']:>7}{base.get('round_trips', '-'):>6}{result['success_rate']:>9.0%}  "
+            f"{'; '.join(notes.get(fixture) or []) or 'ok'}"
+        )
+        if result["success_rate"] < 1:
+            lines.append(f"{'':<26}last status: {result['last_status'].splitlines()[0]}")
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the login flow on local fixture pages")
+    parser.add_argument("--driver", choices=["auto", "chrome", "fake"], default="auto")
+    parser.add_argument("--runs", type=int, default=DEFAULT_RUNS)
+    parser.add_argument("--baseline", default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true", help="store these results as the new baseline")
+    parser.add_argument("--fixture", action="append", help="only run the named fixture(s)")
+    args = parser.parse_args(argv)
+
+    baseline_path = os.path.abspath(args.baseline)
+    fixtures = {name: FIXTURES[name] for name in (args.fixture or FIXTURES)}
+    driver_name, new_driver = make_driver_factory(args.driver)
+
+    # Run in a scratch directory so credentials, selector cache and traces stay out of the repo
+    workdir = tempfile.TemporaryDirectory(prefix="jobauto-bench-")
+    previous_dir = os.getcwd()
+    os.chdir(workdir.name)
+    try:
+        with open("personal_data.json", "w", encoding="utf-8") as file:
+            json.dump(BENCHMARK_CREDENTIALS, file)
+
+        import automation
+        from platforms import REGISTRY
+        from selector_cache import SelectorCache
+        automation.SELECTOR_CACHE = SelectorCache(path=os.path.join(workdir.name, "selector_cache.json"))
+        for fixture, name in FIXTURE_PLATFORMS.items():
+            if fixture in fixtures:
+                REGISTRY.add_path_rule(re.escape("/" + fixture) + "$", name)
+
+        results = {}
+        with FixtureServer() as server:
+            for fixture, expected in fixtures.items():
+                print(f"▶️ {fixture}")
+                results[fixture] = run_fixture(server, fixture, expected, args.runs, new_driver)
+    finally:
+        os.chdir(previous_dir)
+        workdir.cleanup()
+
+    stored = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r", encoding="utf-8") as file:
+            stored = json.load(file)
+    baseline = stored.get(driver_name, {})
+
+    notes = compare(results, baseline)
+    print()
+    print(format_report(driver_name, results, baseline, notes))
+
+    if args.update_baseline:
+        stored[driver_name] = {
+            fixture: {key: result[key] for key in ("median_ms", "round_trips", "success_rate")}
+            for fixture, result in results.items()
+        }
+        with open(baseline_path, "w", encoding="utf-8") as file:
+            json.dump(stored, file, indent=2, sort_keys=True)
+            file.write("\n")
+        print(f"💾 Baseline updated: {baseline_path}")
+        return 0
+
+    regressed = [fixture for fixture, problems in notes.items() if problems and problems != ["new fixture"]]
+    if regressed:
+        print(f"❌ Regressions: {', '.join(regressed)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,102 @@
+"""
+Tab Memory Comparison
+=====================
+Opens the same pages as tabs in one Chrome session (through TabManager, as
+the auto-login flow does) and as one Chrome session per page, and reports
+total browser RSS and RSS per opened URL for each.
+
+    python -m benchmark.tab_memory                      # fixture pages
+    python -m benchmark.tab_memory https://example.com  # real sites
+    python -m benchmark.tab_memory --copies 3 --lean
+
+Needs a local Chrome and chromedriver on PATH.
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+
+import lean_profile
+from benchmark.fixture_server import FixtureServer
+from benchmark.profile_compare import _mb, launch
+from benchmark.run_benchmark import FIXTURES
+from page_readiness import document_ready, network_idle, wait_for
+from tab_manager import TabManager
+
+# Let renderers settle before sampling memory
+SETTLE_SECONDS = 1.0
+
+
+def _load(driver, url):
+    driver.get(url)
+    wait_for(driver, "navigation", [document_ready(), network_idle()])
+
+
+def measure_tabs(lean, urls):
+    """(total RSS, load seconds) with every URL in its own tab of one browser"""
+    tabs = TabManager(max_tabs=len(urls))
+    with tempfile.TemporaryDirectory(prefix="jobauto-tabs-") as profile_dir:
+        driver = launch(lean, profile_dir)
+        try:
+            started = time.perf_counter()
+            for url in urls:
+                tabs.open_tab(driver, url)
+                _load(driver, url)
+            elapsed = time.perf_counter() - started
+            time.sleep(SETTLE_SECONDS)
+            return lean_profile.browser_rss(driver), elapsed
+        finally:
+            driver.quit()
+
+
+def measure_browsers(lean, urls):
+    """(total RSS, load seconds) with one browser per URL, all kept open"""
+    drivers, dirs = [], []
+    try:
+        started = time.perf_counter()
+        for url in urls:
+            dirs.append(tempfile.TemporaryDirectory(prefix="jobauto-tabs-"))
+            drivers.append(launch(lean, dirs[-1].name))
+            _load(drivers[-1], url)
+        elapsed = time.perf_counter() - started
+        time.sleep(SETTLE_SECONDS)
+        samples = [lean_profile.browser_rss(driver) for driver in drivers]
+        total = None if any(rss is None for rss in samples) else sum(samples)
+        return total, elapsed
+    finally:
+        for driver in drivers:
+            driver.quit()
+        for directory in dirs:
+            directory.cleanup()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare browser RSS of one tab per URL with one browser per URL")
+    parser.add_argument("urls", nargs="*", help="pages to open (default: the benchmark fixtures)")
+    parser.add_argument("--copies", type=int, default=1, help="open every URL this many times")
+    parser.add_argument("--lean", action="store_true", help="use the lean profile in both modes")
+    args = parser.parse_args(argv)
+
+    with FixtureServer() as server:
+        urls = (args.urls or [server.url(fixture) for fixture in FIXTURES]) * max(args.copies, 1)
+        try:
+            tab_rss, tab_seconds = measure_tabs(args.lean, urls)
+            browser_rss, browser_seconds = measure_browsers(args.lean, urls)
+        except Exception as e:
+            print(f"❌ Could not run Chrome: {e}")
+            return 1
+
+    count = len(urls)
+    print(f"{'mode':<28}{'URLs':>6}{'total RSS':>12}{'per URL':>10}{'open s':>9}")
+    for mode, rss, seconds in (("tabs in one browser", tab_rss, tab_seconds),
+                               ("one browser per URL", browser_rss, browser_seconds)):
+        per_url = rss / count if rss is not None else None
+        print(f"{mode:<28}{count:>6}{_mb(rss):>12}{_mb(per_url):>10}{seconds:>9.1f}")
+    if tab_rss and browser_rss:
+        print(f"💾 Tabs use {1 - tab_rss / browser_rss:.0%} less memory per opened URL")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,408 @@
+"""
+DevTools Tabs
+=============
+Opens tabs in the user's own running Chrome (or Chromium) over its DevTools
+websocket instead of spawning `chrome --new-tab URL` for every URL.
+
+One browser-level connection is opened on first use and kept: every URL
+costs a Target.createTarget message, batches are pipelined over the socket
+without waiting for each reply, and each tab is briefly attached to so its
+load event can be reported (then detached again).
+
+The browser binary and the debugging endpoint are found per platform:
+DEVTOOLS_ENDPOINT / the JOBAUTO_DEVTOOLS environment variable if set, else
+the DevToolsActivePort file Chrome writes into its user data directory, else
+/json/version on the usual ports. Chrome only listens when started with
+--remote-debugging-port=9222 (recent versions also need a non-default
+--user-data-dir for that) or with remote debugging enabled at
+chrome://inspect/#remote-debugging.
+"""
+
+import json
+import os
+import shutil
+import sys
+import threading
+import time
+import urllib.request
+from collections import deque
+
+# ws://... or http://host:port of the browser; None = discover
+DEVTOOLS_ENDPOINT = os.environ.get("JOBAUTO_DEVTOOLS") or None
+DEFAULT_PORTS = (9222, 9229)
+
+CONNECT_TIMEOUT = 3
+RETRY_AFTER = 30  # seconds before a failed discovery is tried again
+COMMAND_TIMEOUT = 10
+LOAD_TIMEOUT = 30
+
+SAMPLES = 100
+
+
+class DevToolsUnavailable(RuntimeError):
+    """No reachable DevTools endpoint (or the websockets package is missing)"""
+
+
+# ------------------------------------------------------------------ discovery
+
+def chrome_candidates():
+    """Likely Chrome/Chromium executables for this platform, most preferred first"""
+    candidates = [os.environ.get("CHROME_PATH")]
+    if sys.platform == "win32":
+        for base in (os.environ.get("PROGRAMFILES"), os.environ.get("PROGRAMFILES(X86)"),
+                     os.environ.get("LOCALAPPDATA")):
+            if base:
+                candidates.append(os.path.join(base, "Google", "Chrome", "Application", "chrome.exe"))
+                candidates.append(os.path.join(base, "Chromium", "Application", "chrome.exe"))
+        try:
+            import winreg
+
+            key = r"SOFTWARE\Microsoft\Windows\CurrentVersion\App Paths\chrome.exe"
+            for hive in (winreg.HKEY_CURRENT_USER, winreg.HKEY_LOCAL_MACHINE):
+                try:
+                    with winreg.OpenKey(hive, key) as handle:
+                        candidates.append(winreg.QueryValue(handle, None))
+                except OSError:
+                    pass
+        except ImportError:
+            pass
+    elif sys.platform == "darwin":
+        for app in ("Google Chrome", "Chromium", "Google Chrome Canary"):
+            for root in ("/Applications", os.path.expanduser("~/Applications")):
+                candidates.append(os.path.join(root, f"{app}.app", "Contents", "MacOS", app))
+    for name in ("google-chrome", "google-chrome-stable", "chromium", "chromium-browser", "chrome"):
+        candidates.append(shutil.which(name))
+    return [path for path in dict.fromkeys(candidates) if path]
+
+
+def find_chrome():
+    """Path of the Chrome/Chromium executable, or None"""
+    return next((path for path in chrome_candidates() if os.path.isfile(path)), None)
+
+
+def user_data_dirs():
+    """Default user data directories of Chrome/Chromium on this platform"""
+    home = os.path.expanduser("~")
+    if sys.platform == "win32":
+        local = os.environ.get("LOCALAPPDATA") or os.path.join(home, "AppData", "Local")
+        return [os.path.join(local, "Google", "Chrome", "User Data"), os.path.join(local, "Chromium", "User Data")]
+    if sys.platform == "darwin":
+        support = os.path.join(home, "Library", "Application Support")
+        return [os.path.join(support, "Google", "Chrome"), os.path.join(support, "Chromium")]
+    config = os.environ.get("CHROME_CONFIG_HOME") or os.environ.get("XDG_CONFIG_HOME") or os.path.join(home, ".config")
+    return [os.path.join(config, name) for name in ("google-chrome", "google-chrome-beta", "chromium")] + [
+        os.path.join(home, "snap", "chromium", "common", "chromium")
+    ]
+
+
+def _version_info(http_base):
+    """/json/version of a DevTools HTTP endpoint (dict), or None"""
+    try:
+        with urllib.request.urlopen(f"{http_base}/json/version", timeout=CONNECT_TIMEOUT) as response:
+            return json.loads(response.read().decode("utf-8"))
+    except (OSError, ValueError):
+        return None
+
+
+def endpoint_candidates(endpoint=DEVTOOLS_ENDPOINT):
+    """Browser websocket URLs to try, most specific first (generated lazily)"""
+    if endpoint and endpoint.startswith("ws"):
+        yield endpoint
+        return
+    if endpoint:
+        info = _version_info(endpoint.rstrip("/"))
+        if info and info.get("webSocketDebuggerUrl"):
+            yield info["webSocketDebuggerUrl"]
+        return
+
+    # Chrome writes '<port>\n/devtools/browser/<id>' here while remote debugging is on
+    # (a file left by a browser that has since exited simply fails to connect)
+    for directory in user_data_dirs():
+        try:
+            with open(os.path.join(directory, "DevToolsActivePort"), "r", encoding="utf-8") as file:
+                port, path = file.read().split()[:2]
+        except (OSError, ValueError):
+            continue
+        if port.isdigit():
+            yield f"ws://127.0.0.1:{port}{path}"
+
+    for port in DEFAULT_PORTS:
+        info = _version_info(f"http://127.0.0.1:{port}")
+        if info and info.get("webSocketDebuggerUrl"):
+            yield info["webSocketDebuggerUrl"]
+
+
+# ----------------------------------------------------------------- connection
+
+class _Pending:
+    __slots__ = ("event", "response")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.response = None
+
+
+class DevToolsClient:
+    """Persistent browser-level DevTools connection that opens tabs"""
+
+    def __init__(self, endpoint=DEVTOOLS_ENDPOINT):
+        self.endpoint = endpoint
+        self._lock = threading.Lock()
+        self._connect_lock = threading.Lock()
+        self._ws = None
+        self._ws_url = None
+        self._next_id = 0
+        self._unavailable = None   # (retry after monotonic time, DevToolsUnavailable)
+        self._pending = {}     # message id -> _Pending
+        self._listeners = {}   # (session id, event) -> callback(params)
+        self._open_ms = deque(maxlen=SAMPLES)
+        self._load_ms = deque(maxlen=SAMPLES)
+        self._stats = {"connects": 0, "tabs": 0, "loaded": 0, "load_timeouts": 0, "errors": 0}
+
+    def _connect(self):
+        """Open the websocket and its reader thread unless connected.
+
+        Discovery and the handshake run outside self._lock (a slow or hung
+        endpoint must not block stats or other callers); _connect_lock only
+        keeps two callers from probing at once.
+        """
+        with self._connect_lock:
+            with self._lock:
+                if self._ws is not None:
+                    return
+                # Without a debugging endpoint every open would probe again; fail fast for a while
+                if self._unavailable and time.monotonic() < self._unavailable[0]:
+                    raise self._unavailable[1]
+            try:
+                from websockets.sync.client import connect
+            except ImportError:
+                raise DevToolsUnavailable("the websockets package is not installed") from None
+
+            ws, failures = None, []
+            for url in endpoint_candidates(self.endpoint):
+                try:
+                    ws = connect(url, open_timeout=CONNECT_TIMEOUT, max_size=None, compression=None)
+                    break
+                except Exception as e:
+                    failures.append(f"{url}: {e}")
+            with self._lock:
+                if ws is None:
+                    detail = f" ({'; '.join(failures)})" if failures else ""
+                    error = DevToolsUnavailable(f"Chrome is not running with remote debugging enabled{detail}")
+                    self._unavailable = (time.monotonic() + RETRY_AFTER, error)
+                    raise error
+                self._ws, self._ws_url, self._unavailable = ws, url, None
+                self._stats["connects"] += 1
+            threading.Thread(target=self._read, args=(ws,), daemon=True).start()
+            print(f"🔌 Connected to Chrome DevTools at {url}")
+
+    def _drop(self, ws):
+        """Forget a broken connection so the next send reconnects"""
+        with self._lock:
+            if self._ws is ws:
+                self._ws = None
+        try:
+            ws.close()
+        except Exception:
+            pass
+
+    def _read(self, ws):
+        """Route replies to their callers and events to their listeners"""
+        try:
+            for raw in ws:
+                message = json.loads(raw)
+                if "id" in message:
+                    with self._lock:
+                        pending = self._pending.pop(message["id"], None)
+                    if pending is not None:
+                        pending.response = message
+                        pending.event.set()
+                    continue
+                with self._lock:
+                    listener = self._listeners.get((message.get("sessionId"), message.get("method")))
+                if listener is not None:
+                    listener(message.get("params") or {})
+        except Exception:
+            pass
+        finally:
+            # Connection gone (browser closed): fail everything still waiting
+            with self._lock:
+                if self._ws is ws:
+                    self._ws = None
+                pending, self._pending = self._pending, {}
+            for waiter in pending.values():
+                waiter.response = {"error": {"message": "DevTools connection closed"}}
+                waiter.event.set()
+
+    def send(self, commands):
+        """Pipeline (method, params, session_id) commands; returns their _Pending waiters in order.
+
+        Raises DevToolsUnavailable if the connection fails before any command
+        went out. If it breaks part way, the rest of the waiters fail instead
+        (the commands already sent may have taken effect).
+        """
+        self._connect()
+        waiters, sent, failure = [], 0, None
+        with self._lock:
+            ws = self._ws
+            if ws is None:
+                raise DevToolsUnavailable("DevTools connection closed")
+            for method, params, session_id in commands:
+                waiter = _Pending()
+                waiters.append(waiter)
+                if failure is None:
+                    self._next_id += 1
+                    message = {"id": self._next_id, "method": method, "params": params or {}}
+                    if session_id:
+                        message["sessionId"] = session_id
+                    self._pending[self._next_id] = waiter
+                    try:
+                        ws.send(json.dumps(message))
+                        sent += 1
+                        continue
+                    except Exception as e:  # websockets' ConnectionClosed, OSError
+                        self._pending.pop(self._next_id, None)
+                        failure = e
+                waiter.response = {"error": {"message": f"DevTools connection lost: {failure}"}}
+                waiter.event.set()
+        if failure is not None:
+            self._drop(ws)
+            if not sent:
+                raise DevToolsUnavailable(f"DevTools connection lost: {failure}") from failure
+        return waiters
+
+    @staticmethod
+    def result(waiter, timeout=COMMAND_TIMEOUT):
+        """The result of one command; raises RuntimeError on a DevTools error or timeout"""
+        if not waiter.event.wait(timeout):
+            raise TimeoutError(f"No DevTools reply after {timeout}s")
+        if "error" in waiter.response:
+            raise RuntimeError(waiter.response["error"].get("message", "DevTools error"))
+        return waiter.response.get("result") or {}
+
+    def call(self, method, params=None, session_id=None, timeout=COMMAND_TIMEOUT):
+        return self.result(self.send([(method, params, session_id)])[0], timeout)
+
+    def close(self):
+        with self._lock:
+            ws, self._ws = self._ws, None
+        if ws is not None:
+            ws.close()
+
+    # ------------------------------------------------------------------- tabs
+
+    def open_tabs(self, urls, wait_for_load=True, timeout=LOAD_TIMEOUT):
+        """Open every URL as a new tab in one pipelined batch.
+
+        Returns one dict per URL: url, target_id, open_ms (until Chrome
+        created the tab), loaded (True/False, None if not waited for),
+        load_ms and error.
+        """
+        started = time.perf_counter()
+        results = [{"url": url, "target_id": None, "open_ms": None, "loaded": None, "load_ms": None, "error": None}
+                   for url in urls]
+        # The first tab comes to the front, the rest open in the background
+        created = self.send([("Target.createTarget", {"url": url, "background": i > 0}, None)
+                             for i, url in enumerate(urls)])
+        for result, waiter in zip(results, created):
+            try:
+                result["target_id"] = self.result(waiter)["targetId"]
+                result["open_ms"] = (time.perf_counter() - started) * 1000
+                self._open_ms.append(result["open_ms"])
+            except Exception as e:
+                result["error"] = str(e)
+
+        opened = [result for result in results if result["target_id"]]
+        with self._lock:
+            self._stats["tabs"] += len(opened)
+            self._stats["errors"] += len(results) - len(opened)
+        if wait_for_load and opened:
+            # The tabs exist now: a failure while watching them load must not make callers open them again
+            try:
+                self._wait_for_loads(opened, started, timeout)
+            except Exception as e:
+                print(f"⚠️ Could not follow tab loads: {e}")
+        return results
+
+    def _wait_for_loads(self, results, started, timeout):
+        """Attach to each new tab, note when its load event fires, then detach"""
+        attached = self.send([("Target.attachToTarget", {"targetId": result["target_id"], "flatten": True}, None)
+                              for result in results])
+        sessions = []
+        for result, waiter in zip(results, attached):
+            try:
+                sessions.append((result, self.result(waiter)["sessionId"], threading.Event()))
+            except Exception as e:
+                result["error"] = str(e)
+
+        def on_load(result, done):
+            def listener(_params):
+                if not done.is_set():
+                    result["load_ms"] = (time.perf_counter() - started) * 1000
+                    done.set()
+            return listener
+
+        with self._lock:
+            for result, session_id, done in sessions:
+                self._listeners[(session_id, "Page.loadEventFired")] = on_load(result, done)
+        try:
+            # A tab that finished before Page.enable took effect reports readyState 'complete' instead
+            commands = []
+            for _, session_id, _ in sessions:
+                commands.append(("Page.enable", None, session_id))
+                commands.append(("Runtime.evaluate", {"expression": "document.readyState", "returnByValue": True},
+                                 session_id))
+            replies = self.send(commands)
+            for index, (result, _, done) in enumerate(sessions):
+                try:
+                    state = self.result(replies[2 * index + 1]).get("result", {}).get("value")
+                except Exception:
+                    state = None
+                if state == "complete" and not done.is_set():
+                    result["load_ms"] = (time.perf_counter() - started) * 1000
+                    done.set()
+
+            deadline = time.monotonic() + timeout
+            for result, _, done in sessions:
+                result["loaded"] = done.wait(max(deadline - time.monotonic(), 0))
+        finally:
+            with self._lock:
+                for result, session_id, _ in sessions:
+                    self._listeners.pop((session_id, "Page.loadEventFired"), None)
+                    if result["loaded"]:
+                        self._stats["loaded"] += 1
+                        self._load_ms.append(result["load_ms"])
+                    elif result["loaded"] is False:
+                        self._stats["load_timeouts"] += 1
+            # Leave the tabs to the user; replies are not needed, and a failure here changes nothing
+            try:
+                self.send([("Target.detachFromTarget", {"sessionId": session_id}, None)
+                           for _, session_id, _ in sessions])
+            except DevToolsUnavailable:
+                pass
+
+    # ------------------------------------------------------------------ stats
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["connected"] = self._ws is not None
+            opens, loads = list(self._open_ms), list(self._load_ms)
+        stats["avg_open_ms"] = sum(opens) / len(opens) if opens else None
+        stats["avg_load_ms"] = sum(loads) / len(loads) if loads else None
+        return stats
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        s = self.stats()
+        if not s["tabs"] and not s["connected"]:
+            return "**Your Chrome (DevTools)** — not connected yet"
+        open_ms = f"{s['avg_open_ms']:.0f} ms" if s["avg_open_ms"] is not None else "n/a"
+        load_ms = f"{s['avg_load_ms']:.0f} ms" if s["avg_load_ms"] is not None else "n/a"
+        state = "connected" if s["connected"] else "disconnected"
+        return (f"**Your Chrome (DevTools)** — {state} · Tabs opened: {s['tabs']} "
+                f"(avg open {open_ms}, avg load {load_ms}) · Load timeouts: {s['load_timeouts']}")
+
+
+# Shared connection to the user's Chrome
+DEVTOOLS = DevToolsClient()
@@ -0,0 +1,347 @@
+"""
+Chrome Driver Pool
+==================
+Keeps pre-launched Chrome WebDriver sessions warm so handlers can borrow one
+instead of cold-starting chromedriver + Chrome on every click.
+
+Sessions are health-checked before they are handed out, dead ones are
+replaced, sessions idle for too long are evicted unless they still hold tabs
+the user is working in, and every driver is quit on shutdown. A returned
+session keeps its tabs (see tab_manager), so callers can ask for the one
+already signed into their site; a session whose browser is full of tabs is
+only reused when no new one can be launched.
+"""
+
+import atexit
+import threading
+import time
+
+import lean_profile
+from profile_manager import PROFILES
+from tab_manager import TABS
+
+CHROMEDRIVER_PATH = r"chromedriver-win64\chromedriver-win64\chromedriver.exe"
+
+POOL_MIN_SIZE = 1
+POOL_MAX_SIZE = 3
+POOL_IDLE_TIMEOUT = 15 * 60  # seconds an idle session without open tabs may sit before it is evicted
+MAINTENANCE_INTERVAL = 30
+
+
+def build_chrome_options(profile, lean=None):
+    """Chrome options for login automation on a session profile (profile_manager.ProfileSession).
+
+    lean (default lean_profile.LEAN_MODE) adds the flags that switch off
+    extensions and background work, and headless mode if configured.
+    """
+    from selenium import webdriver
+
+    lean = lean_profile.LEAN_MODE if lean is None else lean
+
+    chrome_options = webdriver.ChromeOptions()
+
+    # Every session runs on its own cloned profile and port, so sessions never share a lock
+    chrome_options.add_argument(f"--user-data-dir={profile.path}")
+    chrome_options.add_argument(f"--remote-debugging-port={profile.port}")
+
+    # Chrome options for better experience and login automation
+    if not (lean and lean_profile.HEADLESS_MODE):
+        chrome_options.add_argument("--start-maximized")
+    chrome_options.add_argument("--disable-blink-features=AutomationControlled")
+    chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+    chrome_options.add_experimental_option('useAutomationExtension', False)
+    chrome_options.add_argument("--disable-web-security")
+    chrome_options.add_argument("--allow-running-insecure-content")
+
+    if lean:
+        lean_profile.add_lean_arguments(chrome_options)
+    return chrome_options
+
+
+def launch_driver(slot=0, lean=None, profile=None):
+    """Cold-start a Chrome WebDriver session on a fresh clone of the template profile.
+
+    Pass profile to run on an existing ProfileSession instead (it is then
+    not deleted when the driver quits).
+    """
+    from selenium import webdriver
+    from selenium.webdriver.chrome.service import Service
+
+    owned = profile is None
+    if owned:
+        profile = PROFILES.create()
+    service = Service(executable_path=CHROMEDRIVER_PATH)
+    try:
+        driver = webdriver.Chrome(service=service, options=build_chrome_options(profile, lean))
+    except Exception:
+        if owned:
+            PROFILES.remove(profile)
+        raise
+    if owned:
+        PROFILES.attach(driver, profile)
+    return driver
+
+
+def is_driver_healthy(driver):
+    """Cheap liveness probe: the session answers and still has a window"""
+    try:
+        return bool(driver.window_handles)
+    except Exception:
+        return False
+
+
+def _quit(driver):
+    try:
+        driver.quit()
+    except Exception:
+        pass
+    PROFILES.release(driver)
+
+
+class DriverPool:
+    """Bounded pool of warm Chrome sessions"""
+
+    def __init__(self, min_size=POOL_MIN_SIZE, max_size=POOL_MAX_SIZE,
+                 idle_timeout=POOL_IDLE_TIMEOUT, launcher=launch_driver, keep=TABS.holds_tabs):
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.idle_timeout = idle_timeout
+        self.launcher = launcher
+        self.keep = keep  # keep(driver) -> True: never evict (it holds the user's tabs)
+
+        self._cond = threading.Condition()
+        self._idle = []       # [(driver, slot, idle_since)]
+        self._in_use = {}     # id(driver) -> (driver, slot)
+        self._free_slots = list(range(self.max_size))
+        self._launching = 0
+        self._closed = False
+        self._maintenance = None
+
+        self._stats = {
+            "hits": 0,
+            "cold_starts": 0,
+            "launch_seconds": 0.0,
+            "dead_replaced": 0,
+            "evicted": 0,
+            "launch_failures": 0,
+        }
+
+        atexit.register(self.shutdown)
+
+    # ----------------------------------------------------------------- launch
+
+    def _reserve_slot(self):
+        """Reserve a slot for a new session (caller holds the lock)"""
+        if self._closed or not self._free_slots:
+            return None
+        self._launching += 1
+        return self._free_slots.pop(0)
+
+    def _launch(self, slot):
+        """Launch a session for a reserved slot, timing the cold start"""
+        started = time.perf_counter()
+        try:
+            driver = self.launcher(slot)
+        except Exception:
+            with self._cond:
+                self._launching -= 1
+                self._free_slots.append(slot)
+                self._stats["launch_failures"] += 1
+                self._cond.notify_all()
+            raise
+        elapsed = time.perf_counter() - started
+        with self._cond:
+            self._launching -= 1
+            self._stats["cold_starts"] += 1
+            self._stats["launch_seconds"] += elapsed
+        print(f"🚀 Launched Chrome session in slot {slot} ({elapsed:.1f}s)")
+        return driver
+
+    def _warm_one(self):
+        with self._cond:
+            slot = self._reserve_slot()
+        if slot is None:
+            return
+        try:
+            driver = self._launch(slot)
+        except Exception as e:
+            print(f"⚠️ Could not pre-warm Chrome session: {e}")
+            return
+        with self._cond:
+            if self._closed:
+                _quit(driver)
+                self._free_slots.append(slot)
+                return
+            self._idle.append((driver, slot, time.monotonic()))
+            self._cond.notify_all()
+
+    def _top_up(self):
+        """Launch sessions in the background until min_size are idle or launching"""
+        with self._cond:
+            missing = self.min_size - len(self._idle) - self._launching
+        for _ in range(max(missing, 0)):
+            threading.Thread(target=self._warm_one, daemon=True).start()
+
+    def start(self):
+        """Pre-warm min_size sessions and start the idle-eviction thread"""
+        self._top_up()
+        if self._maintenance is None:
+            self._maintenance = threading.Thread(target=self._maintain, daemon=True)
+            self._maintenance.start()
+
+    # ----------------------------------------------------------- borrow/return
+
+    def acquire(self, timeout=60, prefer=None):
+        """Borrow a healthy session, launching one if the pool is not full.
+
+        prefer(driver) -> bool or rank picks among idle sessions (e.g. one
+        already signed into the site): the highest ranked is taken, the least
+        recently used one among equals. A session ranked 0 (e.g. no room for
+        another tab) is only taken when no new one can be launched.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            with self._cond:
+                if self._closed:
+                    raise RuntimeError("Driver pool is shut down")
+
+                slot = None
+                if self._idle:
+                    # Least recently used first, so a window the user just saw is kept longest
+                    index = max(range(len(self._idle)), key=lambda i: prefer(self._idle[i][0])) if prefer else 0
+                    if prefer and not prefer(self._idle[index][0]):
+                        slot = self._reserve_slot()
+                if self._idle and slot is None:
+                    driver, slot, _ = self._idle.pop(index)
+                    checked = (driver, slot)
+                else:
+                    checked = None
+                    slot = self._reserve_slot() if slot is None else slot
+                    if slot is None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(f"No Chrome session free after {timeout}s (max {self.max_size})")
+                        self._cond.wait(remaining)
+                        continue
+
+            if checked:
+                driver, slot = checked
+                if is_driver_healthy(driver):
+                    with self._cond:
+                        self._stats["hits"] += 1
+                        self._in_use[id(driver)] = (driver, slot)
+                    self._top_up()
+                    return driver
+                # Dead session (window closed, Chrome crashed): drop it and try again
+                print(f"💀 Chrome session in slot {slot} is dead, replacing it")
+                _quit(driver)
+                with self._cond:
+                    self._stats["dead_replaced"] += 1
+                    self._free_slots.append(slot)
+                continue
+
+            driver = self._launch(slot)
+            with self._cond:
+                self._in_use[id(driver)] = (driver, slot)
+            self._top_up()
+            return driver
+
+    def release(self, driver):
+        """Return a borrowed session to the pool (dead sessions are discarded)"""
+        with self._cond:
+            if id(driver) not in self._in_use:
+                return
+        # Probe outside the lock: a hung browser must not stall every acquire/release/stats
+        healthy = is_driver_healthy(driver)
+        with self._cond:
+            entry = self._in_use.pop(id(driver), None)
+            if entry is None:
+                return  # shut down meanwhile; shutdown() quits it
+            slot = entry[1]
+            if not self._closed and healthy:
+                self._idle.append((driver, slot, time.monotonic()))
+                self._cond.notify_all()
+                return
+            self._free_slots.append(slot)
+            self._cond.notify_all()
+        _quit(driver)
+
+    # ------------------------------------------------------------ maintenance
+
+    def evict_idle(self):
+        """Quit sessions idle longer than idle_timeout, except those keep() holds on to"""
+        now = time.monotonic()
+        expired = []
+        with self._cond:
+            keep = []
+            for driver, slot, idle_since in self._idle:
+                if now - idle_since > self.idle_timeout:
+                    expired.append((driver, slot, idle_since))
+                else:
+                    keep.append((driver, slot, idle_since))
+            self._idle = keep
+
+        # keep() may talk to the browser, so it runs outside the lock
+        evicted = 0
+        for driver, slot, idle_since in expired:
+            if self.keep is not None and self.keep(driver):
+                with self._cond:
+                    if not self._closed:
+                        self._idle.append((driver, slot, idle_since))
+                        self._cond.notify_all()
+                        continue
+            print(f"🧹 Evicting Chrome session idle for over {self.idle_timeout}s (slot {slot})")
+            _quit(driver)
+            with self._cond:
+                self._stats["evicted"] += 1
+                self._free_slots.append(slot)
+                self._cond.notify_all()
+            evicted += 1
+        return evicted
+
+    def _maintain(self):
+        while not self._closed:
+            time.sleep(MAINTENANCE_INTERVAL)
+            if self._closed:
+                break
+            self.evict_idle()
+            self._top_up()
+
+    def shutdown(self):
+        """Quit every driver, idle or borrowed"""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            drivers = [driver for driver, _, _ in self._idle]
+            drivers += [driver for driver, _ in self._in_use.values()]
+            self._idle = []
+            self._in_use = {}
+            self._cond.notify_all()
+        for driver in drivers:
+            _quit(driver)
+        if drivers:
+            print(f"🛑 Driver pool shut down, quit {len(drivers)} Chrome session(s)")
+
+    # ------------------------------------------------------------------ stats
+
+    def stats(self):
+        with self._cond:
+            stats = dict(self._stats)
+            stats["idle"] = len(self._idle)
+            stats["in_use"] = len(self._in_use)
+            stats["launching"] = self._launching
+        launches = stats["cold_starts"]
+        stats["avg_launch_seconds"] = stats["launch_seconds"] / launches if launches else 0.0
+        return stats
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        s = self.stats()
+        return (
+            f"**Driver pool** — idle: {s['idle']}, in use: {s['in_use']}, launching: {s['launching']} "
+            f"(min {self.min_size}, max {self.max_size})\n\n"
+            f"Hits: {s['hits']} · Cold starts: {s['cold_starts']} · "
+            f"Avg launch: {s['avg_launch_seconds']:.1f}s · "
+            f"Dead replaced: {s['dead_replaced']} · Evicted idle: {s['evicted']}"
+        )
@@ -0,0 +1,292 @@
+"""
+Application Form Fill
+=====================
+Fills job application forms from the profile in personal_data.json.
+
+Profile values are mapped to form controls by their autocomplete tokens,
+name/id attributes and label text. One injected script matches and sets every
+field, dispatching input/change events so React/Workday-style forms pick the
+values up; only fields that reject the scripted value fall back to
+send_keys. Fields the user already filled in are left alone. Only pages
+a known platform marks as its application form are filled (see
+is_application_form), so profile data never lands in unrelated forms.
+
+personal_data.json layout (every section optional, other keys ignored):
+
+    {
+      "login_credentials": {...},
+      "personal_info": {"first_name", "middle_name", "last_name", "full_name", "email", "phone"},
+      "address": {"street", "line2", "city", "state", "postal_code", "country"},
+      "links": {"linkedin", "github", "website"},
+      "education": [{"school", "degree", "major", "gpa", "graduation_date"}, ...],
+      "work_experience": [{"company", "title", "description"}, ...]
+    }
+
+The first education / work_experience entry (most recent) is used. A value
+not found at the listed paths is also looked up by its key anywhere in the
+file, so flat layouts ({"first_name": ...}) work too.
+"""
+
+import json
+import time
+
+PROFILE_PATH = "personal_data.json"
+
+# Fill application forms after the open/auto-login flow
+AUTO_FILL_FORMS = True
+
+# Replace values already present in a field (user input, browser autofill)
+OVERWRITE_EXISTING = False
+
+# (key, profile paths, autocomplete tokens, pattern matched against the
+# normalized name/id/label of a control, or None where any such pattern would
+# also catch unrelated fields). Earlier rules claim fields first, so specific
+# rules come before generic ones.
+FIELD_RULES = [
+    ("first_name", ["personal_info.first_name", "name.first"], ["given-name"],
+     r"\b(first|given|legal first) ?name\b|\bfname\b"),
+    ("middle_name", ["personal_info.middle_name", "name.middle"], ["additional-name"],
+     r"\bmiddle ?name\b"),
+    ("last_name", ["personal_info.last_name", "name.last"], ["family-name"],
+     r"\b(last|family|sur) ?name\b|\blname\b"),
+    ("email", ["personal_info.email", "contact.email"], ["email"],
+     r"\be ?mail\b"),
+    ("phone", ["personal_info.phone", "contact.phone"], ["tel", "tel-national"],
+     r"\b(phone|mobile|cell|telephone)( number)?\b"),
+    ("full_name", ["personal_info.full_name", "name.full"], ["name"],
+     r"^(full |legal |your )?name$"),
+    ("address_line2", ["address.line2", "address.address_line2"], ["address-line2"],
+     r"\baddress line ?2\b|\b(apt|apartment|suite|unit)\b"),
+    ("street", ["address.street", "address.line1", "address.address_line1"], ["address-line1", "street-address"],
+     r"\bstreet\b|^(home |mailing )?address( line)? ?1?$"),
+    ("city", ["address.city"], ["address-level2"],
+     r"\b(city|town)\b"),
+    ("state", ["address.state", "address.province"], ["address-level1"],
+     r"\b(state|province)\b"),
+    ("postal_code", ["address.postal_code", "address.zip"], ["postal-code"],
+     r"\b(zip|postal)( ?code)?\b"),
+    ("country", ["address.country"], ["country", "country-name"],
+     r"\bcountry\b"),
+    ("linkedin", ["links.linkedin"], [],
+     r"\blinked ?in\b"),
+    ("github", ["links.github"], [],
+     r"\bgit ?hub\b"),
+    ("website", ["links.website", "links.portfolio"], ["url"],
+     r"\b(website|portfolio|personal (site|url))\b"),
+    ("school", ["education.0.school", "education.0.institution", "education.0.university"], [],
+     r"\b(school|university|college|institution)\b"),
+    ("degree", ["education.0.degree"], [],
+     r"\bdegree\b"),
+    ("major", ["education.0.major", "education.0.field_of_study"], [],
+     r"\b(major|field of study|discipline)\b"),
+    ("gpa", ["education.0.gpa"], [],
+     r"\b(gpa|grade point)\b"),
+    ("graduation_date", ["education.0.graduation_date", "education.0.end_date"], [],
+     r"\bgraduat"),
+    ("company", ["work_experience.0.company", "work_history.0.company", "experience.0.company"], ["organization"],
+     None),
+    ("job_title", ["work_experience.0.title", "work_history.0.title", "experience.0.title"], ["organization-title"],
+     r"\b(job|position) ?title\b"),
+    ("job_description", ["work_experience.0.description", "work_history.0.description",
+                         "experience.0.description"], [],
+     None),
+]
+
+# Matches every rule against every fillable control, sets the values with
+# the native setters and reports what was filled, rejected or not found
+FILL_SCRIPT = """
+var plan = arguments[0];
+var overwrite = arguments[1];
+var TEXT_TYPES = ['text', 'email', 'tel', 'url', 'number', 'search', ''];
+
+function visible(el) {
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+
+function normalize(text) {
+    return (text || '').replace(/([a-z])([A-Z])/g, '$1 $2').replace(/[_\\-.\\[\\]:*()]+/g, ' ')
+        .replace(/\\s+/g, ' ').trim().toLowerCase();
+}
+
+function describe(el) {
+    var labels = [];
+    if (el.labels) {
+        for (var i = 0; i < el.labels.length; i++) labels.push(el.labels[i].innerText);
+    }
+    (el.getAttribute('aria-labelledby') || '').split(/\\s+/).forEach(function (id) {
+        var node = id && document.getElementById(id);
+        if (node) labels.push(node.innerText);
+    });
+    ['aria-label', 'placeholder', 'title'].forEach(function (attr) {
+        if (el.getAttribute(attr)) labels.push(el.getAttribute(attr));
+    });
+    return {
+        element: el,
+        autocomplete: (el.getAttribute('autocomplete') || '').toLowerCase().split(/\\s+/),
+        names: [el.getAttribute('name'), el.id, el.getAttribute('data-automation-id')].map(normalize)
+            .filter(Boolean),
+        labels: labels.map(normalize).filter(Boolean)
+    };
+}
+
+var controls = [];
+document.querySelectorAll('input, textarea, select').forEach(function (el) {
+    if (el.disabled || el.readOnly || !visible(el)) return;
+    if (el.tagName === 'INPUT' && TEXT_TYPES.indexOf((el.getAttribute('type') || '').toLowerCase()) === -1) return;
+    controls.push(describe(el));
+});
+
+function score(rule, control) {
+    for (var i = 0; i < rule.autocomplete.length; i++) {
+        if (control.autocomplete.indexOf(rule.autocomplete[i]) !== -1) return 100;
+    }
+    if (!rule.pattern) return 0;
+    var pattern = new RegExp(rule.pattern, 'i');
+    if (control.names.some(function (name) { return pattern.test(name); })) return 60;
+    if (control.labels.some(function (label) { return pattern.test(label); })) return 40;
+    return 0;
+}
+
+function setValue(el, value) {
+    if (el.tagName === 'SELECT') {
+        var wanted = value.toLowerCase();
+        var match = -1;
+        for (var i = 0; i < el.options.length; i++) {
+            var text = (el.options[i].text || '').trim().toLowerCase();
+            if (text === wanted || (el.options[i].value || '').toLowerCase() === wanted) { match = i; break; }
+            if (match === -1 && wanted && text.indexOf(wanted) !== -1) match = i;
+        }
+        if (match === -1) return 'no_option';
+        el.selectedIndex = match;
+    } else {
+        var proto = el.tagName === 'TEXTAREA' ? HTMLTextAreaElement.prototype : HTMLInputElement.prototype;
+        Object.getOwnPropertyDescriptor(proto, 'value').set.call(el, value);
+    }
+    el.dispatchEvent(new Event('input', {bubbles: true}));
+    el.dispatchEvent(new Event('change', {bubbles: true}));
+    el.dispatchEvent(new Event('blur'));
+    return el.tagName === 'SELECT' || el.value === value ? 'filled' : 'rejected';
+}
+
+var used = [];
+var result = {filled: [], rejected: [], prefilled: [], no_option: [], unmatched: [], controls: controls.length};
+plan.forEach(function (rule) {
+    var best = null;
+    var bestScore = 0;
+    controls.forEach(function (control) {
+        if (used.indexOf(control) !== -1) return;
+        var s = score(rule, control);
+        if (s > bestScore) { best = control; bestScore = s; }
+    });
+    if (!best) { result.unmatched.push(rule.key); return; }
+    used.push(best);
+    var el = best.element;
+    var field = best.labels[0] || best.names[0] || el.tagName.toLowerCase();
+    var empty = el.tagName === 'SELECT' ? el.selectedIndex <= 0 : !el.value;
+    if (!empty && !overwrite) { result.prefilled.push({key: rule.key, field: field}); return; }
+    var outcome = setValue(el, rule.value);
+    var entry = {key: rule.key, field: field};
+    if (outcome === 'rejected') entry.element = el;
+    result[outcome].push(entry);
+});
+return result;
+"""
+
+
+def load_profile(path=PROFILE_PATH):
+    """personal_data.json as a dict ({} if it is missing)"""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def _flatten(data, prefix="", paths=None, leaves=None):
+    """Dotted paths ('education.0.school') and bare leaf keys -> scalar values"""
+    paths = {} if paths is None else paths
+    leaves = {} if leaves is None else leaves
+    items = data.items() if isinstance(data, dict) else enumerate(data)
+    for key, value in items:
+        path = f"{prefix}{str(key).lower()}"
+        if isinstance(value, (dict, list)):
+            if key != "login_credentials":
+                _flatten(value, path + ".", paths, leaves)
+        elif value not in (None, ""):
+            paths[path] = str(value)
+            # Bare keys only from top-level or dict sections, not list entries
+            if not any(part.isdigit() for part in path.split(".")):
+                leaves.setdefault(str(key).lower(), str(value))
+    return paths, leaves
+
+
+def build_fill_plan(profile):
+    """Rules that have a profile value, in FIELD_RULES order, ready for FILL_SCRIPT"""
+    paths, leaves = _flatten(profile)
+    values = {}
+    for key, profile_paths, _, _ in FIELD_RULES:
+        value = next((paths[path] for path in profile_paths if path in paths), None)
+        values[key] = value if value is not None else leaves.get(key)
+
+    if not values.get("full_name") and values.get("first_name") and values.get("last_name"):
+        values["full_name"] = f"{values['first_name']} {values['last_name']}"
+
+    return [
+        {"key": key, "value": values[key], "autocomplete": autocomplete, "pattern": pattern}
+        for key, _, autocomplete, pattern in FIELD_RULES
+        if values.get(key)
+    ]
+
+
+def is_application_form(driver, platform):
+    """Whether the current page is the application form of a known platform"""
+    if platform is None or not platform.application_selector:
+        return False
+    return bool(driver.execute_script("return !!document.querySelector(arguments[0]);",
+                                      platform.application_selector))
+
+
+def fill_form(driver, profile=None, overwrite=None):
+    """Fill the current page's form from the profile; returns a report dict"""
+    started = time.perf_counter()
+    profile = load_profile() if profile is None else profile
+    plan = build_fill_plan(profile)
+    report = {"filled": [], "fallback": [], "skipped": [], "prefilled": [], "controls": 0, "elapsed_ms": 0.0}
+    if not plan:
+        return report
+
+    overwrite = OVERWRITE_EXISTING if overwrite is None else overwrite
+    found = driver.execute_script(FILL_SCRIPT, plan, overwrite) or {}
+    values = {rule["key"]: rule["value"] for rule in plan}
+
+    report["controls"] = found.get("controls", 0)
+    report["filled"] = [entry["key"] for entry in found.get("filled", [])]
+    report["prefilled"] = [entry["key"] for entry in found.get("prefilled", [])]
+    report["skipped"] = list(found.get("unmatched", [])) + [entry["key"] for entry in found.get("no_option", [])]
+
+    # Fields that reverted the scripted value get real keystrokes instead
+    for entry in found.get("rejected", []):
+        try:
+            entry["element"].clear()
+            entry["element"].send_keys(values[entry["key"]])
+            report["fallback"].append(entry["key"])
+        except Exception as e:
+            print(f"⚠️ Could not type into {entry['field']} ({entry['key']}): {e}")
+            report["skipped"].append(entry["key"])
+
+    report["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    print(f"📝 {format_report(report)}")
+    return report
+
+
+def format_report(report):
+    """One-line fill summary for status messages"""
+    filled = len(report["filled"]) + len(report["fallback"])
+    text = (f"Filled {filled} field(s) ({len(report['fallback'])} via send_keys), "
+            f"skipped {len(report['skipped'])}")
+    if report["prefilled"]:
+        text += f", kept {len(report['prefilled'])} already filled"
+    return text + f" in {report['elapsed_ms']:.0f} ms"
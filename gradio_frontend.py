@@ -5,380 +5,188 @@ Simple web interface to input URL and open it in your logged-in Chrome browser
 """
 
 import gradio as gr
-from selenium import webdriver
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.common.by import By
-from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.common.keys import Keys
-import subprocess
+import asyncio
+import datetime
+import functools
 import time
-import os
-import json
 
-def auto_login_if_needed(driver):
-    """Detect if login is needed and automatically login using credentials from JSON"""
-    
-    try:
-        # Load login credentials from personal_data.json
-        with open('personal_data.json', 'r', encoding='utf-8') as file:
-            data = json.load(file)
-        
-        username = data['login_credentials']['username']
-        password = data['login_credentials']['password']
-        
-        print(f"🔍 Checking for login page...")
-        
-        # Wait longer for page to load completely
-        time.sleep(5)
-        
-        # Get page info for debugging
-        current_url = driver.current_url
-        page_title = driver.title
-        print(f"📍 Current URL: {current_url}")
-        print(f"📄 Page Title: {page_title}")
-        
-        # Check for common login page indicators (more comprehensive)
-        login_indicators = [
-            "asurite",
-            "user id", 
-            "username",
-            "login",
-            "sign in",
-            "sign-in",
-            "password",
-            "authentication",
-            "shibboleth",
-            "cas login"
-        ]
-        
-        page_source = driver.page_source.lower()
-        page_title_lower = page_title.lower()
-        
-        # Debug: Print some page content
-        print(f"🔍 Page contains login indicators: {any(indicator in page_source for indicator in login_indicators)}")
-        
-        # Check if it's a login page
-        is_login_page = any(indicator in page_source or indicator in page_title_lower for indicator in login_indicators)
-        
-        if is_login_page:
-            print("🔐 Login page detected! Attempting automatic login...")
-            
-            # More comprehensive username field selectors including ASURITE specific
-            username_selectors = [
-                # Standard username fields
-                "input[name='username']",
-                "input[name='userid']", 
-                "input[name='user_id']",
-                "input[name='user']",
-                "input[name='login']",
-                "input[name='email']",
-                # ASURITE specific
-                "input[name='asurite']",
-                "input[name='j_username']",  # Common in Shibboleth/CAS
-                "input[name='userPrincipalName']",
-                # ID selectors
-                "input[id='username']",
-                "input[id='userid']",
-                "input[id='user_id']",
-                "input[id='asurite']",
-                "input[id='user']",
-                "input[id='login']",
-                "input[id='j_username']",
-                # Generic text inputs (fallback)
-                "input[type='text']:first-of-type",
-                "input[type='email']",
-            ]
-            
-            # Password field selectors
-            password_selectors = [
-                "input[name='password']",
-                "input[name='pwd']",
-                "input[name='j_password']",  # Common in Shibboleth/CAS
-                "input[id='password']",
-                "input[id='pwd']", 
-                "input[id='j_password']",
-                "input[type='password']"
-            ]
-            
-            # Submit button selectors
-            submit_selectors = [
-                "button[type='submit']",
-                "input[type='submit']",
-                "button[name='submit']",
-                "input[name='submit']",
-                "button:contains('Sign In')",
-                "button:contains('Sign in')",
-                "button:contains('LOGIN')",
-                "button:contains('Login')",
-                "input[value*='Sign']",
-                "input[value*='Login']",
-                "button.btn-primary",
-                "button.login",
-                "button.signin",
-                "input.btn-primary"
-            ]
-            
-            username_field = None
-            password_field = None
-            submit_button = None
-            
-            # Find username field with detailed logging
-            print("🔍 Searching for username field...")
-            for i, selector in enumerate(username_selectors):
-                try:
-                    username_field = WebDriverWait(driver, 1).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"✅ Found username field with selector #{i+1}: {selector}")
-                    break
-                except Exception as e:
-                    print(f"❌ Selector #{i+1} failed: {selector}")
-                    continue
-            
-            # Find password field with detailed logging
-            print("🔍 Searching for password field...")
-            for i, selector in enumerate(password_selectors):
-                try:
-                    password_field = WebDriverWait(driver, 1).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"✅ Found password field with selector #{i+1}: {selector}")
-                    break
-                except Exception as e:
-                    print(f"❌ Selector #{i+1} failed: {selector}")
-                    continue
-            
-            # Try XPath fallbacks if CSS selectors failed
-            if not username_field:
-                print("🔍 Trying XPath for username field...")
-                xpath_selectors = [
-                    "//input[contains(@name, 'user') or contains(@name, 'login') or contains(@name, 'email')]",
-                    "//input[@type='text']",
-                    "//input[@type='email']"
-                ]
-                for xpath in xpath_selectors:
-                    try:
-                        username_field = WebDriverWait(driver, 1).until(
-                            EC.presence_of_element_located((By.XPATH, xpath))
-                        )
-                        print(f"✅ Found username field with XPath: {xpath}")
-                        break
-                    except:
-                        continue
-            
-            if not password_field:
-                print("🔍 Trying XPath for password field...")
-                try:
-                    password_field = WebDriverWait(driver, 1).until(
-                        EC.presence_of_element_located((By.XPATH, "//input[@type='password']"))
-                    )
-                    print("✅ Found password field with XPath")
-                except:
-                    print("❌ Could not find password field with XPath")
-            
-            # Find submit button
-            print("🔍 Searching for submit button...")
-            for i, selector in enumerate(submit_selectors):
-                try:
-                    submit_button = WebDriverWait(driver, 1).until(
-                        EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
-                    )
-                    print(f"✅ Found submit button with selector #{i+1}: {selector}")
-                    break
-                except:
-                    print(f"❌ Submit selector #{i+1} failed: {selector}")
-                    continue
-            
-            # XPath fallback for submit button
-            if not submit_button:
-                print("🔍 Trying XPath for submit button...")
-                xpath_submits = [
-                    "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'sign') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'login')]",
-                    "//input[@type='submit']",
-                    "//button[@type='submit']"
-                ]
-                for xpath in xpath_submits:
-                    try:
-                        submit_button = WebDriverWait(driver, 1).until(
-                            EC.element_to_be_clickable((By.XPATH, xpath))
-                        )
-                        print(f"✅ Found submit button with XPath: {xpath}")
-                        break
-                    except:
-                        continue
-            
-            # Show what we found
-            print(f"📊 Fields found - Username: {'✅' if username_field else '❌'}, Password: {'✅' if password_field else '❌'}, Submit: {'✅' if submit_button else '❌'}")
-            
-            # Perform login if we found the necessary fields
-            if username_field and password_field:
-                print("🔑 Filling in login credentials...")
-                
-                try:
-                    # Clear and fill username
-                    username_field.clear()
-                    time.sleep(0.5)
-                    username_field.send_keys(username)
-                    print(f"✅ Entered username: {username}")
-                    
-                    # Clear and fill password
-                    password_field.clear()
-                    time.sleep(0.5)
-                    password_field.send_keys(password)
-                    print("✅ Entered password: ••••••••")
-                    
-                    # Wait a moment before submitting
-                    time.sleep(1)
-                    
-                    # Submit the form
-                    if submit_button:
-                        print("🚀 Clicking submit button...")
-                        driver.execute_script("arguments[0].click();", submit_button)
-                    else:
-                        # Try pressing Enter on password field if no submit button found
-                        print("⏎ Pressing Enter to submit...")
-                        password_field.send_keys(Keys.RETURN)
-                    
-                    # Wait for page to load after login
-                    print("⏳ Waiting for login to complete...")
-                    time.sleep(6)
-                    
-                    # Check if login was successful by looking at URL change or page content
-                    new_url = driver.current_url
-                    new_page_source = driver.page_source.lower()
-                    
-                    print(f"📍 New URL after login: {new_url}")
-                    
-                    # Check for error indicators
-                    error_indicators = ["error", "invalid", "incorrect", "failed", "denied"]
-                    has_errors = any(error in new_page_source for error in error_indicators)
-                    
-                    # Check if we're still on a login page
-                    still_login_page = any(indicator in new_page_source for indicator in login_indicators)
-                    
-                    if has_errors:
-                        return "⚠️ Login attempted but failed - error detected on page"
-                    elif still_login_page and new_url == current_url:
-                        return "⚠️ Login attempted but still on login page - may have failed"
-                    else:
-                        return "✅ Login completed successfully! Page changed after login."
-                        
-                except Exception as e:
-                    return f"❌ Error during login form submission: {str(e)}"
-                    
-            else:
-                missing = []
-                if not username_field:
-                    missing.append("username")
-                if not password_field:
-                    missing.append("password")
-                return f"⚠️ Login page detected but couldn't find {', '.join(missing)} field(s) - please login manually"
-        
-        else:
-            return "ℹ️ No login required - page loaded directly"
-            
-    except Exception as e:
-        return f"⚠️ Error during login process: {str(e)}"
+from automation import DRIVER_POOL, open_url_in_chrome, open_url_with_autologin
+from batch_runner import DEFAULT_RETRIES, format_summary, parse_urls, run_batch
+from devtools_tabs import DEVTOOLS
+from history_store import HISTORY, PAGE_SIZE, SKIP_DUPLICATES
+from job_crawler import crawl, load_sources
+from job_index import JOB_INDEX
+from lean_profile import PROFILE_STATS
+from platforms import REGISTRY
+from profile_manager import PROFILES
+from selector_cache import SELECTOR_CACHE
+from session_store import SESSION_STORE
+from tab_manager import TABS
+from task_queue import BrowserTaskQueue
+from tracing import RECORDER
 
-def open_url_in_chrome(url):
-    """Open the provided URL and handle auto-login if needed"""
+# Runs blocking Selenium work off the Gradio event loop, one task per pooled browser
+BROWSER_QUEUE = BrowserTaskQueue(max_workers=DRIVER_POOL.max_size)
+
+# Requests Gradio itself will hold waiting before it starts rejecting new ones
+GRADIO_QUEUE_MAX_SIZE = 32
+
+# Handlers that drive pooled browsers share one Gradio limit; batches use several
+# BROWSER_QUEUE workers per handler, so queue positions there still show
+BROWSER_CONCURRENCY = {"concurrency_limit": BROWSER_QUEUE.max_workers, "concurrency_id": "browser"}
+
+async def _stream_from_queue(work, *args):
+    """Run work(*args, progress=...) on the browser queue, yielding the status log as it grows"""
     
-    if not url:
-        return "❌ Please enter a URL"
+    loop = asyncio.get_running_loop()
+    updates = asyncio.Queue()
     
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    def progress(message):
+        loop.call_soon_threadsafe(updates.put_nowait, message)
     
-    # Check if URL likely needs login (job application sites)
-    job_site_indicators = [
-        "workday.com",
-        "myworkday.com", 
-        "asu.edu",
-        "careers",
-        "jobs",
-        "apply",
-        "application",
-        "taleo",
-        "greenhouse",
-        "lever"
-    ]
+    def run(waited):
+        if waited >= 0.5:
+            progress(f"▶️ Started after waiting {waited:.1f}s in the queue")
+        return work(*args, progress=progress)
+    
+    future, position = BROWSER_QUEUE.submit(run)
+    log = [BROWSER_QUEUE.format_stats()]
+    if position:
+        log.append(f"⏳ Queued behind {position} other request(s)...")
+    yield "\n".join(log)
+    
+    wrapped = asyncio.wrap_future(future)
+    while True:
+        getter = asyncio.ensure_future(updates.get())
+        done, _ = await asyncio.wait({getter, wrapped}, return_when=asyncio.FIRST_COMPLETED)
+        if getter in done:
+            log.append(getter.result())
+            yield "\n".join(log)
+            continue
+        getter.cancel()
+        break
     
-    needs_login_likely = any(indicator in url.lower() for indicator in job_site_indicators)
+    # Drain anything reported right before the task finished
+    while not updates.empty():
+        log.append(updates.get_nowait())
     
-    # First, always try Chrome command line for same browser experience
     try:
-        # Use Chrome's command line to open URL in new tab
-        chrome_path = r"C:\Program Files\Google\Chrome\Application\chrome.exe"
-        if not os.path.exists(chrome_path):
-            # Try alternative Chrome location
-            chrome_path = r"C:\Program Files (x86)\Google\Chrome\Application\chrome.exe"
-        
-        if os.path.exists(chrome_path):
-            # Open URL in new tab of existing Chrome
-            subprocess.run([chrome_path, "--new-tab", url], check=False)
-            
-            if needs_login_likely:
-                return f"✅ Successfully opened in new tab: {url}\n🌐 Check your Chrome browser for the new tab!\n⚠️ **IMPORTANT**: This opened in your existing Chrome browser (same tabs).\n🔐 **Manual Login Required**: You'll need to login manually as auto-login requires a separate browser.\n\n💡 **Tip**: If you need auto-login, click 'Force Auto-Login' button below."
-            else:
-                return f"✅ Successfully opened in new tab: {url}\n🌐 Check your Chrome browser for the new tab!\n✅ Gradio interface remains open for more URLs."
-        else:
-            raise FileNotFoundError("Chrome executable not found")
-            
+        result = wrapped.result()
     except Exception as e:
-        return f"❌ Error opening in existing Chrome: {str(e)}\n🔄 Falling back to separate browser with auto-login..."
+        result = f"❌ Error with Selenium automation: {str(e)}"
+    yield "\n".join(log + ["", result])
 
-def open_url_with_autologin(url):
-    """Force open URL with Selenium auto-login (separate browser)"""
+async def stream_open_url_with_autologin(url, skip_duplicates=SKIP_DUPLICATES):
+    """Streaming version of open_url_with_autologin for the UI"""
     
     if not url:
-        return "❌ Please enter a URL"
+        yield "❌ Please enter a URL"
+        return
     
-    if not url.startswith(('http://', 'https://')):
-        url = 'https://' + url
+    async for status in _stream_from_queue(functools.partial(open_url_with_autologin, skip_duplicates=skip_duplicates), url):
+        yield status
+
+async def stream_open_url_in_chrome(url, skip_duplicates=SKIP_DUPLICATES):
+    """Streaming version of open_url_in_chrome: the Chrome spawn runs off the event loop"""
+    
+    if not url:
+        yield "❌ Please enter a URL"
+        return
     
+    yield f"🚀 Opening {url} in your Chrome browser..."
+    yield await asyncio.get_running_loop().run_in_executor(None, open_url_in_chrome, url, skip_duplicates)
+
+def _short_status(status):
+    """First line of a handler status plus its login status line, for batch logs"""
+    lines = [line for line in status.splitlines() if line.strip()]
+    login = next((line for line in lines if line.startswith("🔐 Login Status:")), None)
+    return " | ".join(line for line in (lines[0] if lines else "", login) if line)
+
+def _submit_to_browser_queue(fn, *args):
+    """run_batch submit hook: batch attempts share the browser queue with single-URL requests"""
+    future, _ = BROWSER_QUEUE.submit(lambda waited: fn(*args))
+    return future
+
+def run_batch_with_autologin(text, file_path, concurrency, retries, skip_duplicates=SKIP_DUPLICATES):
+    """Open many URLs with auto-login, streaming per-URL status as each one finishes"""
+    
+    urls = parse_urls(text, file_path)
+    if not urls:
+        yield "❌ Please paste URLs or upload a .txt/.csv file", ""
+        return
+    
+    total = len(urls)
+    log = [f"📦 Starting batch of {total} URL(s) with up to {int(concurrency)} concurrent browser(s)..."]
+    yield "\n".join(log), ""
+    
+    worker = functools.partial(open_url_with_autologin, skip_duplicates=skip_duplicates, interactive=False)
+    events = run_batch(urls, worker, concurrency=concurrency, max_retries=int(retries), submit=_submit_to_browser_queue)
     try:
-        print("🎯 Using Selenium with auto-login (separate browser)...")
-        
-        # Setup Chrome with enhanced options for login automation
-        service = Service(executable_path=r"chromedriver-win64\chromedriver-win64\chromedriver.exe")
-        chrome_options = webdriver.ChromeOptions()
-        
-        # Use your existing Chrome profile with a different debugging port
-        user_data_dir = os.path.expanduser("~") + r"\AppData\Local\Google\Chrome\User Data"
-        
-        # Create a temporary user data directory to avoid conflicts
-        temp_profile_dir = os.path.expanduser("~") + r"\AppData\Local\Temp\ChromeAutomation"
-        chrome_options.add_argument(f"--user-data-dir={temp_profile_dir}")
-        chrome_options.add_argument("--remote-debugging-port=9223")  # Different port to avoid conflicts
-        
-        # Chrome options for better experience and login automation
-        chrome_options.add_argument("--start-maximized")
-        chrome_options.add_argument("--disable-blink-features=AutomationControlled")
-        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-        chrome_options.add_experimental_option('useAutomationExtension', False)
-        chrome_options.add_argument("--disable-web-security")
-        chrome_options.add_argument("--allow-running-insecure-content")
-        
-        print(f"🌐 Opening {url} with auto-login capability...")
-        
-        # Open Chrome
-        driver = webdriver.Chrome(service=service, options=chrome_options)
-        
-        # Navigate to the URL
-        driver.get(url)
-        
-        # ALWAYS check for login and handle it automatically
-        print("🔍 Checking for login requirements...")
-        login_status = auto_login_if_needed(driver)
-        
-        # Keep the browser open for user interaction
-        print("✅ Browser is ready for your use! Auto-login process completed.")
-        
-        return f"✅ Successfully opened: {url}\n🔐 Login Status: {login_status}\n🌐 **Separate Chrome window** opened with auto-login capability!\n✅ Gradio interface remains open for more URLs.\n⚠️ Note: This browser window will remain open for your use."
-        
-    except Exception as e:
-        return f"❌ Error with Selenium automation: {str(e)}"
+        for event in events:
+            if event["type"] == "retry":
+                log.append(f"🔁 [{event['index'] + 1}/{total}] {event['url']} failed (attempt {event['attempt']}), retrying in {event['delay']:.0f}s")
+                yield "\n".join(log), ""
+            elif event["type"] == "result":
+                icon = "✅" if event["ok"] else "❌"
+                log.append(f"{icon} [{event['index'] + 1}/{total}] {event['url']} ({event['elapsed']:.1f}s, {event['attempts']} attempt(s)) — {_short_status(event['status'])}")
+                yield "\n".join(log), ""
+            else:
+                yield "\n".join(log), format_summary(event)
+    finally:
+        # Client gone: cancel the batch's attempts still waiting in the browser queue
+        events.close()
+
+def refresh_stats():
+    """Current driver pool/tabs, selector cache/platform, session snapshot and history stats for the UI"""
+    pool = "\n\n".join(stats.format_stats() for stats in (DRIVER_POOL, TABS, PROFILES, PROFILE_STATS, DEVTOOLS))
+    detection = f"{SELECTOR_CACHE.format_stats()}\n\n{REGISTRY.format_stats()}"
+    return pool, detection, f"{SESSION_STORE.format_stats()}\n\n{HISTORY.format_stats()}"
+
+METRICS_HEADERS = ["Phase", "Domain", "Count", "p50 (ms)", "p95 (ms)", "Outcomes"]
+
+def phase_metrics(grouping):
+    """Aggregated span percentiles for the Metrics tab"""
+    return RECORDER.summary(by_domain=grouping == "Phase + domain")
+
+JOB_HEADERS = ["Posted", "Title", "Company", "Location", "URL"]
+
+def crawl_boards(text):
+    """Crawl the listed board URLs into the job index; returns the crawl report"""
+    urls = [line.strip() for line in (text or "").splitlines() if line.strip() and not line.startswith("#")]
+    if not urls:
+        return "❌ Please list at least one Workday, Greenhouse or Lever board URL"
+    return crawl(urls).format()
+
+def search_jobs(keywords, location, days):
+    """Matching postings for the table, plus their URLs ready for the auto-login batch"""
+    since = None
+    if days and int(days) > 0:
+        since = (datetime.date.today() - datetime.timedelta(days=int(days))).isoformat()
+    postings = JOB_INDEX.search(keywords, location, since)
+    table = [[p["posted_at"] or "", p["title"], p["company"], p["location"], p["url"]] for p in postings]
+    return table, "\n".join(p["url"] for p in postings), f"{len(postings)} posting(s) found"
+
+def open_job_results(urls):
+    """Run the search results through the auto-login batch (all pooled browsers, default retries)"""
+    yield from run_batch_with_autologin(urls, None, DRIVER_POOL.max_size, DEFAULT_RETRIES)
+
+HISTORY_HEADERS = ["When", "Action", "Outcome", "Host", "URL", "Status", "ms"]
+
+def history_page(query, page):
+    """One page of the history table (newest first) plus a 'page x of y' line"""
+    page = max(int(page or 1), 1)
+    rows, total = HISTORY.search(query, page, PAGE_SIZE)
+    pages = max((total + PAGE_SIZE - 1) // PAGE_SIZE, 1)
+    if page > pages:
+        page = pages
+        rows, total = HISTORY.search(query, page, PAGE_SIZE)
+    table = [
+        [time.strftime("%Y-%m-%d %H:%M", time.localtime(row["created_at"])), row["action"], row["outcome"],
+         row["host"], row["canonical_url"], row["status"],
+         round(row["elapsed_ms"]) if row["elapsed_ms"] is not None else None]
+        for row in rows
+    ]
+    return table, page, f"Page {page} of {pages} · {total} attempt(s)"
 
 def create_interface():
     """Create the Gradio interface"""
@@ -388,43 +196,278 @@ def create_interface():
         gr.Markdown("# 🤖 Job Application Automation")
         gr.Markdown("Enter a job application URL and it will open in your Chrome browser")
         
-        with gr.Row():
-            with gr.Column(scale=3):
-                url_input = gr.Textbox(
-                    label="Job Application URL",
-                    placeholder="https://www.myworkday.com/asu/d/wday/vps/...",
-                    lines=1
+        with gr.Tabs():
+            with gr.Tab("🔗 Single URL"):
+                with gr.Row():
+                    with gr.Column(scale=3):
+                        url_input = gr.Textbox(
+                            label="Job Application URL",
+                            placeholder="https://www.myworkday.com/asu/d/wday/vps/...",
+                            lines=1
+                        )
+                    with gr.Column(scale=1):
+                        submit_btn = gr.Button("🚀 Open in Same Browser", variant="primary", size="lg")
+                
+                with gr.Row():
+                    with gr.Column(scale=1):
+                        skip_duplicates = gr.Checkbox(
+                            label="Skip already-opened URLs",
+                            value=SKIP_DUPLICATES
+                        )
+                    with gr.Column(scale=1):
+                        autologin_btn = gr.Button("🔐 Force Auto-Login (Separate Browser)", variant="secondary", size="lg")
+                
+                output = gr.Textbox(
+                    label="Status",
+                    lines=6,
+                    interactive=False
                 )
-            with gr.Column(scale=1):
-                submit_btn = gr.Button("🚀 Open in Same Browser", variant="primary", size="lg")
+                
+                # Example URLs section
+                gr.Markdown("### 📋 Quick Examples:")
+                with gr.Row():
+                    example1 = gr.Button("ASU Workday Example", size="sm")
+                    example2 = gr.Button("Google.com Test", size="sm")
+            
+            with gr.Tab("📦 Batch"):
+                gr.Markdown("Paste job URLs (one per line) or upload a .txt/.csv file. Each URL runs through the auto-login flow.")
+                
+                with gr.Row():
+                    with gr.Column(scale=3):
+                        batch_urls = gr.Textbox(
+                            label="Job Application URLs",
+                            placeholder="https://www.myworkday.com/asu/d/wday/vps/...\nhttps://boards.greenhouse.io/...",
+                            lines=8
+                        )
+                    with gr.Column(scale=1):
+                        batch_file = gr.File(
+                            label="URL file (.txt / .csv)",
+                            file_types=[".txt", ".csv"],
+                            type="filepath"
+                        )
+                
+                with gr.Row():
+                    batch_concurrency = gr.Slider(
+                        label="Concurrent browsers",
+                        minimum=1,
+                        maximum=DRIVER_POOL.max_size,
+                        value=DRIVER_POOL.max_size,
+                        step=1
+                    )
+                    batch_retries = gr.Slider(
+                        label="Retries per URL",
+                        minimum=0,
+                        maximum=5,
+                        value=DEFAULT_RETRIES,
+                        step=1
+                    )
+                    batch_skip = gr.Checkbox(
+                        label="Skip already-opened URLs",
+                        value=SKIP_DUPLICATES
+                    )
+                    batch_btn = gr.Button("📦 Run Batch with Auto-Login", variant="primary", size="lg")
+                
+                batch_log = gr.Textbox(
+                    label="Per-URL Status",
+                    lines=12,
+                    interactive=False
+                )
+                batch_summary = gr.Markdown()
+            
+            with gr.Tab("📊 Metrics"):
+                gr.Markdown("Phase timings of the auto-login flow (p50/p95 over the most recent spans). Raw spans are written to `traces/spans.jsonl`.")
+                
+                with gr.Row():
+                    metrics_grouping = gr.Radio(
+                        label="Group by",
+                        choices=["Phase", "Phase + domain"],
+                        value="Phase"
+                    )
+                    metrics_refresh_btn = gr.Button("🔄 Refresh Metrics", size="sm")
+                
+                metrics_table = gr.Dataframe(
+                    headers=METRICS_HEADERS,
+                    value=phase_metrics("Phase"),
+                    interactive=False
+                )
+            
+            with gr.Tab("🔎 Find Jobs"):
+                gr.Markdown("Crawl Workday career sites and Greenhouse/Lever boards into a local index, search it, and send the results to the auto-login batch. Only new or changed postings are downloaded.")
+                
+                with gr.Row():
+                    with gr.Column(scale=3):
+                        crawl_sources = gr.Textbox(
+                            label="Boards (one URL per line, saved list: crawl_sources.json)",
+                            value="\n".join(load_sources()),
+                            placeholder="https://asu.wd1.myworkdayjobs.com/en-US/ASUCareers\nhttps://boards.greenhouse.io/...\nhttps://jobs.lever.co/...",
+                            lines=4
+                        )
+                    with gr.Column(scale=1):
+                        crawl_btn = gr.Button("🕸️ Crawl Boards", variant="secondary", size="lg")
+                crawl_report = gr.Markdown()
+                
+                with gr.Row():
+                    job_keywords = gr.Textbox(label="Keywords", placeholder="python selenium", scale=2)
+                    job_location = gr.Textbox(label="Location", placeholder="Tempe", scale=1)
+                    job_days = gr.Number(label="Posted within (days, 0 = any)", value=0, precision=0, minimum=0, scale=1)
+                    job_search_btn = gr.Button("🔎 Search", variant="primary", scale=1)
+                
+                job_table = gr.Dataframe(
+                    headers=JOB_HEADERS,
+                    interactive=False
+                )
+                job_count = gr.Markdown()
+                job_urls = gr.Textbox(
+                    label="URLs to open (edit to drop any)",
+                    lines=5
+                )
+                job_open_btn = gr.Button("🔐 Open Results with Auto-Login", variant="primary")
+                job_log = gr.Textbox(
+                    label="Per-URL Status",
+                    lines=8,
+                    interactive=False
+                )
+                job_summary = gr.Markdown()
+            
+            with gr.Tab("🕘 History"):
+                gr.Markdown("Every open and auto-login attempt, newest first. Search by host prefix or any part of the URL (`asu`), or by host prefix only with `host:` (`host:boards.greenhouse.io`, indexed).")
+                
+                with gr.Row():
+                    history_query = gr.Textbox(
+                        label="Search",
+                        placeholder="asu  ·  host:boards.greenhouse.io",
+                        lines=1,
+                        scale=3
+                    )
+                    history_page_number = gr.Number(
+                        label="Page",
+                        value=1,
+                        precision=0,
+                        minimum=1,
+                        scale=1
+                    )
+                
+                with gr.Row():
+                    history_prev_btn = gr.Button("◀ Previous", size="sm")
+                    history_next_btn = gr.Button("Next ▶", size="sm")
+                    history_refresh_btn = gr.Button("🔄 Refresh", size="sm")
+                
+                history_table = gr.Dataframe(
+                    headers=HISTORY_HEADERS,
+                    interactive=False
+                )
+                history_info = gr.Markdown()
         
+        # Warm Chrome session pool stats
         with gr.Row():
+            with gr.Column(scale=4):
+                pool_stats = gr.Markdown(f"{DRIVER_POOL.format_stats()}\n\n{TABS.format_stats()}")
+                cache_stats = gr.Markdown(SELECTOR_CACHE.format_stats())
+                session_stats = gr.Markdown(f"{SESSION_STORE.format_stats()}\n\n{HISTORY.format_stats()}")
             with gr.Column(scale=1):
-                autologin_btn = gr.Button("🔐 Force Auto-Login (Separate Browser)", variant="secondary", size="lg")
-        
-        output = gr.Textbox(
-            label="Status",
-            lines=6,
-            interactive=False
-        )
-        
-        # Example URLs section
-        gr.Markdown("### 📋 Quick Examples:")
-        with gr.Row():
-            example1 = gr.Button("ASU Workday Example", size="sm")
-            example2 = gr.Button("Google.com Test", size="sm")
+                pool_refresh_btn = gr.Button("🔄 Refresh Stats", size="sm")
         
         # Event handlers
         submit_btn.click(
-            fn=open_url_in_chrome,
-            inputs=[url_input],
+            fn=stream_open_url_in_chrome,
+            inputs=[url_input, skip_duplicates],
             outputs=[output]
         )
         
         autologin_btn.click(
-            fn=open_url_with_autologin,
-            inputs=[url_input],
-            outputs=[output]
+            fn=stream_open_url_with_autologin,
+            inputs=[url_input, skip_duplicates],
+            outputs=[output],
+            **BROWSER_CONCURRENCY
+        ).then(
+            fn=refresh_stats,
+            outputs=[pool_stats, cache_stats, session_stats]
+        )
+        
+        pool_refresh_btn.click(
+            fn=refresh_stats,
+            outputs=[pool_stats, cache_stats, session_stats]
+        )
+        
+        metrics_refresh_btn.click(
+            fn=phase_metrics,
+            inputs=[metrics_grouping],
+            outputs=[metrics_table]
+        )
+        
+        metrics_grouping.change(
+            fn=phase_metrics,
+            inputs=[metrics_grouping],
+            outputs=[metrics_table]
+        )
+        
+        batch_btn.click(
+            fn=run_batch_with_autologin,
+            inputs=[batch_urls, batch_file, batch_concurrency, batch_retries, batch_skip],
+            outputs=[batch_log, batch_summary],
+            **BROWSER_CONCURRENCY
+        ).then(
+            fn=refresh_stats,
+            outputs=[pool_stats, cache_stats, session_stats]
+        )
+        
+        crawl_btn.click(
+            fn=crawl_boards,
+            inputs=[crawl_sources],
+            outputs=[crawl_report]
+        ).then(
+            fn=search_jobs,
+            inputs=[job_keywords, job_location, job_days],
+            outputs=[job_table, job_urls, job_count]
+        )
+        
+        for trigger in (job_search_btn.click, job_keywords.submit, job_location.submit):
+            trigger(
+                fn=search_jobs,
+                inputs=[job_keywords, job_location, job_days],
+                outputs=[job_table, job_urls, job_count]
+            )
+        
+        job_open_btn.click(
+            fn=open_job_results,
+            inputs=[job_urls],
+            outputs=[job_log, job_summary],
+            **BROWSER_CONCURRENCY
+        ).then(
+            fn=refresh_stats,
+            outputs=[pool_stats, cache_stats, session_stats]
+        )
+        
+        history_outputs = [history_table, history_page_number, history_info]
+        
+        history_refresh_btn.click(
+            fn=history_page,
+            inputs=[history_query, history_page_number],
+            outputs=history_outputs
+        )
+        
+        history_query.submit(
+            fn=lambda query: history_page(query, 1),
+            inputs=[history_query],
+            outputs=history_outputs
+        )
+        
+        history_prev_btn.click(
+            fn=lambda query, page: history_page(query, (page or 1) - 1),
+            inputs=[history_query, history_page_number],
+            outputs=history_outputs
+        )
+        
+        history_next_btn.click(
+            fn=lambda query, page: history_page(query, (page or 1) + 1),
+            inputs=[history_query, history_page_number],
+            outputs=history_outputs
+        )
+        
+        app.load(
+            fn=history_page,
+            inputs=[history_query, history_page_number],
+            outputs=history_outputs
         )
         
         # Example button handlers
@@ -444,37 +487,63 @@ def create_interface():
         
         **🚀 "Open in Same Browser"** (Recommended for normal use):
         - Opens URL as **new tab** in your existing Chrome browser
+        - Start Chrome with `--remote-debugging-port=9222` (or enable chrome://inspect/#remote-debugging) to get load feedback per tab
         - **Same browser experience** - all tabs together
         - ⚠️ **Manual login required** for job sites
         
         **🔐 "Force Auto-Login"** (For sites requiring login):
-        - Opens in **separate Chrome window** with automation
-        - **Automatic login** using your saved credentials
+        - Opens in **separate Chrome window** with automation, one tab per URL
+        - **Automatic login** using your saved credentials, once per site per browser
         - ⚠️ **Separate browser** - different from Gradio browser
         
+        **📦 "Batch"** (For many postings at once):
+        - Paste a list of URLs or upload a .txt/.csv file
+        - Runs several auto-login browsers in parallel, retrying failures with backoff
+        
+        **🔎 "Find Jobs"**:
+        - Crawls your boards incrementally (conditional requests) and searches the local index by keyword, location and date
+        - Sends the matching postings straight into the auto-login batch
+        
+        **🕘 "History"**:
+        - Every attempt is saved to history.db; postings you already opened or logged into are skipped
+        - Untick "Skip already-opened URLs" to open them again
+        
         ### ⚡ Features:
         - ✅ Choose between same browser or auto-login
         - ✅ Smart URL detection for job applications
+        - ✅ Fills application forms from your personal_data.json profile
         - ✅ Preserves your bookmarks and saved passwords
         - ✅ Clean interface for multiple URL submissions
         """)
     
+    # Only the browser handlers share a limit (BROWSER_CONCURRENCY); stats, search and paging never wait on them
+    app.queue(max_size=GRADIO_QUEUE_MAX_SIZE)
+    
     return app
 
-if __name__ == "__main__":
-    # Create and launch the interface
+def main():
+    """Build the interface, pre-warm the driver pool and serve until interrupted"""
     app = create_interface()
     
     print("🚀 Starting Job Application Automation Interface...")
     print("🌐 Gradio interface will open in your browser")
     print("📋 Access it at: http://127.0.0.1:7860")
     
-    # Launch with public sharing disabled for security
-    app.launch(
-        server_name="127.0.0.1",
-        server_port=7860,
-        share=False,
-        show_api=False,
-        quiet=False,
-        inbrowser=True
-    )
+    # Pre-warm Chrome sessions so the first auto-login does not pay for a cold start
+    DRIVER_POOL.start()
+    
+    try:
+        # Launch with public sharing disabled for security
+        app.launch(
+            server_name="127.0.0.1",
+            server_port=7860,
+            share=False,
+            show_api=False,
+            quiet=False,
+            inbrowser=True
+        )
+    finally:
+        DRIVER_POOL.shutdown()
+
+if __name__ == "__main__":
+    main()
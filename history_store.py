@@ -0,0 +1,222 @@
+"""
+Application History
+===================
+Records every open / auto-login attempt in a local SQLite database so the
+same posting is not opened and logged into again.
+
+URLs are canonicalized before they are stored or looked up: tracking
+parameters and fragments are dropped, query parameters sorted, and Workday
+job URLs reduced to tenant + job ID (so the same requisition reached through
+LinkedIn, Indeed or a search page maps to one row). Lookups by canonical
+URL, host and date are indexed; the History tab pages through results with
+LIMIT/OFFSET instead of loading the table.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+HISTORY_PATH = "history.db"
+
+# Skip URLs whose canonical form already has a successful entry
+SKIP_DUPLICATES = True
+
+# Query parameters that only track where a click came from
+TRACKING_PARAMS = {
+    "gclid", "gbraid", "wbraid", "fbclid", "msclkid", "dclid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref", "referer", "referrer", "src", "source", "trk", "trkinfo", "trackingid",
+    "refid", "lipi", "gh_src", "gh_jid_src", "lever-source", "lever-origin", "lever-via",
+    "iis", "iisn", "ccuid", "jobpipeline", "codes", "share", "shared_from",
+}
+TRACKING_PREFIXES = ("utm_", "hsa_", "pk_", "mtm_")
+
+_WORKDAY_HOST = re.compile(r"(^|\.)(myworkdayjobs|myworkdaysite|myworkday)\.com$")
+# External career sites: /<locale>/<site>/job/<location>/<title>_<JR-12345>[/apply...]
+_WORKDAY_EXTERNAL_JOB = re.compile(
+    r"^(?:/[a-z]{2}-[A-Z]{2})?(?P<site>/(?:recruiting/[^/]+/)?[^/]+)/(?:job|details)/(?:.*/)?[^/]*?"
+    r"_(?P<job>[A-Za-z]*[-_]?\d[\w-]*?)(?:/.*)?$"
+)
+# Internal (signed-in) URLs carry a 32-hex job posting ID: /<tenant>/d/.../<id>.htmld
+_WORKDAY_INTERNAL_JOB = re.compile(r"^/(?P<tenant>[^/]+)/.*?(?P<job>[0-9a-f]{32})(?:\.htmld)?(?:/.*)?$")
+
+# Outcomes that count as done (failed attempts are retried, not skipped)
+DONE_OUTCOMES = ("opened", "logged_in", "restored", "reused", "no_login")
+
+PAGE_SIZE = 25
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS history (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    canonical_url TEXT NOT NULL,
+    url TEXT NOT NULL,
+    host TEXT NOT NULL,
+    action TEXT NOT NULL,
+    outcome TEXT NOT NULL,
+    status TEXT NOT NULL,
+    elapsed_ms REAL,
+    created_at REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS history_canonical ON history (canonical_url, created_at);
+CREATE INDEX IF NOT EXISTS history_host ON history (host, created_at);
+CREATE INDEX IF NOT EXISTS history_created ON history (created_at);
+"""
+
+
+def canonical_url(url):
+    """Stable form of a job URL for de-duplication"""
+    url = url.strip()
+    if "://" not in url:
+        url = "https://" + url
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    if host.startswith("www.") and not _WORKDAY_HOST.search(host):
+        host = host[4:]
+    path = re.sub(r"/{2,}", "/", parsed.path or "/")
+
+    if _WORKDAY_HOST.search(host):
+        external = _WORKDAY_EXTERNAL_JOB.match(path)
+        internal = _WORKDAY_INTERNAL_JOB.match(path)
+        if external:
+            return f"https://{host}{external.group('site')}/job/{external.group('job').upper()}"
+        if internal:
+            return f"https://{host}/{internal.group('tenant')}/job/{internal.group('job')}"
+
+    params = sorted(
+        (key, value) for key, value in parse_qsl(parsed.query, keep_blank_values=True)
+        if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES)
+    )
+    if len(path) > 1:
+        path = path.rstrip("/")
+    netloc = host if not parsed.port or parsed.port in (80, 443) else f"{host}:{parsed.port}"
+    return urlunparse(("https", netloc, path, "", urlencode(params), ""))
+
+
+class HistoryStore:
+    """SQLite-backed log of open/login attempts, keyed by canonical URL"""
+
+    def __init__(self, path=HISTORY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = None
+        self._stats = {"recorded": 0, "duplicates_skipped": 0}
+
+    def _connection(self):
+        """Open the database on first use (caller holds the lock)"""
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+    # ---------------------------------------------------------------- entries
+
+    def record(self, url, action, outcome, status, elapsed_ms=None):
+        """Log one attempt (action: 'open' or 'login')"""
+        parsed_host = urlparse(url if "://" in url else "https://" + url).hostname or ""
+        try:
+            with self._lock:
+                db = self._connection()
+                with db:
+                    db.execute(
+                        "INSERT INTO history (canonical_url, url, host, action, outcome, status, elapsed_ms, created_at)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (canonical_url(url), url, parsed_host.lower(), action, outcome,
+                         status.splitlines()[0] if status else "", elapsed_ms, time.time()),
+                    )
+                self._stats["recorded"] += 1
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not record history: {e}")
+
+    def find_duplicate(self, url, actions=("open", "login")):
+        """Latest completed attempt for the same canonical URL, or None"""
+        placeholders = ", ".join("?" for _ in actions)
+        outcomes = ", ".join("?" for _ in DONE_OUTCOMES)
+        try:
+            with self._lock:
+                row = self._connection().execute(
+                    f"SELECT * FROM history WHERE canonical_url = ? AND action IN ({placeholders})"
+                    f" AND outcome IN ({outcomes}) ORDER BY created_at DESC LIMIT 1",
+                    (canonical_url(url), *actions, *DONE_OUTCOMES),
+                ).fetchone()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not read history: {e}")
+            return None
+        return dict(row) if row else None
+
+    def skip_message(self, url, actions=("open", "login")):
+        """'⏭️ Already ...' status if the URL was handled before (and counts the skip), else None"""
+        duplicate = self.find_duplicate(url, actions)
+        if duplicate is None:
+            return None
+        with self._lock:
+            self._stats["duplicates_skipped"] += 1
+        when = time.strftime("%Y-%m-%d %H:%M", time.localtime(duplicate["created_at"]))
+        verb = "logged into" if duplicate["action"] == "login" else "opened"
+        return f"⏭️ Already {verb} on {when} ({duplicate['outcome']}) - skipped duplicate: {url}"
+
+    def _page(self, db, where, params, page_size, offset):
+        total = db.execute(f"SELECT COUNT(*) FROM history {where}", params).fetchone()[0]
+        rows = db.execute(
+            f"SELECT created_at, action, outcome, host, canonical_url, status, elapsed_ms FROM history {where}"
+            " ORDER BY created_at DESC LIMIT ? OFFSET ?",
+            (*params, page_size, offset),
+        ).fetchall()
+        return rows, total
+
+    def search(self, query="", page=1, page_size=PAGE_SIZE):
+        """(rows, total) for one page, newest first.
+
+        A plain query matches a host prefix or any part of the canonical URL
+        (the substring match scans the table). 'host:<prefix>' matches the
+        host prefix only, as a range scan of history_host.
+        """
+        query = (query or "").strip().lower()
+        host_only = query.startswith("host:")
+        if host_only:
+            query = query[len("host:"):].strip()
+        offset = (max(int(page), 1) - 1) * page_size
+        try:
+            with self._lock:
+                db = self._connection()
+                if not query:
+                    rows, total = self._page(db, "", [], page_size, offset)
+                else:
+                    # 'asu' -> host >= 'asu' AND host < 'asv': the prefix as an index range
+                    upper = query[:-1] + chr(ord(query[-1]) + 1)
+                    if host_only:
+                        rows, total = self._page(db, "INDEXED BY history_host WHERE host >= ? AND host < ?",
+                                                 [query, upper], page_size, offset)
+                    else:
+                        pattern = "%" + re.sub(r"([%_\\])", r"\\\1", query) + "%"
+                        rows, total = self._page(
+                            db, "WHERE (host >= ? AND host < ?) OR canonical_url LIKE ? ESCAPE '\\'",
+                            [query, upper, pattern], page_size, offset,
+                        )
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not search history: {e}")
+            return [], 0
+        return [dict(row) for row in rows], total
+
+    # ------------------------------------------------------------------ stats
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            try:
+                stats["entries"] = self._connection().execute("SELECT COUNT(*) FROM history").fetchone()[0]
+            except sqlite3.Error:
+                stats["entries"] = 0
+        return stats
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        s = self.stats()
+        return (f"**History** — {s['entries']} attempt(s) recorded · "
+                f"Duplicates skipped this session: {s['duplicates_skipped']}")
+
+
+# Shared history used by every open/login path
+HISTORY = HistoryStore()
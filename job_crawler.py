@@ -0,0 +1,381 @@
+"""
+Incremental Job Crawler
+=======================
+Walks configured job boards (Workday career sites, Greenhouse and Lever
+boards) through their public JSON endpoints and keeps job_index up to date.
+
+Crawls are incremental: listing and posting requests carry the ETag /
+Last-Modified validators from the previous crawl (a 304 costs no download),
+and a posting's detail page is only fetched when the posting is new or its
+listing entry changed. Postings that left their board are marked closed,
+unless the board's listing was cut off at the page cap.
+Every crawl reports pages fetched, pages skipped as unchanged (304), postings
+left untouched because their listing entry did not change, and wall time.
+
+Boards are listed in crawl_sources.json as their public URLs:
+
+    [
+      "https://asu.wd1.myworkdayjobs.com/en-US/ASUCareers",
+      "https://boards.greenhouse.io/airbnb",
+      "https://jobs.lever.co/palantir"
+    ]
+"""
+
+import datetime
+import hashlib
+import html
+import json
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs, urlparse
+
+from job_index import JOB_INDEX
+from tracing import span
+
+CRAWL_SOURCES_PATH = "crawl_sources.json"
+
+REQUEST_TIMEOUT = 20
+DETAIL_CONCURRENCY = 4
+USER_AGENT = "Mozilla/5.0 (compatible; jobauto-crawler/1.0)"
+
+WORKDAY_PAGE_SIZE = 20
+WORKDAY_MAX_PAGES = 25
+
+_WORKDAY_POSTED = re.compile(r"posted\s+(today|yesterday|(\d+)\+?\s+days?\s+ago)", re.IGNORECASE)
+
+
+class Source:
+    """One job board: platform, API base and the key its posting ids are prefixed with"""
+
+    def __init__(self, platform, key, company, api, site_url):
+        self.platform = platform
+        self.key = key            # 'greenhouse:airbnb', 'workday:asu/ASUCareers'
+        self.company = company
+        self.api = api
+        self.site_url = site_url  # where human-facing posting URLs are rooted (Workday)
+
+    def __repr__(self):
+        return f"Source({self.key!r})"
+
+
+def parse_source(url):
+    """The Source for a board URL, or None if it is not a supported board"""
+    parsed = urlparse(url.strip() if "://" in url else "https://" + url.strip())
+    host = (parsed.hostname or "").lower()
+    parts = [part for part in parsed.path.split("/") if part]
+
+    if host.endswith("greenhouse.io"):
+        board = parse_qs(parsed.query).get("for", [None])[0] or (parts[0] if parts and parts[0] != "embed" else None)
+        if board:
+            return Source("greenhouse", f"greenhouse:{board}", board,
+                          f"https://boards-api.greenhouse.io/v1/boards/{board}/jobs", None)
+
+    if host.endswith("lever.co") and parts:
+        region = ".eu" if ".eu." in host else ""
+        company = parts[0]
+        return Source("lever", f"lever:{company}", company,
+                      f"https://api{region}.lever.co/v0/postings/{company}?mode=json", None)
+
+    if host.endswith(("myworkdayjobs.com", "myworkdaysite.com")):
+        if parts and re.fullmatch(r"[a-z]{2}-[A-Z]{2}", parts[0]):
+            parts = parts[1:]
+        if len(parts) >= 3 and parts[0] == "recruiting":
+            tenant, site = parts[1], parts[2]
+            root = f"https://{host}/recruiting/{tenant}/{site}"
+        elif parts:
+            tenant, site = host.split(".")[0], parts[0]
+            root = f"https://{host}/{site}"
+        else:
+            return None
+        return Source("workday", f"workday:{tenant}/{site}", tenant,
+                      f"https://{host}/wday/cxs/{tenant}/{site}", root)
+    return None
+
+
+def load_sources(path=CRAWL_SOURCES_PATH):
+    """Board URLs from crawl_sources.json ([] if it is missing)"""
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            entries = json.load(file)
+    except FileNotFoundError:
+        return []
+    return [entry["url"] if isinstance(entry, dict) else entry for entry in entries]
+
+
+def html_text(markup):
+    """Plain text of an HTML fragment (Greenhouse content arrives entity-escaped)"""
+    text = html.unescape(markup or "")
+    text = re.sub(r"<\s*(br|/p|/li|/h\d|/div|/tr)\b[^>]*>", "\n", text, flags=re.IGNORECASE)
+    text = html.unescape(re.sub(r"<[^>]+>", " ", text))
+    lines = (re.sub(r"[ \t\xa0]+", " ", line).strip() for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
+
+
+def _posted_date(text, today=None):
+    """ISO date from Workday's 'Posted 3 Days Ago' / 'Posted Today' text"""
+    match = _WORKDAY_POSTED.search(text or "")
+    if not match:
+        return None
+    today = today or datetime.date.today()
+    word = match.group(1).lower()
+    days = 0 if word == "today" else 1 if word == "yesterday" else int(match.group(2))
+    return (today - datetime.timedelta(days=days)).isoformat()
+
+
+class CrawlReport:
+    """Counters for one crawl"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.sources = 0
+        self.fetched = 0      # pages downloaded (HTTP 200)
+        self.unchanged = 0    # pages not downloaded: 304 Not Modified
+        self.postings_unchanged = 0  # postings whose listing entry (or whole listing) did not change
+        self.new = 0
+        self.updated = 0
+        self.closed = 0
+        self.errors = []
+        self.truncated = {}   # source key -> [listed, total] for listings cut off at the page cap
+        self.seconds = 0.0
+
+    def add(self, counter, amount=1):
+        """Thread-safe increment (detail pages are fetched concurrently)"""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + amount)
+
+    def as_dict(self):
+        return {key: value for key, value in vars(self).items() if key not in ("started", "_lock")}
+
+    def format(self):
+        """One-paragraph summary for the UI and logs"""
+        text = (f"🕸️ Crawled {self.sources} board(s) in {self.seconds:.1f}s — pages fetched: {self.fetched}, "
+                f"skipped as unchanged: {self.unchanged} · postings new: {self.new}, updated: {self.updated}, "
+                f"unchanged: {self.postings_unchanged}, closed: {self.closed}")
+        if self.truncated:
+            text += " · ✂️ listing cut off at the page cap, nothing closed for: " + "; ".join(
+                f"{key} ({listed} of {total})" for key, (listed, total) in self.truncated.items())
+        if self.errors:
+            text += f" · ⚠️ {len(self.errors)} error(s): " + "; ".join(self.errors[:3])
+        return text
+
+
+class Crawler:
+    """Conditional HTTP fetches into a JobIndex"""
+
+    def __init__(self, index=JOB_INDEX):
+        self.index = index
+
+    # ------------------------------------------------------------------- http
+
+    def fetch(self, url, report, body=None):
+        """JSON from url, or None when the server answered 304 Not Modified.
+
+        GETs send the stored validators; POSTs (Workday listings) cannot be
+        revalidated and are always fetched.
+        """
+        headers = {"User-Agent": USER_AGENT, "Accept": "application/json"}
+        data = None
+        if body is None:
+            etag, last_modified = self.index.validators(url)
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+        else:
+            data = json.dumps(body).encode("utf-8")
+            headers["Content-Type"] = "application/json"
+
+        request = urllib.request.Request(url, data=data, headers=headers, method="GET" if data is None else "POST")
+        try:
+            with urllib.request.urlopen(request, timeout=REQUEST_TIMEOUT) as response:
+                payload = json.loads(response.read().decode("utf-8"))
+                if data is None:
+                    self.index.save_validators(url, response.headers.get("ETag"),
+                                               response.headers.get("Last-Modified"))
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                report.add("unchanged")
+                return None
+            raise
+        report.add("fetched")
+        return payload
+
+    def _fetch_details(self, items, fetch_one, report):
+        """Run fetch_one over items concurrently; returns the postings it produced"""
+        postings = []
+        with ThreadPoolExecutor(max_workers=DETAIL_CONCURRENCY) as pool:
+            for item, result in zip(items, pool.map(lambda item: self._safe(fetch_one, item, report), items)):
+                if result is not None:
+                    postings.append(result)
+        return postings
+
+    @staticmethod
+    def _safe(fetch_one, item, report):
+        try:
+            return fetch_one(item)
+        except Exception as e:
+            with report._lock:
+                report.errors.append(f"{item}: {e}")
+            return None
+
+    # -------------------------------------------------------------- platforms
+
+    def _crawl_greenhouse(self, source, known, report):
+        listing = self.fetch(source.api, report)
+        if listing is None:
+            # Nothing on the board changed: every known posting is still current
+            report.add("postings_unchanged", len(known))
+            return list(known), []
+
+        listed, changed = [], []
+        for job in listing.get("jobs", []):
+            posting_id = f"{source.key}:{job['id']}"
+            listed.append(posting_id)
+            if known.get(posting_id) == job.get("updated_at"):
+                report.add("postings_unchanged")
+            else:
+                changed.append(job["id"])
+
+        def fetch_one(job_id):
+            job = self.fetch(f"{source.api}/{job_id}", report)
+            if job is None:
+                return None
+            return {
+                "id": f"{source.key}:{job_id}",
+                "title": job.get("title", ""),
+                "location": (job.get("location") or {}).get("name", ""),
+                "posted_at": (job.get("first_published") or job.get("updated_at") or "")[:10] or None,
+                "url": job.get("absolute_url", ""),
+                "req_id": job.get("requisition_id"),
+                "description": html_text(job.get("content")),
+                "marker": job.get("updated_at"),
+            }
+
+        return listed, self._fetch_details(changed, fetch_one, report)
+
+    def _crawl_lever(self, source, known, report):
+        listing = self.fetch(source.api, report)
+        if listing is None:
+            report.add("postings_unchanged", len(known))
+            return list(known), []
+
+        listed, postings = [], []
+        for job in listing:
+            posting_id = f"{source.key}:{job['id']}"
+            listed.append(posting_id)
+            # The listing carries the whole posting; a content hash tells what changed
+            marker = hashlib.sha1(json.dumps(job, sort_keys=True).encode("utf-8")).hexdigest()
+            if known.get(posting_id) == marker:
+                report.add("postings_unchanged")
+                continue
+            categories = job.get("categories") or {}
+            sections = [job.get("descriptionPlain", "")]
+            sections += [f"{item.get('text', '')}\n{html_text(item.get('content'))}" for item in job.get("lists", [])]
+            sections.append(job.get("additionalPlain", ""))
+            created = job.get("createdAt")
+            postings.append({
+                "id": posting_id,
+                "title": job.get("text", ""),
+                "location": categories.get("location") or ", ".join(categories.get("allLocations") or []),
+                "posted_at": datetime.date.fromtimestamp(created / 1000).isoformat() if created else None,
+                "url": job.get("hostedUrl") or job.get("applyUrl", ""),
+                "description": "\n".join(section for section in sections if section),
+                "marker": marker,
+            })
+        return listed, postings
+
+    def _crawl_workday(self, source, known, report):
+        listed, changed, total = [], [], None
+        for page in range(WORKDAY_MAX_PAGES):
+            body = {"appliedFacets": {}, "limit": WORKDAY_PAGE_SIZE, "offset": page * WORKDAY_PAGE_SIZE,
+                    "searchText": ""}
+            listing = self.fetch(f"{source.api}/jobs", report, body=body)
+            # Only the first page reports the total
+            total = total or listing.get("total") or 0
+            jobs = listing.get("jobPostings") or []
+            for job in jobs:
+                path = job.get("externalPath")
+                if not path:
+                    continue
+                posting_id = f"{source.key}:{path.rsplit('/', 1)[-1]}"
+                listed.append(posting_id)
+                marker = f"{job.get('title', '')}|{job.get('locationsText', '')}"
+                if known.get(posting_id) == marker:
+                    report.add("postings_unchanged")
+                else:
+                    changed.append((posting_id, path, marker, job.get("postedOn")))
+            if not jobs or (page + 1) * WORKDAY_PAGE_SIZE >= total:
+                break
+        else:
+            # Stopped at the page cap: postings beyond it are unlisted here, not closed
+            with report._lock:
+                report.truncated[source.key] = [len(listed), total]
+
+        def fetch_one(item):
+            posting_id, path, marker, posted_on = item
+            detail = self.fetch(f"{source.api}{path}", report)
+            if detail is None:
+                return None
+            info = detail.get("jobPostingInfo") or {}
+            return {
+                "id": posting_id,
+                "title": info.get("title", ""),
+                "location": info.get("location", ""),
+                "posted_at": info.get("startDate") or _posted_date(info.get("postedOn") or posted_on),
+                "url": info.get("externalUrl") or f"{source.site_url}{path}",
+                "req_id": info.get("jobReqId"),
+                "description": html_text(info.get("jobDescription")),
+                "marker": marker,
+            }
+
+        return listed, self._fetch_details(changed, fetch_one, report)
+
+    # ------------------------------------------------------------------ crawl
+
+    def crawl(self, urls=None, progress=None):
+        """Crawl every board (default: crawl_sources.json); returns a CrawlReport"""
+        report = CrawlReport()
+        urls = load_sources() if urls is None else urls
+        for url in urls:
+            source = parse_source(url)
+            if source is None:
+                report.errors.append(f"{url}: not a Workday, Greenhouse or Lever board")
+                continue
+            report.sources += 1
+            message = f"🕸️ Crawling {source.key}..."
+            print(message)
+            if progress:
+                progress(message)
+
+            crawl_platform = getattr(self, f"_crawl_{source.platform}")
+            known = self.index.known(source.key)
+            with span("crawl", host=urlparse(source.api).hostname or "", source=source.key) as s:
+                try:
+                    listed, postings = crawl_platform(source, known, report)
+                except Exception as e:
+                    s.outcome = "error"
+                    report.errors.append(f"{source.key}: {e}")
+                    continue
+                for posting in postings:
+                    posting.update(source=source.key, platform=source.platform, company=source.company)
+                new, updated = self.index.upsert(postings)
+                self.index.touch([posting_id for posting_id in listed if posting_id in known])
+                report.new += new
+                report.updated += updated
+                if source.key not in report.truncated:
+                    report.closed += self.index.close_missing(source.key, listed)
+                s.tags.update(listed=len(listed), fetched=len(postings))
+
+        report.seconds = time.perf_counter() - report.started
+        print(report.format())
+        return report
+
+
+def crawl(urls=None, progress=None):
+    """Crawl boards into the shared index"""
+    return Crawler().crawl(urls, progress)
@@ -0,0 +1,227 @@
+"""
+Job Posting Index
+=================
+Local SQLite store of crawled job postings with an FTS5 full-text index over
+title, company, location and description.
+
+Searches combine a keyword match (ranked with bm25), a location match and a
+posted-since date in one query; postings that disappeared from their board
+are kept but marked closed and left out of searches by default. The index
+also keeps the ETag / Last-Modified validators of every page the crawler
+fetched, so the next crawl can send conditional requests.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+
+JOBS_PATH = "jobs.db"
+
+SEARCH_LIMIT = 50
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id TEXT PRIMARY KEY,
+    source TEXT NOT NULL,
+    platform TEXT NOT NULL,
+    company TEXT NOT NULL,
+    title TEXT NOT NULL,
+    location TEXT NOT NULL DEFAULT '',
+    posted_at TEXT,
+    url TEXT NOT NULL,
+    req_id TEXT,
+    description TEXT NOT NULL DEFAULT '',
+    marker TEXT,
+    first_seen REAL NOT NULL,
+    last_seen REAL NOT NULL,
+    closed_at REAL
+);
+CREATE INDEX IF NOT EXISTS postings_source ON postings (source, closed_at);
+CREATE INDEX IF NOT EXISTS postings_posted ON postings (posted_at);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+    title, company, location, description,
+    content='postings', content_rowid='rowid', tokenize='unicode61 remove_diacritics 2'
+);
+CREATE TRIGGER IF NOT EXISTS postings_ai AFTER INSERT ON postings BEGIN
+    INSERT INTO postings_fts (rowid, title, company, location, description)
+    VALUES (new.rowid, new.title, new.company, new.location, new.description);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_ad AFTER DELETE ON postings BEGIN
+    INSERT INTO postings_fts (postings_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+END;
+CREATE TRIGGER IF NOT EXISTS postings_au AFTER UPDATE OF title, company, location, description ON postings BEGIN
+    INSERT INTO postings_fts (postings_fts, rowid, title, company, location, description)
+    VALUES ('delete', old.rowid, old.title, old.company, old.location, old.description);
+    INSERT INTO postings_fts (rowid, title, company, location, description)
+    VALUES (new.rowid, new.title, new.company, new.location, new.description);
+END;
+
+CREATE TABLE IF NOT EXISTS validators (
+    url TEXT PRIMARY KEY,
+    etag TEXT,
+    last_modified TEXT,
+    fetched_at REAL NOT NULL
+);
+"""
+
+_FIELDS = ("source", "platform", "company", "title", "location", "posted_at", "url", "req_id", "description", "marker")
+
+
+def fts_query(text, column=None):
+    """FTS5 query matching every word of free text (each word quoted, so no query syntax leaks in)"""
+    words = re.findall(r"\w+", text or "")
+    if not words:
+        return None
+    terms = " ".join('"' + word.replace('"', '""') + '"' for word in words)
+    return f"{column} : ({terms})" if column else terms
+
+
+class JobIndex:
+    """Crawled postings with full-text search, plus HTTP validators for the crawler"""
+
+    def __init__(self, path=JOBS_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = None
+
+    def _connection(self):
+        """Open the database on first use (caller holds the lock)"""
+        if self._db is None:
+            self._db = sqlite3.connect(self.path, check_same_thread=False)
+            self._db.row_factory = sqlite3.Row
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.executescript(_SCHEMA)
+        return self._db
+
+    # ------------------------------------------------------------- validators
+
+    def validators(self, url):
+        """(etag, last_modified) stored for a URL, or (None, None)"""
+        with self._lock:
+            row = self._connection().execute(
+                "SELECT etag, last_modified FROM validators WHERE url = ?", (url,)
+            ).fetchone()
+        return (row["etag"], row["last_modified"]) if row else (None, None)
+
+    def save_validators(self, url, etag, last_modified):
+        if not etag and not last_modified:
+            return
+        with self._lock:
+            db = self._connection()
+            with db:
+                db.execute(
+                    "INSERT OR REPLACE INTO validators (url, etag, last_modified, fetched_at) VALUES (?, ?, ?, ?)",
+                    (url, etag, last_modified, time.time()),
+                )
+
+    # --------------------------------------------------------------- postings
+
+    def known(self, source):
+        """posting id -> change marker for the open postings of a source"""
+        with self._lock:
+            rows = self._connection().execute(
+                "SELECT id, marker FROM postings WHERE source = ? AND closed_at IS NULL", (source,)
+            ).fetchall()
+        return {row["id"]: row["marker"] for row in rows}
+
+    def upsert(self, postings):
+        """Insert or update posting dicts (keys: id + _FIELDS); returns (new, updated)"""
+        now = time.time()
+        new = updated = 0
+        with self._lock:
+            db = self._connection()
+            with db:
+                for posting in postings:
+                    values = [posting.get(field) or ("" if field in ("location", "description") else None)
+                              for field in _FIELDS]
+                    exists = db.execute("SELECT 1 FROM postings WHERE id = ?", (posting["id"],)).fetchone()
+                    if exists:
+                        assignments = ", ".join(f"{field} = ?" for field in _FIELDS)
+                        db.execute(
+                            f"UPDATE postings SET {assignments}, last_seen = ?, closed_at = NULL WHERE id = ?",
+                            (*values, now, posting["id"]),
+                        )
+                        updated += 1
+                    else:
+                        db.execute(
+                            f"INSERT INTO postings (id, {', '.join(_FIELDS)}, first_seen, last_seen)"
+                            f" VALUES (?, {', '.join('?' for _ in _FIELDS)}, ?, ?)",
+                            (posting["id"], *values, now, now),
+                        )
+                        new += 1
+        return new, updated
+
+    def touch(self, ids):
+        """Mark postings as still listed"""
+        if not ids:
+            return
+        with self._lock:
+            db = self._connection()
+            with db:
+                db.executemany("UPDATE postings SET last_seen = ? WHERE id = ?", [(time.time(), i) for i in ids])
+
+    def close_missing(self, source, listed_ids):
+        """Mark a source's open postings that are no longer listed as closed; returns how many"""
+        listed = set(listed_ids)
+        missing = [posting_id for posting_id in self.known(source) if posting_id not in listed]
+        if missing:
+            with self._lock:
+                db = self._connection()
+                with db:
+                    db.executemany("UPDATE postings SET closed_at = ? WHERE id = ?",
+                                   [(time.time(), posting_id) for posting_id in missing])
+        return len(missing)
+
+    # ----------------------------------------------------------------- search
+
+    def search(self, keywords="", location="", posted_since=None, limit=SEARCH_LIMIT, include_closed=False):
+        """Matching postings as dicts: best keyword match first, otherwise newest first.
+
+        posted_since is an ISO date ('2026-10-01'); postings without a known
+        date are kept so they are not silently lost.
+        """
+        match = " AND ".join(query for query in (fts_query(keywords), fts_query(location, "location")) if query)
+        where, params = [], []
+        if match:
+            where.append("postings_fts MATCH ?")
+            params.append(match)
+        if posted_since:
+            where.append("(p.posted_at >= ? OR p.posted_at IS NULL)")
+            params.append(posted_since)
+        if not include_closed:
+            where.append("p.closed_at IS NULL")
+
+        if match:
+            sql = ("SELECT p.* FROM postings_fts JOIN postings p ON p.rowid = postings_fts.rowid"
+                   f" WHERE {' AND '.join(where)} ORDER BY bm25(postings_fts, 10.0, 5.0, 2.0, 1.0) LIMIT ?")
+        else:
+            clause = f"WHERE {' AND '.join(where)}" if where else ""
+            sql = f"SELECT p.* FROM postings p {clause} ORDER BY p.posted_at IS NULL, p.posted_at DESC LIMIT ?"
+        try:
+            with self._lock:
+                rows = self._connection().execute(sql, (*params, limit)).fetchall()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not search jobs: {e}")
+            return []
+        return [dict(row) for row in rows]
+
+    # ------------------------------------------------------------------ stats
+
+    def stats(self):
+        with self._lock:
+            db = self._connection()
+            open_count = db.execute("SELECT COUNT(*) FROM postings WHERE closed_at IS NULL").fetchone()[0]
+            sources = db.execute("SELECT COUNT(DISTINCT source) FROM postings").fetchone()[0]
+        return {"open": open_count, "sources": sources}
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        s = self.stats()
+        return f"**Job index** — {s['open']} open posting(s) from {s['sources']} board(s)"
+
+
+# Shared index used by the crawler, the UI and the CLI
+JOB_INDEX = JobIndex()
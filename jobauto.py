@@ -0,0 +1,284 @@
+"""
+Job Application Automation - Command Line
+=========================================
+Scriptable entry point for the same flows as the web UI:
+
+    python jobauto.py open URL...          # new tabs in your own Chrome (over DevTools)
+    python jobauto.py login URL...         # automated browser with auto-login
+    python jobauto.py batch -c 3 < urls.txt
+    python jobauto.py warm [URL...]        # fill the template profile's caches
+    python jobauto.py crawl [BOARD...]     # update the local job index
+    python jobauto.py search -k python -l Tempe --days 7 [--login]
+    python jobauto.py ui                   # the Gradio interface
+
+URLs come from the arguments or, if there are none, from stdin (one or more
+per line, .txt/.csv style). Every URL produces one JSON line on stdout;
+progress messages go to stderr. URLs already opened or logged into (see
+history.db) are skipped with `"skipped": true` unless --no-skip is given.
+
+Startup stays fast because nothing heavy is imported up front: Gradio is
+only loaded for `ui`, and Selenium only once a browser is actually launched.
+"""
+
+import argparse
+import contextlib
+import json
+import sys
+import time
+
+# batch_runner only needs the standard library and history_store, so it is cheap to load here
+from batch_runner import DEFAULT_CONCURRENCY, DEFAULT_RETRIES
+
+
+def _read_urls(args):
+    from batch_runner import parse_urls
+
+    if args.urls:
+        return parse_urls("\n".join(args.urls))
+    if sys.stdin is None or sys.stdin.isatty():
+        return []
+    return parse_urls(sys.stdin.read())
+
+
+def _emit(record):
+    """One JSON line on the real stdout (progress prints are redirected to stderr)"""
+    sys.__stdout__.write(json.dumps(record, ensure_ascii=False) + "\n")
+    sys.__stdout__.flush()
+
+
+def _status_field(status, prefix):
+    """The value of a 'prefix: value' line of a flow status string, if any"""
+    for line in status.splitlines():
+        if line.startswith(prefix + ":"):
+            return line.split(":", 1)[1].strip()
+    return None
+
+
+def _record(command, url, status, started, **extra):
+    from batch_runner import is_failure_status
+
+    record = {
+        "command": command,
+        "url": url,
+        "ok": not is_failure_status(status),
+        "status": status.splitlines()[0] if status else "",
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+    }
+    if status and status.startswith("⏭️"):
+        record["skipped"] = True
+    for key, prefix in (("login", "🔐 Login Status"), ("platform_path", "🧩 Platform Path"),
+                        ("form_fill", "📝 Form Fill")):
+        value = _status_field(status or "", prefix)
+        if value:
+            record[key] = value
+    record.update(extra)
+    return record
+
+
+def _use_pool(size):
+    """Swap in a pool sized for this run (launched on demand, nothing pre-warmed)"""
+    import automation
+    from driver_pool import DriverPool
+
+    automation.DRIVER_POOL = DriverPool(min_size=0, max_size=size)
+    return automation.DRIVER_POOL
+
+
+def _wait_for_user(args):
+    if args.wait:
+        print("⏸️ Browser windows stay open - press Ctrl+C to close them and exit")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+def cmd_open(args):
+    """Open URLs as tabs in the user's Chrome (no Selenium)"""
+    from automation import open_urls_in_chrome
+
+    urls = _read_urls(args)
+    if not urls:
+        return None
+    # One DevTools batch for all URLs (elapsed_ms is the whole batch)
+    started = time.perf_counter()
+    ok = True
+    for url, status in zip(urls, open_urls_in_chrome(urls, skip_duplicates=args.skip)):
+        record = _record("open", url, status, started)
+        ok = ok and record["ok"]
+        _emit(record)
+    return ok
+
+
+def cmd_login(args):
+    """Open URLs one by one in the automated browser and log in where needed"""
+    import automation
+
+    urls = _read_urls(args)
+    if not urls:
+        return None
+    pool = _use_pool(1)
+    ok = True
+    try:
+        for url in urls:
+            started = time.perf_counter()
+            status = automation.open_url_with_autologin(url, skip_duplicates=args.skip)
+            record = _record("login", url, status, started)
+            ok = ok and record["ok"]
+            _emit(record)
+        _wait_for_user(args)
+    finally:
+        pool.shutdown()
+    return ok
+
+
+def cmd_batch(args):
+    """Run URLs concurrently through auto-login with retries"""
+    import functools
+
+    import automation
+    from batch_runner import run_batch
+
+    urls = _read_urls(args)
+    if not urls:
+        return None
+    pool = _use_pool(max(args.concurrency, 1))
+    ok = True
+    try:
+        worker = functools.partial(automation.open_url_with_autologin, skip_duplicates=args.skip, interactive=False)
+        for event in run_batch(urls, worker, concurrency=args.concurrency, max_retries=args.retries):
+            if event["type"] == "result":
+                record = _record("batch", event["url"], event["status"], time.perf_counter(),
+                                 attempts=event["attempts"])
+                record["ok"] = event["ok"]
+                record["elapsed_ms"] = round(event["elapsed"] * 1000, 1)
+                ok = ok and event["ok"]
+                _emit(record)
+            elif event["type"] == "summary":
+                _emit({"command": "batch", "summary": {k: v for k, v in event.items() if k != "type"}})
+        _wait_for_user(args)
+    finally:
+        pool.shutdown()
+    return ok
+
+
+def cmd_crawl(args):
+    """Crawl job boards (default: crawl_sources.json) into the local index"""
+    from job_crawler import crawl, load_sources
+
+    urls = args.urls or load_sources()
+    if not urls:
+        return None
+    report = crawl(urls)
+    _emit({"command": "crawl", "report": report.as_dict()})
+    return not report.errors
+
+
+def cmd_search(args):
+    """Search the job index; with --login, run the hits through auto-login"""
+    import datetime
+
+    from job_index import JOB_INDEX
+
+    since = args.since
+    if args.days:
+        since = (datetime.date.today() - datetime.timedelta(days=args.days)).isoformat()
+    postings = JOB_INDEX.search(args.keywords, args.location, since, limit=args.limit)
+    if not args.login:
+        for posting in postings:
+            _emit({"command": "search", **{key: posting[key] for key in
+                                           ("title", "company", "location", "posted_at", "url", "platform")}})
+        return True
+    if not postings:
+        print("ℹ️ No postings match")
+        return True
+    args.urls = [posting["url"] for posting in postings]
+    return cmd_batch(args)
+
+
+def cmd_warm(args):
+    """Load pages in the template profile so cloned session profiles start warm"""
+    from profile_manager import PROFILES, WARM_URLS
+
+    PROFILES.warm_template(args.urls or WARM_URLS)
+    _emit({"command": "warm", "template": PROFILES.template, "urls": args.urls or WARM_URLS})
+    return True
+
+
+def cmd_ui(args):
+    """Launch the Gradio interface"""
+    import gradio_frontend
+
+    gradio_frontend.main()
+    return True
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="jobauto", description="Open job application URLs, with auto-login")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    open_parser = commands.add_parser("open", help="open URLs as new tabs in your Chrome")
+    open_parser.add_argument("urls", nargs="*", help="URLs (default: read from stdin)")
+    open_parser.add_argument("--no-skip", dest="skip", action="store_false", help="reopen URLs already in the history")
+    open_parser.set_defaults(handler=cmd_open)
+
+    login_parser = commands.add_parser("login", help="open URLs in the automated browser and log in")
+    login_parser.add_argument("urls", nargs="*", help="URLs (default: read from stdin)")
+    login_parser.add_argument("--wait", action="store_true", help="keep the browser open until Ctrl+C")
+    login_parser.add_argument("--no-skip", dest="skip", action="store_false", help="reopen URLs already in the history")
+    login_parser.set_defaults(handler=cmd_login)
+
+    batch_parser = commands.add_parser("batch", help="run many URLs concurrently with retries")
+    batch_parser.add_argument("urls", nargs="*", help="URLs (default: read from stdin)")
+    batch_parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    batch_parser.add_argument("-r", "--retries", type=int, default=DEFAULT_RETRIES)
+    batch_parser.add_argument("--wait", action="store_true", help="keep the browsers open until Ctrl+C")
+    batch_parser.add_argument("--no-skip", dest="skip", action="store_false", help="reopen URLs already in the history")
+    batch_parser.set_defaults(handler=cmd_batch)
+
+    crawl_parser = commands.add_parser("crawl", help="crawl Workday/Greenhouse/Lever boards into the job index")
+    crawl_parser.add_argument("urls", nargs="*", help="board URLs (default: crawl_sources.json)")
+    crawl_parser.set_defaults(handler=cmd_crawl)
+
+    search_parser = commands.add_parser("search", help="search the job index")
+    search_parser.add_argument("-k", "--keywords", default="")
+    search_parser.add_argument("-l", "--location", default="")
+    search_parser.add_argument("--days", type=int, help="posted within the last N days")
+    search_parser.add_argument("--since", help="posted on or after this date (YYYY-MM-DD)")
+    search_parser.add_argument("--limit", type=int, default=50)
+    search_parser.add_argument("--login", action="store_true", help="open the hits with auto-login (as `batch`)")
+    search_parser.add_argument("-c", "--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    search_parser.add_argument("-r", "--retries", type=int, default=DEFAULT_RETRIES)
+    search_parser.add_argument("--no-skip", dest="skip", action="store_false", help="reopen URLs already in the history")
+    search_parser.add_argument("--wait", action="store_true", help="keep the browsers open until Ctrl+C")
+    search_parser.set_defaults(handler=cmd_search)
+
+    warm_parser = commands.add_parser("warm", help="load pages in the template profile to warm its caches")
+    warm_parser.add_argument("urls", nargs="*", help="pages to load (default: profile_manager.WARM_URLS)")
+    warm_parser.set_defaults(handler=cmd_warm)
+
+    ui_parser = commands.add_parser("ui", help="launch the web interface")
+    ui_parser.set_defaults(handler=cmd_ui)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "ui":
+        args.handler(args)
+        return 0
+
+    # The flows print progress for humans; keep stdout for JSON lines
+    with contextlib.redirect_stdout(sys.stderr):
+        ok = args.handler(args)
+
+    if ok is None:
+        print("❌ No URLs given (pass them as arguments, on stdin or in crawl_sources.json)", file=sys.stderr)
+        return 2
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,278 @@
+"""
+Lean Browser Profile
+====================
+Chrome launch flags and DevTools request blocking for automated login and
+batch sessions, where nobody looks at images, fonts or analytics tags.
+
+Blocking uses Network.setBlockedURLs, so it is a list of URL wildcard
+patterns: resource types are mapped to file extensions under the visited
+site's own host, third-party tags to host patterns. SSO and identity hosts
+therefore keep their images and fonts, navigating to an allowlisted host
+blocks nothing, and blocking is cleared once login is done so whatever the
+tab loads next loads fully. Reloading the page to bring back what was
+already blocked is opt-in (RELOAD_AFTER_UNBLOCK).
+
+Page-load time and browser RSS are tracked per profile ("lean" / "full") so
+the two can be compared in the UI.
+"""
+
+import fnmatch
+import os
+import threading
+from collections import defaultdict, deque
+
+from selector_cache import host_of
+
+# Launch pooled sessions with the lean flags and request blocking
+LEAN_MODE = True
+
+# After login, reload a visible single-URL tab whose images or fonts were
+# blocked (costs a second page load, which is then counted in the lean sample)
+RELOAD_AFTER_UNBLOCK = False
+
+# None keeps a visible window; "new" or "old" runs Chrome headless
+HEADLESS_MODE = None
+HEADLESS_WINDOW_SIZE = "1366,900"
+
+# Resource types to block and the URL patterns that stand for them
+BLOCKED_RESOURCE_TYPES = ["image", "media", "font"]
+RESOURCE_TYPE_PATTERNS = {
+    "image": ["*.png", "*.jpg", "*.jpeg", "*.gif", "*.webp", "*.avif", "*.ico", "*.bmp"],
+    "media": ["*.mp4", "*.webm", "*.mp3", "*.m4a", "*.ogg", "*.wav", "*.m3u8"],
+    "font": ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"],
+    "stylesheet": ["*.css"],
+}
+
+# Analytics, ad and chat tags that job sites load alongside the application
+BLOCKED_THIRD_PARTY_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "facebook.net",
+    "connect.facebook.net",
+    "linkedin.com/px",
+    "snap.licdn.com",
+    "hotjar.com",
+    "segment.io",
+    "cdn.segment.com",
+    "newrelic.com",
+    "nr-data.net",
+    "optimizely.com",
+    "qualtrics.com",
+    "intercom.io",
+    "drift.com",
+    "onetrust.com",
+    "cookielaw.org",
+    "bing.com/bat",
+    "clarity.ms",
+]
+
+# Login hosts: "*" applies to every site, other keys to sites whose host
+# ends with the key. Navigating to an allowlisted host blocks nothing.
+SSO_ALLOWLIST = {
+    "*": [
+        "weblogin.asu.edu",
+        "shibboleth.asu.edu",
+        "login.microsoftonline.com",
+        "*.okta.com",
+        "*.duosecurity.com",
+        "accounts.google.com",
+    ],
+    "myworkday.com": ["*.okta.com", "*.onelogin.com", "*.pingone.com", "*.auth0.com"],
+    "taleo.net": ["login.oracle.com", "*.identity.oraclecloud.com"],
+}
+
+# Extra flags for sessions that only automate (no extensions, no background work)
+LEAN_ARGUMENTS = [
+    "--disable-extensions",
+    "--disable-component-extensions-with-background-pages",
+    "--disable-background-networking",
+    "--disable-component-update",
+    "--disable-default-apps",
+    "--disable-sync",
+    "--disable-domain-reliability",
+    "--disable-client-side-phishing-detection",
+    "--disable-features=Translate,OptimizationHints,MediaRouter,InterestFeedContentSuggestions",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--no-default-browser-check",
+    "--mute-audio",
+]
+
+# Load-time / RSS samples kept per profile
+SAMPLES_PER_PROFILE = 200
+
+
+def profile_name(lean=None):
+    return "lean" if (LEAN_MODE if lean is None else lean) else "full"
+
+
+def add_lean_arguments(chrome_options):
+    """Add the lean launch flags (and headless mode, if configured) to ChromeOptions"""
+    for argument in LEAN_ARGUMENTS:
+        chrome_options.add_argument(argument)
+    if HEADLESS_MODE:
+        chrome_options.add_argument("--headless=new" if HEADLESS_MODE == "new" else "--headless")
+        chrome_options.add_argument(f"--window-size={HEADLESS_WINDOW_SIZE}")
+    return chrome_options
+
+
+def allowlist_for(host):
+    """Host patterns that must load fully when visiting `host`"""
+    allowed = list(SSO_ALLOWLIST.get("*", []))
+    for domain, hosts in SSO_ALLOWLIST.items():
+        if domain != "*" and (host == domain or host.endswith("." + domain)):
+            allowed.extend(hosts)
+    return allowed
+
+
+def _host_allowed(host, allowed):
+    return any(host == pattern or fnmatch.fnmatch(host, pattern) for pattern in allowed)
+
+
+def blocked_patterns(url):
+    """Network.setBlockedURLs patterns for a navigation to `url` ([] when the host is allowlisted).
+
+    Resource-type patterns only cover the site's own host, so the SSO hosts
+    a login redirects through are not affected.
+    """
+    host = host_of(url)
+    if not host or _host_allowed(host, allowlist_for(host)):
+        return []
+
+    patterns = []
+    for resource_type in BLOCKED_RESOURCE_TYPES:
+        patterns.extend(f"*://{host}/{pattern}" for pattern in RESOURCE_TYPE_PATTERNS.get(resource_type, []))
+    patterns.extend(f"*{blocked}*" for blocked in BLOCKED_THIRD_PARTY_HOSTS)
+    return patterns
+
+
+def apply_request_blocking(driver, url):
+    """Block resources for the next navigation; returns the number of patterns set"""
+    patterns = blocked_patterns(url)
+    driver.execute_cdp_cmd("Network.enable", {})
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": patterns})
+    return len(patterns)
+
+
+def clear_request_blocking(driver):
+    """Lift blocking in the current tab before it is handed to the user"""
+    driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": []})
+
+
+# Images that failed to load plus web fonts that errored on the current page
+_MISSING_RESOURCES_SCRIPT = """
+var missing = 0;
+for (var i = 0; i < document.images.length; i++) {
+    var img = document.images[i];
+    if (img.currentSrc && img.complete && img.naturalWidth === 0) missing++;
+}
+if (document.fonts) document.fonts.forEach(function (font) { if (font.status === 'error') missing++; });
+return missing;
+"""
+
+
+def missing_resources(driver):
+    """How many images/fonts on the current page failed to load (blocked ones included)"""
+    return int(driver.execute_script(_MISSING_RESOURCES_SCRIPT) or 0)
+
+
+# --------------------------------------------------------------- measurement
+
+def _proc_rss(pid):
+    """RSS in bytes of one process from /proc (Linux), or None"""
+    try:
+        with open(f"/proc/{pid}/status", "r", encoding="utf-8") as file:
+            for line in file:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError):
+        return None
+    return 0
+
+
+def _proc_children():
+    """pid -> [child pids] from /proc (Linux)"""
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "r", encoding="utf-8") as file:
+                # The command name may contain spaces, so split after its closing paren
+                ppid = int(file.read().rsplit(")", 1)[1].split()[1])
+        except (OSError, ValueError, IndexError):
+            continue
+        children[ppid].append(int(entry))
+    return children
+
+
+def browser_rss(driver):
+    """Resident memory of the Chrome processes behind a driver, in bytes (None if unknown)"""
+    try:
+        root = driver.service.process.pid
+    except AttributeError:
+        return None
+
+    try:
+        import psutil
+    except ImportError:
+        psutil = None
+
+    if psutil is not None:
+        try:
+            processes = psutil.Process(root).children(recursive=True)
+            return sum(process.memory_info().rss for process in processes)
+        except psutil.Error:
+            return None
+
+    if not os.path.isdir("/proc"):
+        return None
+    children = _proc_children()
+    total, stack = 0, list(children.get(root, []))
+    while stack:
+        pid = stack.pop()
+        total += _proc_rss(pid) or 0
+        stack.extend(children.get(pid, []))
+    return total
+
+
+class ProfileStats:
+    """Page-load time and RSS samples per launch profile"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._loads = defaultdict(lambda: deque(maxlen=SAMPLES_PER_PROFILE))
+        self._rss = defaultdict(lambda: deque(maxlen=SAMPLES_PER_PROFILE))
+
+    def record(self, profile, load_ms, rss_bytes=None):
+        with self._lock:
+            self._loads[profile].append(load_ms)
+            if rss_bytes:
+                self._rss[profile].append(rss_bytes)
+
+    def stats(self):
+        with self._lock:
+            result = {}
+            for profile in sorted(set(self._loads) | set(self._rss)):
+                loads, rss = list(self._loads[profile]), list(self._rss[profile])
+                result[profile] = {
+                    "loads": len(loads),
+                    "avg_load_ms": sum(loads) / len(loads) if loads else 0.0,
+                    "avg_rss_mb": sum(rss) / len(rss) / (1024 * 1024) if rss else None,
+                }
+            return result
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        parts = []
+        for profile, s in self.stats().items():
+            rss = f"{s['avg_rss_mb']:.0f} MB" if s["avg_rss_mb"] is not None else "n/a"
+            parts.append(f"{profile}: avg load {s['avg_load_ms']:.0f} ms, avg RSS {rss} ({s['loads']} loads)")
+        mode = profile_name()
+        headless = f", headless={HEADLESS_MODE}" if HEADLESS_MODE else ""
+        return f"**Browser profile** ({mode}{headless}) — " + (" · ".join(parts) or "no page loads yet")
+
+
+PROFILE_STATS = ProfileStats()
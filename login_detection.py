@@ -0,0 +1,458 @@
+"""
+Login Field Detection
+=====================
+Finds the username, password and submit controls of a login form.
+
+The default "scan" mode injects one script that scores every input/button on
+the page against the whole selector catalogue and returns the best candidates
+in a single WebDriver round trip. The old "sequential" mode (one
+WebDriverWait per selector) is kept as a fallback.
+"""
+
+import re
+import time
+
+# Username field selectors, strongest first (including ASURITE specific)
+USERNAME_SELECTORS = [
+    # Standard username fields
+    "input[name='username']",
+    "input[name='userid']",
+    "input[name='user_id']",
+    "input[name='user']",
+    "input[name='login']",
+    "input[name='email']",
+    # ASURITE specific
+    "input[name='asurite']",
+    "input[name='j_username']",  # Common in Shibboleth/CAS
+    "input[name='userPrincipalName']",
+    # ID selectors
+    "input[id='username']",
+    "input[id='userid']",
+    "input[id='user_id']",
+    "input[id='asurite']",
+    "input[id='user']",
+    "input[id='login']",
+    "input[id='j_username']",
+    # Generic text inputs (fallback)
+    "input[type='text']:first-of-type",
+    "input[type='email']",
+]
+
+# Password field selectors
+PASSWORD_SELECTORS = [
+    "input[name='password']",
+    "input[name='pwd']",
+    "input[name='j_password']",  # Common in Shibboleth/CAS
+    "input[id='password']",
+    "input[id='pwd']",
+    "input[id='j_password']",
+    "input[type='password']",
+]
+
+# Submit button selectors (":contains" entries are matched on button text)
+SUBMIT_SELECTORS = [
+    "button[type='submit']",
+    "input[type='submit']",
+    "button[name='submit']",
+    "input[name='submit']",
+    "button:contains('Sign In')",
+    "button:contains('Sign in')",
+    "button:contains('LOGIN')",
+    "button:contains('Login')",
+    "input[value*='Sign']",
+    "input[value*='Login']",
+    "button.btn-primary",
+    "button.login",
+    "button.signin",
+    "input.btn-primary",
+]
+
+# XPath fallbacks, only consulted after every CSS selector
+USERNAME_XPATHS = [
+    "//input[contains(@name, 'user') or contains(@name, 'login') or contains(@name, 'email')]",
+    "//input[@type='text']",
+    "//input[@type='email']",
+]
+
+PASSWORD_XPATHS = [
+    "//input[@type='password']",
+]
+
+SUBMIT_XPATHS = [
+    "//button[contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'sign') or contains(translate(text(), 'ABCDEFGHIJKLMNOPQRSTUVWXYZ', 'abcdefghijklmnopqrstuvwxyz'), 'login')]",
+    "//input[@type='submit']",
+    "//button[@type='submit']",
+]
+
+# "scan" = one injected script per page, "sequential" = legacy per-selector waits
+DETECTION_MODE = "scan"
+
+_CONTAINS_RE = re.compile(r"^(\w+):contains\('(.*)'\)$")
+
+# Helpers shared by the scan and cached-lookup scripts
+_HELPERS_SCRIPT = """
+function visible(el) {
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+
+// Hash of the page's field shape (tag/type/name of visible-type controls)
+function pageFingerprint() {
+    var parts = [];
+    var controls = document.querySelectorAll('input, button, select, textarea');
+    for (var i = 0; i < controls.length && i < 200; i++) {
+        var el = controls[i];
+        if (el.type === 'hidden') continue;
+        parts.push(el.tagName.toLowerCase() + '|' + (el.type || '') + '|' + (el.getAttribute('name') || ''));
+    }
+    parts.sort();
+    var shape = parts.filter(function (part, i) { return part !== parts[i - 1]; }).join(';');
+    var hash = 5381;
+    for (var j = 0; j < shape.length; j++) hash = ((hash << 5) + hash + shape.charCodeAt(j)) | 0;
+    return (hash >>> 0).toString(16);
+}
+
+// Shortest selector that matches only this element: #id, tag[name], else a nth-of-type path
+function uniqueSelector(el) {
+    var tag = el.tagName.toLowerCase();
+    var selector;
+    if (el.id && window.CSS && CSS.escape) {
+        selector = '#' + CSS.escape(el.id);
+        if (document.querySelectorAll(selector).length === 1) return selector;
+    }
+    var name = el.getAttribute('name');
+    if (name) {
+        selector = tag + '[name="' + name.replace(/["\\\\]/g, '\\\\$&') + '"]';
+        if (document.querySelectorAll(selector).length === 1) return selector;
+    }
+    var path = [];
+    for (var node = el; node && node.nodeType === 1 && node !== document.documentElement; node = node.parentElement) {
+        var index = 1;
+        for (var sibling = node.previousElementSibling; sibling; sibling = sibling.previousElementSibling) {
+            if (sibling.tagName === node.tagName) index++;
+        }
+        path.unshift(node.tagName.toLowerCase() + ':nth-of-type(' + index + ')');
+    }
+    return 'html > ' + path.join(' > ');
+}
+"""
+
+# Scores every element matched by the catalogue and picks the best candidate
+# per role. Earlier selectors score higher; visible elements and elements in
+# the same form as the chosen password field get a bonus.
+SCAN_SCRIPT = _HELPERS_SCRIPT + """
+var catalogue = arguments[0];
+
+function collect(rules) {
+    var found = [];
+    var seen = new Map();
+    var total = rules.length;
+    rules.forEach(function (rule, index) {
+        var matches = [];
+        try {
+            if (rule.kind === 'css') {
+                matches = Array.prototype.slice.call(document.querySelectorAll(rule.selector));
+            } else if (rule.kind === 'xpath') {
+                var result = document.evaluate(rule.selector, document, null,
+                    XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+                for (var i = 0; i < result.snapshotLength; i++) matches.push(result.snapshotItem(i));
+            } else if (rule.kind === 'text') {
+                matches = Array.prototype.slice.call(document.getElementsByTagName(rule.tag))
+                    .filter(function (el) { return (el.textContent || '').indexOf(rule.text) !== -1; });
+            }
+        } catch (e) {
+            return;
+        }
+        var weight = (total - index) * rule.weight;
+        matches.forEach(function (el) {
+            var entry = seen.get(el);
+            if (!entry) {
+                entry = {element: el, score: 0, selector: rule.label, index: index};
+                seen.set(el, entry);
+                found.push(entry);
+            }
+            if (weight > entry.score) {
+                entry.score = weight;
+                entry.selector = rule.label;
+                entry.index = index;
+            }
+        });
+    });
+    return found;
+}
+
+function pick(candidates, exclude, form, needsEnabled) {
+    var best = null;
+    candidates.forEach(function (entry) {
+        var el = entry.element;
+        if (exclude && el === exclude) return;
+        if (needsEnabled && el.disabled) return;
+        var score = entry.score;
+        if (visible(el)) score += 1000; else score -= 1000;
+        if (form && el.form === form) score += 500;
+        if (!best || score > best.score) {
+            best = {element: el, score: score, selector: entry.selector, index: entry.index};
+        }
+    });
+    if (best && best.score < 0) return null;
+    return best;
+}
+
+var password = pick(collect(catalogue.password), null, null, false);
+var form = password ? password.element.form : null;
+var username = pick(collect(catalogue.username), password && password.element, form, false);
+var submit = pick(collect(catalogue.submit), null, form, true);
+
+[username, password, submit].forEach(function (candidate) {
+    if (candidate) candidate.css = uniqueSelector(candidate.element);
+});
+
+return {
+    username: username,
+    password: password,
+    submit: submit,
+    fingerprint: pageFingerprint(),
+    inputs: document.getElementsByTagName('input').length,
+    buttons: document.getElementsByTagName('button').length
+};
+"""
+
+# Computes the page fingerprint and, if it has a learned entry, resolves the
+# cached selectors in the same round trip
+CACHED_LOOKUP_SCRIPT = _HELPERS_SCRIPT + """
+var entries = arguments[0];
+var fingerprint = pageFingerprint();
+var entry = entries[fingerprint];
+if (!entry) return {fingerprint: fingerprint, known: false, hit: false};
+
+function resolve(selector) {
+    if (!selector) return null;
+    try {
+        var el = document.querySelector(selector);
+        return el && visible(el) ? el : null;
+    } catch (e) {
+        return null;
+    }
+}
+
+var username = resolve(entry.username);
+var password = resolve(entry.password);
+var submit = resolve(entry.submit);
+return {
+    fingerprint: fingerprint,
+    known: true,
+    hit: !!(username && password && (submit || !entry.submit)),
+    username: username,
+    password: password,
+    submit: submit
+};
+"""
+
+# Resolves a platform's known selectors (first visible match per role)
+PLATFORM_LOOKUP_SCRIPT = _HELPERS_SCRIPT + """
+var selectors = arguments[0];
+var result = {fingerprint: pageFingerprint()};
+['username', 'password', 'submit'].forEach(function (role) {
+    result[role] = null;
+    if (!selectors[role]) return;
+    var matches = document.querySelectorAll(selectors[role]);
+    for (var i = 0; i < matches.length; i++) {
+        if (visible(matches[i]) && !matches[i].disabled) {
+            result[role] = {element: matches[i], css: uniqueSelector(matches[i])};
+            break;
+        }
+    }
+});
+return result;
+"""
+
+
+def _build_rules(selectors, xpaths):
+    """Turn a selector list into scan rules (CSS first, XPath fallbacks last)"""
+    rules = []
+    for selector in selectors:
+        match = _CONTAINS_RE.match(selector)
+        if match:
+            # ":contains" is not valid CSS, so match it on element text instead
+            rules.append({"kind": "text", "tag": match.group(1), "text": match.group(2),
+                          "label": selector, "weight": 1})
+        else:
+            rules.append({"kind": "css", "selector": selector, "label": selector, "weight": 1})
+    for xpath in xpaths:
+        # XPath rules sit below every CSS rule, like the old fallback order
+        rules.append({"kind": "xpath", "selector": xpath, "label": xpath, "weight": 0.5})
+    return rules
+
+
+def build_catalogue():
+    """Build the selector catalogue passed to the scan script"""
+    return {
+        "username": _build_rules(USERNAME_SELECTORS, USERNAME_XPATHS),
+        "password": _build_rules(PASSWORD_SELECTORS, PASSWORD_XPATHS),
+        "submit": _build_rules(SUBMIT_SELECTORS, SUBMIT_XPATHS),
+    }
+
+
+def _empty_result(mode):
+    return {
+        "username": None,
+        "password": None,
+        "submit": None,
+        "scores": {"username": None, "password": None, "submit": None},
+        "selectors": {"username": None, "password": None, "submit": None},
+        "css": {"username": None, "password": None, "submit": None},
+        "fingerprint": None,
+        "mode": mode,
+        "elapsed_ms": 0.0,
+    }
+
+
+def scan_login_fields(driver):
+    """Score every input/button against the catalogue in a single round trip"""
+    started = time.perf_counter()
+    result = _empty_result("scan")
+
+    found = driver.execute_script(SCAN_SCRIPT, build_catalogue()) or {}
+
+    for role in ("username", "password", "submit"):
+        candidate = found.get(role)
+        if candidate:
+            result[role] = candidate["element"]
+            result["scores"][role] = candidate["score"]
+            result["selectors"][role] = candidate["selector"]
+            result["css"][role] = candidate.get("css")
+    result["fingerprint"] = found.get("fingerprint")
+
+    result["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    print(f"🔎 Scanned {found.get('inputs', 0)} inputs / {found.get('buttons', 0)} buttons "
+          f"in {result['elapsed_ms']:.0f} ms")
+    return result
+
+
+def sequential_login_fields(driver):
+    """Legacy detection: try every selector one at a time with a 1s wait each"""
+    from selenium.webdriver.common.by import By
+    from selenium.webdriver.support.ui import WebDriverWait
+    from selenium.webdriver.support import expected_conditions as EC
+
+    started = time.perf_counter()
+    result = _empty_result("sequential")
+
+    def probe(role, locators, condition):
+        for i, (by, selector) in enumerate(locators):
+            try:
+                element = WebDriverWait(driver, 1).until(condition((by, selector)))
+                print(f"✅ Found {role} with selector #{i+1}: {selector}")
+                result[role] = element
+                result["selectors"][role] = selector
+                if by == By.CSS_SELECTOR:
+                    result["css"][role] = selector
+                return
+            except Exception:
+                print(f"❌ {role.capitalize()} selector #{i+1} failed: {selector}")
+
+    # Find username field (":contains" selectors are not valid CSS and never matched)
+    print("🔍 Searching for username field...")
+    probe("username",
+          [(By.CSS_SELECTOR, s) for s in USERNAME_SELECTORS] + [(By.XPATH, x) for x in USERNAME_XPATHS],
+          EC.presence_of_element_located)
+
+    # Find password field
+    print("🔍 Searching for password field...")
+    probe("password",
+          [(By.CSS_SELECTOR, s) for s in PASSWORD_SELECTORS] + [(By.XPATH, x) for x in PASSWORD_XPATHS],
+          EC.presence_of_element_located)
+
+    # Find submit button
+    print("🔍 Searching for submit button...")
+    probe("submit",
+          [(By.CSS_SELECTOR, s) for s in SUBMIT_SELECTORS if not _CONTAINS_RE.match(s)]
+          + [(By.XPATH, x) for x in SUBMIT_XPATHS],
+          EC.element_to_be_clickable)
+
+    result["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    return result
+
+
+def cached_login_fields(driver, host, cache):
+    """Resolve selectors learned for this host/page fingerprint in one round trip.
+
+    Returns the fields on a hit, otherwise None (a stale entry is invalidated).
+    """
+    entries = cache.entries_for(host)
+    if not entries:
+        return None
+
+    started = time.perf_counter()
+    found = driver.execute_script(CACHED_LOOKUP_SCRIPT, entries) or {}
+    lookup_ms = (time.perf_counter() - started) * 1000
+    fingerprint = found.get("fingerprint")
+
+    if not found.get("hit"):
+        cache.note_lookup(host, fingerprint, False, lookup_ms)
+        if found.get("known"):
+            # Same page shape but the learned selectors stopped matching
+            cache.invalidate(host, fingerprint)
+        return None
+
+    saved_ms = cache.note_lookup(host, fingerprint, True, lookup_ms)
+    result = _empty_result("cache")
+    for role in ("username", "password", "submit"):
+        result[role] = found.get(role)
+        if result[role] is not None:
+            result["selectors"][role] = result["css"][role] = entries[fingerprint][role]
+    result["fingerprint"] = fingerprint
+    result["elapsed_ms"] = lookup_ms
+    print(f"⚡ Selector cache hit for {host} ({lookup_ms:.0f} ms, ~{saved_ms:.0f} ms saved)")
+    return result
+
+
+def platform_login_fields(driver, selectors, platform=""):
+    """Resolve a known platform's login selectors in one round trip (no catalogue scan)"""
+    started = time.perf_counter()
+    result = _empty_result("platform")
+
+    found = driver.execute_script(PLATFORM_LOOKUP_SCRIPT, selectors) or {}
+    for role in ("username", "password", "submit"):
+        candidate = found.get(role)
+        if candidate:
+            result[role] = candidate["element"]
+            result["selectors"][role] = selectors[role]
+            result["css"][role] = candidate.get("css")
+    result["fingerprint"] = found.get("fingerprint")
+
+    result["elapsed_ms"] = (time.perf_counter() - started) * 1000
+    print(f"🧩 Resolved {platform or 'platform'} login selectors in {result['elapsed_ms']:.0f} ms")
+    return result
+
+
+def detect_login_fields(driver, mode=None, host=None, cache=None):
+    """Find login form fields, falling back to sequential probing if the scan fails.
+
+    With a host and a SelectorCache, selectors learned on earlier visits are
+    tried first and the full detection only runs on a miss.
+    """
+    mode = mode or DETECTION_MODE
+
+    if host and cache is not None:
+        try:
+            result = cached_login_fields(driver, host, cache)
+        except Exception as e:
+            print(f"⚠️ Selector cache lookup failed ({e}), running full detection...")
+            result = None
+        if result:
+            return result
+
+    if mode == "scan":
+        try:
+            result = scan_login_fields(driver)
+        except Exception as e:
+            print(f"⚠️ Single-pass scan failed ({e}), falling back to sequential probing...")
+            result = sequential_login_fields(driver)
+    else:
+        result = sequential_login_fields(driver)
+
+    print(f"⏱️ Field detection ({result['mode']}) took {result['elapsed_ms']:.0f} ms")
+    return result
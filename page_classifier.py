@@ -0,0 +1,200 @@
+"""
+Page Classifier
+===============
+Decides whether the current page is a login page, shows a login error, or
+looks like a successful login - without serializing the whole DOM.
+
+One injected script gathers only the relevant regions (title, form field
+attributes, labels, visible form text, alert/error regions) and matches every
+indicator in a single pass with one precompiled alternation pattern.
+"""
+
+import json
+import re
+import time
+
+# Common login page indicators
+LOGIN_INDICATORS = [
+    "asurite",
+    "user id",
+    "username",
+    "login",
+    "sign in",
+    "sign-in",
+    "password",
+    "authentication",
+    "shibboleth",
+    "cas login",
+]
+
+# Indicators that a login attempt was rejected
+ERROR_INDICATORS = ["error", "invalid", "incorrect", "failed", "denied"]
+
+# Regions each indicator group is matched against
+LOGIN_REGIONS = ["title", "form_fields", "labels", "form_text"]
+ERROR_REGIONS = ["alerts", "form_text"]
+
+# Also fetch driver.page_source and time the old substring scan, for comparison
+COMPARE_WITH_PAGE_SOURCE = False
+
+# Visible text is capped per region so a huge form cannot blow up the payload
+MAX_REGION_CHARS = 4000
+
+# Where sites render login errors
+ALERT_SELECTOR = (
+    '[role="alert"], [aria-live="assertive"], [aria-live="polite"], .error, .alert, '
+    '.error-message, .errors, .form-error, [class*="error"], [id*="error"]'
+)
+
+_JS_SPECIAL = re.compile(r"[.*+?^${}()|\[\]\\/]")
+
+
+def _js_alternation(indicators):
+    """Longest-first alternation so 'sign-in' wins over 'sign' style prefixes"""
+    ordered = sorted(set(indicators), key=len, reverse=True)
+    return "|".join(_JS_SPECIAL.sub(lambda m: "\\" + m.group(0), indicator) for indicator in ordered)
+
+
+# Built once at import; the script compiles each into a single RegExp
+LOGIN_PATTERN = _js_alternation(LOGIN_INDICATORS)
+ERROR_PATTERN = _js_alternation(ERROR_INDICATORS)
+
+CLASSIFY_SCRIPT = """
+var patterns = {login: new RegExp(arguments[0], 'gi'), error: new RegExp(arguments[1], 'gi')};
+var regionsFor = {login: arguments[2], error: arguments[3]};
+var maxChars = arguments[4];
+var alertSelector = arguments[5];
+
+function visible(el) {
+    var rect = el.getBoundingClientRect();
+    if (rect.width === 0 || rect.height === 0) return false;
+    var style = window.getComputedStyle(el);
+    return style.visibility !== 'hidden' && style.display !== 'none';
+}
+
+function visibleText(selector) {
+    var parts = [];
+    var length = 0;
+    var nodes = document.querySelectorAll(selector);
+    for (var i = 0; i < nodes.length && length < maxChars; i++) {
+        if (!visible(nodes[i])) continue;
+        var text = (nodes[i].innerText || '').trim();
+        if (text) { parts.push(text); length += text.length; }
+    }
+    return parts.join(' ').slice(0, maxChars);
+}
+
+var attributes = [];
+var fields = document.querySelectorAll('form, input, select, textarea, button');
+for (var i = 0; i < fields.length; i++) {
+    var el = fields[i];
+    ['name', 'id', 'type', 'placeholder', 'aria-label', 'autocomplete', 'action'].forEach(function (attr) {
+        var value = el.getAttribute(attr);
+        if (value) attributes.push(value);
+    });
+    // Button captions only - never read values typed into inputs
+    if (el.type === 'submit' || el.type === 'button') attributes.push(el.value || '');
+}
+
+var regions = {
+    title: document.title || '',
+    form_fields: attributes.join(' ').slice(0, maxChars),
+    labels: visibleText('label'),
+    form_text: visibleText('form'),
+    alerts: visibleText(alertSelector)
+};
+
+var evidence = {login: {}, error: {}};
+['login', 'error'].forEach(function (kind) {
+    regionsFor[kind].forEach(function (region) {
+        var found = regions[region].match(patterns[kind]);
+        if (!found) return;
+        var unique = {};
+        found.forEach(function (hit) { unique[hit.toLowerCase()] = true; });
+        evidence[kind][region] = Object.keys(unique);
+    });
+});
+
+var passwordFields = 0;
+document.querySelectorAll('input[type="password"]').forEach(function (el) {
+    if (visible(el)) passwordFields++;
+});
+
+return {
+    url: location.href,
+    title: document.title || '',
+    password_fields: passwordFields,
+    evidence: evidence,
+    scanned_chars: Object.keys(regions).reduce(function (sum, key) { return sum + regions[key].length; }, 0)
+};
+"""
+
+
+def _page_source_baseline(driver):
+    """The old approach: pull the whole DOM and substring-scan it per indicator"""
+    started = time.perf_counter()
+    page_source = driver.page_source
+    transferred = len(page_source.encode("utf-8"))
+    lowered = page_source.lower()
+    any(indicator in lowered for indicator in LOGIN_INDICATORS)
+    any(indicator in lowered for indicator in ERROR_INDICATORS)
+    return {"bytes": transferred, "elapsed_ms": (time.perf_counter() - started) * 1000}
+
+
+def classify_page(driver, start_url=None):
+    """Classify the current page as 'login', 'error' or 'success' with the evidence found.
+
+    start_url is the login page URL when classifying after a submit: a page
+    that still looks like a login form at the same URL counts as a failed login.
+    """
+    started = time.perf_counter()
+    raw = driver.execute_script(
+        CLASSIFY_SCRIPT, LOGIN_PATTERN, ERROR_PATTERN, LOGIN_REGIONS, ERROR_REGIONS, MAX_REGION_CHARS,
+        ALERT_SELECTOR,
+    ) or {}
+    elapsed_ms = (time.perf_counter() - started) * 1000
+
+    evidence = raw.get("evidence") or {"login": {}, "error": {}}
+    password_fields = raw.get("password_fields", 0)
+    is_login_page = bool(evidence.get("login")) or password_fields > 0
+    has_errors = bool(evidence.get("error"))
+    url = raw.get("url", "")
+
+    if start_url is not None and has_errors:
+        verdict = "error"
+    elif is_login_page and (start_url is None or url == start_url):
+        verdict = "login"
+    else:
+        verdict = "success"
+
+    result = {
+        "verdict": verdict,
+        "is_login_page": is_login_page,
+        "has_errors": has_errors,
+        "evidence": evidence,
+        "password_fields": password_fields,
+        "url": url,
+        "title": raw.get("title", ""),
+        "bytes": len(json.dumps(raw).encode("utf-8")),
+        "scanned_chars": raw.get("scanned_chars", 0),
+        "elapsed_ms": elapsed_ms,
+    }
+
+    print(f"🧭 Page classified as '{verdict}' in {elapsed_ms:.0f} ms ({result['bytes']:,} bytes transferred)")
+
+    if COMPARE_WITH_PAGE_SOURCE:
+        baseline = _page_source_baseline(driver)
+        result["baseline"] = baseline
+        print(f"📏 page_source approach: {baseline['bytes']:,} bytes in {baseline['elapsed_ms']:.0f} ms "
+              f"(classifier: {result['bytes']:,} bytes in {elapsed_ms:.0f} ms)")
+
+    return result
+
+
+def format_evidence(evidence):
+    """Compact 'region: hit, hit' summary for log lines"""
+    parts = []
+    for kind, regions in evidence.items():
+        for region, hits in regions.items():
+            parts.append(f"{kind}@{region}: {', '.join(hits)}")
+    return "; ".join(parts) or "none"
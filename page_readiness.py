@@ -0,0 +1,205 @@
+"""
+Page Readiness
+==============
+Event-driven waits that replace fixed sleeps in the login flow.
+
+A wait is built from pluggable conditions (document.readyState, network idle,
+URL change, credential field present, DOM quiescence). Each condition has its
+own max timeout, and the time actually spent is printed per phase.
+"""
+
+import time
+
+# Max time (seconds) each condition may take before the wait gives up on it
+DEFAULT_TIMEOUTS = {
+    "document_ready": 15.0,
+    "network_idle": 10.0,
+    "url_changed": 10.0,
+    "credential_field": 8.0,
+    "dom_quiescent": 8.0,
+}
+
+# How long the network / DOM must stay quiet to count as settled (ms)
+NETWORK_IDLE_MS = 500
+DOM_QUIET_MS = 400
+
+POLL_INTERVAL = 0.1
+
+# Installs fetch/XHR counters and a MutationObserver once per document and
+# reports how long the network and the DOM have been quiet.
+QUIET_SCRIPT = """
+var state = window.__jaReadiness;
+if (!state) {
+    state = window.__jaReadiness = {inflight: 0, entries: -1, network: Date.now(), mutation: Date.now()};
+    if (window.fetch) {
+        var originalFetch = window.fetch;
+        window.fetch = function () {
+            state.inflight++;
+            return originalFetch.apply(this, arguments).finally(function () {
+                state.inflight--;
+                state.network = Date.now();
+            });
+        };
+    }
+    var originalSend = XMLHttpRequest.prototype.send;
+    XMLHttpRequest.prototype.send = function () {
+        state.inflight++;
+        this.addEventListener('loadend', function () {
+            state.inflight--;
+            state.network = Date.now();
+        });
+        return originalSend.apply(this, arguments);
+    };
+    new MutationObserver(function () { state.mutation = Date.now(); })
+        .observe(document, {childList: true, subtree: true, attributes: true, characterData: true});
+}
+var now = Date.now();
+var entries = performance.getEntriesByType('resource').length;
+if (entries !== state.entries) {
+    state.entries = entries;
+    state.network = now;
+}
+if (state.inflight > 0) state.network = now;
+return {network: now - state.network, dom: now - state.mutation, inflight: state.inflight};
+"""
+
+CREDENTIAL_SCRIPT = """
+var fields = document.querySelectorAll(arguments[0]);
+for (var i = 0; i < fields.length; i++) {
+    var rect = fields[i].getBoundingClientRect();
+    if (rect.width > 0 && rect.height > 0) return true;
+}
+return false;
+"""
+
+MARK_ACTIVITY_SCRIPT = "var s = window.__jaReadiness; if (s) { s.network = s.mutation = Date.now(); }"
+
+CREDENTIAL_FIELD_SELECTOR = (
+    "input[type='password'], input[name='j_username'], input[name='username'], "
+    "input[id='username'], input[type='email']"
+)
+
+
+class ReadinessCondition:
+    """A named page condition polled until it holds or its timeout expires"""
+
+    def __init__(self, name, check, timeout):
+        self.name = name
+        self.check = check
+        self.timeout = timeout
+
+    def __repr__(self):
+        return f"ReadinessCondition({self.name!r}, timeout={self.timeout})"
+
+
+def document_ready(timeout=None):
+    """document.readyState is 'complete'"""
+    return ReadinessCondition(
+        "document_ready",
+        lambda driver: driver.execute_script("return document.readyState") == "complete",
+        timeout or DEFAULT_TIMEOUTS["document_ready"],
+    )
+
+
+def network_idle(idle_ms=None, timeout=None):
+    """No fetch/XHR in flight and no new resource loaded for idle_ms"""
+    idle_ms = idle_ms or NETWORK_IDLE_MS
+    return ReadinessCondition(
+        "network_idle",
+        lambda driver: (driver.execute_script(QUIET_SCRIPT) or {}).get("network", 0) >= idle_ms,
+        timeout or DEFAULT_TIMEOUTS["network_idle"],
+    )
+
+
+def url_changed(from_url, timeout=None):
+    """The browser has moved away from from_url"""
+    return ReadinessCondition(
+        "url_changed",
+        lambda driver: driver.current_url != from_url,
+        timeout or DEFAULT_TIMEOUTS["url_changed"],
+    )
+
+
+def element_visible(selector, name="element_visible", timeout=None):
+    """A visible element matches the CSS selector (e.g. a platform's app-ready marker)"""
+    return ReadinessCondition(
+        name,
+        lambda driver: bool(driver.execute_script(CREDENTIAL_SCRIPT, selector)),
+        timeout or DEFAULT_TIMEOUTS["credential_field"],
+    )
+
+
+def credential_field_present(selector=None, timeout=None):
+    """A visible username/password field is on the page"""
+    return element_visible(selector or CREDENTIAL_FIELD_SELECTOR, "credential_field", timeout)
+
+
+def dom_quiescent(quiet_ms=None, timeout=None):
+    """No DOM mutation observed for quiet_ms (MutationObserver based)"""
+    quiet_ms = quiet_ms or DOM_QUIET_MS
+    return ReadinessCondition(
+        "dom_quiescent",
+        lambda driver: (driver.execute_script(QUIET_SCRIPT) or {}).get("dom", 0) >= quiet_ms,
+        timeout or DEFAULT_TIMEOUTS["dom_quiescent"],
+    )
+
+
+def any_of(*conditions):
+    """Holds as soon as one of the conditions holds"""
+    def check(driver):
+        return any(_safe_check(condition, driver) for condition in conditions)
+    return ReadinessCondition(
+        " | ".join(condition.name for condition in conditions),
+        check,
+        max(condition.timeout for condition in conditions),
+    )
+
+
+def mark_activity(driver):
+    """Reset the network/DOM quiet clocks, e.g. right before clicking submit"""
+    try:
+        driver.execute_script(QUIET_SCRIPT)
+        driver.execute_script(MARK_ACTIVITY_SCRIPT)
+    except Exception:
+        pass
+
+
+def _safe_check(condition, driver):
+    try:
+        return bool(condition.check(driver))
+    except Exception:
+        # Navigation in progress, stale document, etc. - just poll again
+        return False
+
+
+def wait_for(driver, phase, conditions):
+    """Wait until every condition holds (or times out) and log the time spent"""
+    started = time.perf_counter()
+    pending = list(conditions)
+    results = {}
+
+    while pending:
+        elapsed = time.perf_counter() - started
+        for condition in list(pending):
+            if _safe_check(condition, driver):
+                results[condition.name] = {"met": True, "ms": elapsed * 1000}
+                pending.remove(condition)
+            elif elapsed >= condition.timeout:
+                results[condition.name] = {"met": False, "ms": elapsed * 1000}
+                pending.remove(condition)
+        if pending:
+            time.sleep(POLL_INTERVAL)
+
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    details = ", ".join(
+        f"{name} {'✅' if result['met'] else '⌛ timed out'} {result['ms']:.0f}ms"
+        for name, result in results.items()
+    )
+    print(f"⏱️ [{phase}] waited {elapsed_ms:.0f} ms ({details})")
+
+    return {
+        "phase": phase,
+        "elapsed_ms": elapsed_ms,
+        "met": all(result["met"] for result in results.values()),
+        "conditions": results,
+    }
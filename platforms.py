@@ -0,0 +1,202 @@
+"""
+ATS Platform Registry
+=====================
+Recognizes the applicant tracking system behind a URL (Workday, Taleo,
+Greenhouse, Lever, ASU Shibboleth) and supplies its known login selectors,
+SPA readiness signal, post-login success markers and application-form
+marker, so recognized sites skip the generic catalogue scan and page
+classification.
+
+Hosts are resolved through a precompiled suffix index (one dict lookup per
+host label) and a single compiled alternation of path rules; URLs that match
+nothing take the generic path. Every resolution and fallback is counted so
+the UI can show which path URLs took.
+"""
+
+import re
+import threading
+from collections import Counter
+from urllib.parse import urlparse
+
+from page_readiness import DEFAULT_TIMEOUTS
+
+
+class Platform:
+    """Known selectors and signals for one ATS / SSO login flow"""
+
+    def __init__(self, name, label, hosts=(), paths=(), needs_login=True, login_selectors=None,
+                 ready_selector=None, ready_timeout=None, success_selector=None, application_selector=None):
+        self.name = name
+        self.label = label
+        self.hosts = list(hosts)           # host suffixes ("myworkday.com" matches "asu.wd1.myworkday.com")
+        self.paths = list(paths)           # regexes matched against the URL path on any host
+        self.needs_login = needs_login
+        self.login_selectors = login_selectors or {}
+        self.ready_selector = ready_selector
+        self.ready_timeout = ready_timeout or DEFAULT_TIMEOUTS["credential_field"]
+        self.success_selector = success_selector
+        self.application_selector = application_selector  # present only on the application form (form fill)
+
+    @property
+    def login_field_selector(self):
+        """Selector for the platform's username/password fields"""
+        roles = ("username", "password")
+        return ", ".join(self.login_selectors[role] for role in roles if self.login_selectors.get(role))
+
+    def __repr__(self):
+        return f"Platform({self.name!r})"
+
+
+PLATFORMS = [
+    Platform(
+        "workday",
+        "Workday",
+        hosts=["myworkday.com", "myworkdayjobs.com", "myworkdaysite.com", "workday.com"],
+        login_selectors={
+            "username": "input[data-automation-id='email'], input[data-automation-id='userName']",
+            "password": "input[data-automation-id='password']",
+            "submit": "[data-automation-id='signInSubmitButton'], "
+                      "div[data-automation-id='click_filter'][aria-label='Sign In']",
+        },
+        # The app shell renders long before the sign-in form or posting content appears
+        ready_selector="input[data-automation-id='email'], input[data-automation-id='password'], "
+                       "[data-automation-id='jobPostingHeader'], [data-automation-id='applyManually'], "
+                       "[data-automation-id='pageHeaderTitleText']",
+        ready_timeout=20.0,
+        success_selector="[data-automation-id='utilityButtonSignOut'], [data-automation-id='accountSettingsButton'], "
+                         "[data-automation-id='navigationItem-Sign Out'], [data-automation-id='applyFlowPage']",
+        application_selector="[data-automation-id='applyFlowPage']",
+    ),
+    Platform(
+        "taleo",
+        "Taleo",
+        hosts=["taleo.net"],
+        paths=[r"^/careersection/"],
+        login_selectors={
+            "username": "input[id$='login-name1'], input[name$='loginName'], input[id$='loginField']",
+            "password": "input[id$='login-password'], input[type='password']",
+            "submit": "input[id$='login-defaultCmd'], button[id$='login-defaultCmd'], input[type='submit']",
+        },
+        ready_selector="input[id$='login-name1'], input[type='password'], #requisitionDescriptionInterface, "
+                       "form[name='ftlform']",
+        ready_timeout=12.0,
+        success_selector="a[id$='logoutLink'], [id$='signOutLink'], #et-ef-content-ftf-saveForLaterCmd",
+        application_selector="#et-ef-content-ftf-saveForLaterCmd",
+    ),
+    Platform(
+        "greenhouse",
+        "Greenhouse",
+        hosts=["greenhouse.io"],
+        needs_login=False,
+        ready_selector="#application-form, form#application_form, #application, #app_body",
+        application_selector="#application-form, form#application_form",
+    ),
+    Platform(
+        "lever",
+        "Lever",
+        hosts=["lever.co"],
+        needs_login=False,
+        ready_selector=".application-form, form#application-form, .posting-page, .posting-headline",
+        application_selector=".application-form, form#application-form",
+    ),
+    Platform(
+        "asu_shibboleth",
+        "ASU Shibboleth",
+        hosts=["weblogin.asu.edu", "shibboleth.asu.edu", "shibboleth2.asu.edu"],
+        paths=[r"^/idp/profile/", r"^/cas/login"],
+        login_selectors={
+            "username": "#username, input[name='j_username'], input[name='username']",
+            "password": "#password, input[name='j_password'], input[name='password']",
+            "submit": "button[type='submit'], input[type='submit'], input[name='submit']",
+        },
+        ready_selector="#username, input[name='j_username'], input[type='password']",
+        ready_timeout=8.0,
+    ),
+]
+
+# Unknown hosts whose URL suggests a login-gated application (used only for the same-browser hint)
+GENERIC_LOGIN_HINT = re.compile(r"careers|jobs|apply|application|asu\.edu", re.IGNORECASE)
+
+
+class PlatformRegistry:
+    """Resolves URLs to platforms and counts which path each URL took"""
+
+    def __init__(self, platforms=PLATFORMS):
+        self._by_name = {}
+        self._host_index = {}
+        self._path_rules = []
+        self._path_pattern = None
+        self._lock = threading.Lock()
+        self._paths_taken = Counter()
+        for platform in platforms:
+            self.register(platform)
+
+    def register(self, platform):
+        """Add a platform to the host index and path rules"""
+        self._by_name[platform.name] = platform
+        for host in platform.hosts:
+            self._host_index[host.lower()] = platform
+        for path in platform.paths:
+            self.add_path_rule(path, platform.name)
+
+    def add_path_rule(self, pattern, name):
+        """Resolve URLs whose path matches `pattern` to platform `name` on any host"""
+        self._path_rules.append((pattern, self._by_name[name]))
+        # One named group per rule, compiled into a single alternation
+        self._path_pattern = re.compile(
+            "|".join(f"(?P<p{i}>{rule})" for i, (rule, _) in enumerate(self._path_rules)),
+            re.IGNORECASE,
+        )
+
+    def get(self, name):
+        return self._by_name.get(name)
+
+    def resolve(self, url):
+        """The Platform for a URL, or None for the generic path"""
+        parsed = urlparse(url if "://" in url else "https://" + url)
+        host = (parsed.hostname or "").lower()
+
+        # Walk the host's suffixes: asu.wd1.myworkday.com, wd1.myworkday.com, myworkday.com, com
+        labels = host.split(".")
+        for i in range(len(labels)):
+            platform = self._host_index.get(".".join(labels[i:]))
+            if platform is not None:
+                return platform
+
+        if self._path_pattern is not None:
+            match = self._path_pattern.match(parsed.path or "/")
+            if match:
+                return self._path_rules[int(match.lastgroup[1:])][1]
+        return None
+
+    def needs_login_likely(self, url):
+        """Whether opening the URL will probably hit a login page"""
+        platform = self.resolve(url)
+        if platform is not None:
+            return platform.needs_login
+        return bool(GENERIC_LOGIN_HINT.search(url))
+
+    def note_path(self, path):
+        """Count a flow path: 'workday', 'workday→generic', 'generic', ..."""
+        with self._lock:
+            self._paths_taken[path] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._paths_taken)
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        paths = sorted(self.stats().items(), key=lambda item: -item[1])
+        text = " · ".join(f"{path}: {count}" for path, count in paths) or "no URLs yet"
+        return f"**Platform paths** — {text}"
+
+
+def path_label(platform, fell_back=False):
+    """Name of the path a URL took, for logs, spans and stats"""
+    if platform is None:
+        return "generic"
+    return f"{platform.name}→generic" if fell_back else platform.name
+
+
+REGISTRY = PlatformRegistry()
@@ -0,0 +1,305 @@
+"""
+Session Profile Manager
+=======================
+Gives every automated Chrome session its own user-data-dir and debugging
+port, so concurrent sessions never fight over a profile lock or a port.
+
+Session profiles are cloned from a warm template profile (the original
+ChromeAutomation directory: HTTP/code/shader caches, font lookup tables,
+preferences, saved cookies and passwords) so the first page of a new session
+is served from cache instead of a cold profile. Files are copied with
+reflinks (copy-on-write) where the filesystem supports them, otherwise byte
+for byte; they are never hardlinked, since Chrome rewrites cache files such
+as blockfile data_N in place and a shared link would leak one session's
+writes into the template and every other session. Debugging ports are
+picked from the free ephemeral ports. Session profiles are removed when
+their driver quits, leftovers on exit, and leftovers of crashed runs on the
+next start.
+"""
+
+import atexit
+import ctypes
+import os
+import shutil
+import socket
+import sys
+import tempfile
+import threading
+import time
+
+# Warm template every session profile is cloned from
+TEMPLATE_PROFILE = os.path.join(os.path.expanduser("~"), "AppData", "Local", "Temp", "ChromeAutomation")
+
+# Session profiles live here as <pid>-<n> (the pid lets a later run spot leftovers)
+SESSION_ROOT = os.path.join(tempfile.gettempdir(), "jobauto-sessions")
+
+# Pages loaded by `jobauto warm` to fill the template's HTTP cache
+WARM_URLS = [
+    "https://www.myworkday.com/asu/d/home.htmld",
+    "https://weblogin.asu.edu/cas/login",
+]
+
+# Not cloned: profile locks, crash dumps and the previous run's open tabs
+EXCLUDED = {
+    "SingletonLock", "SingletonSocket", "SingletonCookie", "lockfile", "LOCK",
+    "Crashpad", "Crash Reports", "BrowserMetrics", "DeferredBrowserMetrics",
+    "Sessions", "Current Session", "Current Tabs", "Last Session", "Last Tabs",
+}
+
+_FICLONE = 0x40049409  # Linux ioctl: share extents between two files (btrfs, xfs, ...)
+
+# Windows: OpenProcess access right and GetExitCodeProcess's value for a running process
+_PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+_STILL_ACTIVE = 259
+
+
+def free_port(exclude=()):
+    """A TCP port nothing is listening on (and not in `exclude`)"""
+    for _ in range(20):
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.bind(("127.0.0.1", 0))
+            port = sock.getsockname()[1]
+        if port not in exclude:
+            return port
+    raise RuntimeError("No free debugging port found")
+
+
+def _reflink(src, dst):
+    """Copy-on-write clone of one file; raises OSError where unsupported"""
+    if sys.platform == "darwin":
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) != 0:
+            raise OSError(ctypes.get_errno(), "clonefile failed")
+        return
+    if sys.platform.startswith("linux"):
+        import fcntl
+
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            try:
+                fcntl.ioctl(target.fileno(), _FICLONE, source.fileno())
+            except OSError:
+                target.close()
+                os.unlink(dst)
+                raise
+        shutil.copystat(src, dst)
+        return
+    raise OSError("reflinks are not supported on this platform")
+
+
+def _alive_windows(pid):
+    from ctypes import wintypes
+
+    kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+    kernel32.OpenProcess.restype = wintypes.HANDLE
+    handle = kernel32.OpenProcess(_PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+    if not handle:
+        # No such process; access denied means it exists but belongs to someone else
+        return ctypes.get_last_error() == 5  # ERROR_ACCESS_DENIED
+    try:
+        code = wintypes.DWORD()
+        if not kernel32.GetExitCodeProcess(handle, ctypes.byref(code)):
+            return True
+        return code.value == _STILL_ACTIVE
+    finally:
+        kernel32.CloseHandle(handle)
+
+
+def _alive(pid):
+    if pid == os.getpid():
+        return True
+    if os.name == "nt":
+        return _alive_windows(pid)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except OSError:
+        pass
+    return True
+
+
+def _remove(path, attempts=5):
+    """rmtree that waits out Chrome processes still releasing their files"""
+    for attempt in range(attempts):
+        try:
+            shutil.rmtree(path)
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError:
+            time.sleep(0.2 * (attempt + 1))
+    shutil.rmtree(path, ignore_errors=True)
+    return not os.path.exists(path)
+
+
+class ProfileSession:
+    """One cloned profile directory and its debugging port"""
+
+    def __init__(self, path, port):
+        self.path = path
+        self.port = port
+
+    def __repr__(self):
+        return f"ProfileSession({self.path!r}, port={self.port})"
+
+
+class ProfileManager:
+    """Clones session profiles from the template and cleans them up"""
+
+    def __init__(self, template=TEMPLATE_PROFILE, root=SESSION_ROOT):
+        self.template = template
+        self.root = root
+        self._lock = threading.Lock()
+        self._counter = 0
+        self._sessions = {}       # path -> ProfileSession
+        self._by_driver = {}      # id(driver) -> ProfileSession
+        self._reflinks = None     # None until the first clone finds out
+        self._swept = False
+        self._stats = {"clones": 0, "clone_seconds": 0.0, "reflink": 0, "copy": 0, "removed": 0}
+        atexit.register(self.cleanup)
+
+    # ------------------------------------------------------------------ clone
+
+    def _copy_file(self, src, dst):
+        if self._reflinks is not False:
+            try:
+                _reflink(src, dst)
+                self._reflinks = True
+                return "reflink"
+            except OSError:
+                self._reflinks = False
+        shutil.copy2(src, dst)
+        return "copy"
+
+    def _clone(self, target):
+        """Copy the template into target; returns {method: file count}"""
+        counts = {"reflink": 0, "copy": 0}
+        os.makedirs(target)
+        if not os.path.isdir(self.template):
+            return counts
+        for root, dirs, files in os.walk(self.template):
+            dirs[:] = [name for name in dirs if name not in EXCLUDED]
+            relative = os.path.relpath(root, self.template)
+            destination = os.path.normpath(os.path.join(target, relative))
+            os.makedirs(destination, exist_ok=True)
+            for name in files:
+                if name in EXCLUDED:
+                    continue
+                try:
+                    method = self._copy_file(os.path.join(root, name), os.path.join(destination, name))
+                    counts[method] += 1
+                except OSError as e:
+                    # Files held open by a running template browser are skipped, not fatal
+                    print(f"⚠️ Could not clone {os.path.join(relative, name)}: {e}")
+        return counts
+
+    def sweep_stale(self):
+        """Remove session profiles left behind by runs that no longer exist"""
+        if not os.path.isdir(self.root):
+            return 0
+        removed = 0
+        for name in os.listdir(self.root):
+            pid = name.split("-", 1)[0]
+            if pid.isdigit() and not _alive(int(pid)) and _remove(os.path.join(self.root, name)):
+                removed += 1
+        if removed:
+            print(f"🧹 Removed {removed} session profile(s) left by earlier runs")
+        return removed
+
+    def create(self):
+        """Clone a new session profile and pick its debugging port"""
+        with self._lock:
+            sweep = not self._swept
+            self._swept = True
+            self._counter += 1
+            path = os.path.join(self.root, f"{os.getpid()}-{self._counter}")
+            ports = {session.port for session in self._sessions.values()}
+        if sweep:
+            self.sweep_stale()
+
+        started = time.perf_counter()
+        counts = self._clone(path)
+        elapsed = time.perf_counter() - started
+        session = ProfileSession(path, free_port(exclude=ports))
+        with self._lock:
+            self._sessions[path] = session
+            self._stats["clones"] += 1
+            self._stats["clone_seconds"] += elapsed
+            for method, count in counts.items():
+                self._stats[method] += count
+        print(f"📁 Cloned session profile in {elapsed * 1000:.0f} ms "
+              f"({counts['reflink']} reflinked, {counts['copy']} copied), "
+              f"debugging port {session.port}")
+        return session
+
+    # ---------------------------------------------------------------- cleanup
+
+    def attach(self, driver, session):
+        """Tie a session profile to the driver launched on it"""
+        with self._lock:
+            self._by_driver[id(driver)] = session
+
+    def remove(self, session):
+        with self._lock:
+            if self._sessions.pop(session.path, None) is None:
+                return
+        if _remove(session.path):
+            with self._lock:
+                self._stats["removed"] += 1
+
+    def release(self, driver):
+        """Delete the profile of a driver that has quit"""
+        with self._lock:
+            session = self._by_driver.pop(id(driver), None)
+        if session is not None:
+            self.remove(session)
+
+    def cleanup(self):
+        """Delete every session profile this process created"""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._by_driver = {}
+        for session in sessions:
+            self.remove(session)
+
+    # ------------------------------------------------------------------ warm
+
+    def warm_template(self, urls=WARM_URLS, launcher=None):
+        """Load pages in a browser running on the template itself to fill its caches"""
+        from page_readiness import document_ready, network_idle, wait_for
+
+        if launcher is None:
+            from driver_pool import launch_driver
+
+            os.makedirs(self.template, exist_ok=True)
+            driver = launch_driver(profile=ProfileSession(self.template, free_port()))
+        else:
+            driver = launcher()
+        try:
+            for url in urls:
+                print(f"🔥 Warming template profile with {url}")
+                driver.get(url)
+                wait_for(driver, "navigation", [document_ready(), network_idle()])
+        finally:
+            driver.quit()
+
+    # ------------------------------------------------------------------ stats
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["active"] = len(self._sessions)
+        clones = stats["clones"]
+        stats["avg_clone_ms"] = stats["clone_seconds"] * 1000 / clones if clones else 0.0
+        return stats
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        s = self.stats()
+        return (f"**Session profiles** — active: {s['active']} · Cloned: {s['clones']} "
+                f"(avg {s['avg_clone_ms']:.0f} ms; files {s['reflink']} reflinked, {s['copy']} copied) · "
+                f"Removed: {s['removed']}")
+
+
+# Session profiles for every pooled browser
+PROFILES = ProfileManager()
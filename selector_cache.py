@@ -0,0 +1,163 @@
+"""
+Learned Selector Cache
+======================
+Remembers, per host and page fingerprint, which username/password/submit
+selectors worked, so the next visit can resolve them directly instead of
+scanning the whole selector catalogue.
+
+Entries are persisted to selector_cache.json, invalidated when they stop
+matching and aged out after MAX_AGE_DAYS without a successful login.
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+CACHE_PATH = "selector_cache.json"
+MAX_AGE_DAYS = 30
+
+
+def host_of(url):
+    """Lower-cased host of a URL ('' if it has none)"""
+    return (urlparse(url).hostname or "").lower()
+
+
+class SelectorCache:
+    """host -> fingerprint -> learned selectors, persisted as JSON"""
+
+    def __init__(self, path=CACHE_PATH, max_age_days=MAX_AGE_DAYS):
+        self.path = path
+        self.max_age = max_age_days * 24 * 3600
+        self._lock = threading.Lock()
+        self._entries = None
+        self._stats = {
+            "lookups": 0,
+            "hits": 0,
+            "misses": 0,
+            "invalidated": 0,
+            "saved_ms": 0.0,
+        }
+
+    # ------------------------------------------------------------ persistence
+
+    def _load(self):
+        """Load the cache file once (caller holds the lock)"""
+        if self._entries is not None:
+            return
+        self._entries = {}
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, "r", encoding="utf-8") as file:
+                self._entries = json.load(file)
+        except (OSError, ValueError) as e:
+            print(f"⚠️ Ignoring unreadable selector cache {self.path}: {e}")
+            self._entries = {}
+        self._prune()
+
+    def _prune(self):
+        """Drop entries not used successfully within max_age (caller holds the lock)"""
+        cutoff = time.time() - self.max_age
+        for host in list(self._entries):
+            fingerprints = self._entries[host]
+            for fingerprint in list(fingerprints):
+                if fingerprints[fingerprint].get("last_success", 0) < cutoff:
+                    del fingerprints[fingerprint]
+            if not fingerprints:
+                del self._entries[host]
+
+    def _save(self):
+        """Write the cache atomically (caller holds the lock)"""
+        temp_path = self.path + ".tmp"
+        try:
+            with open(temp_path, "w", encoding="utf-8") as file:
+                json.dump(self._entries, file, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as e:
+            print(f"⚠️ Could not save selector cache: {e}")
+
+    # ---------------------------------------------------------------- entries
+
+    def entries_for(self, host):
+        """{fingerprint: {username, password, submit}} learned for a host"""
+        with self._lock:
+            self._load()
+            return {
+                fingerprint: {role: entry.get(role) for role in ("username", "password", "submit")}
+                for fingerprint, entry in self._entries.get(host, {}).items()
+            }
+
+    def record(self, host, fingerprint, selectors, scan_ms):
+        """Remember the selectors that just produced a successful login"""
+        if not host or not fingerprint or not selectors.get("username") or not selectors.get("password"):
+            return
+        with self._lock:
+            self._load()
+            entry = self._entries.setdefault(host, {}).get(fingerprint, {})
+            entry.update({
+                "username": selectors.get("username"),
+                "password": selectors.get("password"),
+                "submit": selectors.get("submit"),
+                "last_success": time.time(),
+                "successes": entry.get("successes", 0) + 1,
+            })
+            # Keep the cost of the full scan this entry replaces, for "time saved"
+            if scan_ms:
+                entry["scan_ms"] = scan_ms
+            self._entries[host][fingerprint] = entry
+            self._prune()
+            self._save()
+
+    def invalidate(self, host, fingerprint):
+        """Forget an entry whose selectors no longer match the page"""
+        with self._lock:
+            self._load()
+            fingerprints = self._entries.get(host, {})
+            if fingerprints.pop(fingerprint, None) is None:
+                return
+            if not fingerprints:
+                self._entries.pop(host, None)
+            self._stats["invalidated"] += 1
+            self._save()
+        print(f"🗑️ Invalidated stale selector cache entry for {host} ({fingerprint})")
+
+    # ------------------------------------------------------------------ stats
+
+    def note_lookup(self, host, fingerprint, hit, lookup_ms):
+        """Count a lookup; on a hit credit the scan time it avoided"""
+        with self._lock:
+            self._stats["lookups"] += 1
+            if not hit:
+                self._stats["misses"] += 1
+                return 0.0
+            self._stats["hits"] += 1
+            scan_ms = self._entries.get(host, {}).get(fingerprint, {}).get("scan_ms", 0.0)
+            saved = max(scan_ms - lookup_ms, 0.0)
+            self._stats["saved_ms"] += saved
+            return saved
+
+    def stats(self):
+        with self._lock:
+            self._load()
+            stats = dict(self._stats)
+            stats["hosts"] = len(self._entries)
+            stats["entries"] = sum(len(fingerprints) for fingerprints in self._entries.values())
+        stats["hit_rate"] = stats["hits"] / stats["lookups"] if stats["lookups"] else 0.0
+        stats["avg_saved_ms"] = stats["saved_ms"] / stats["hits"] if stats["hits"] else 0.0
+        return stats
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        s = self.stats()
+        return (
+            f"**Selector cache** — {s['entries']} entr{'y' if s['entries'] == 1 else 'ies'} "
+            f"across {s['hosts']} host(s)\n\n"
+            f"Hit rate: {s['hit_rate']:.0%} ({s['hits']}/{s['lookups']}) · "
+            f"Avg time saved per login: {s['avg_saved_ms']:.0f} ms · Invalidated: {s['invalidated']}"
+        )
+
+
+# Shared cache used by the login flow
+SELECTOR_CACHE = SelectorCache()
@@ -0,0 +1,328 @@
+"""
+Session Snapshots
+=================
+Saves the browser's cookies and the landing page's localStorage after a
+verified successful login, encrypted on disk, and restores them into new
+sessions so repeat visits skip the login flow.
+
+Encryption uses Windows DPAPI (bound to the current Windows user) when
+available, otherwise Fernet from `cryptography`. The Fernet key is kept in
+the OS keyring (macOS Keychain, Secret Service/KWallet) through `keyring`;
+without a usable keyring backend it falls back to a snapshot.key file
+readable only by the current user (0600). An existing snapshot.key is moved
+into an empty keyring, but kept (and used) if the keyring already holds
+another key, since this directory's snapshots were written with it. The file
+sits next to the snapshots, so it protects them from other local users and
+from copies of the snapshot files alone, not from anyone who can read this
+user's files. With neither DPAPI nor cryptography installed, snapshots are
+kept in memory only and never written to disk.
+"""
+
+import base64
+import json
+import os
+import re
+import threading
+import time
+
+SNAPSHOT_DIR = "session_snapshots"
+SNAPSHOT_TTL = 8 * 3600  # seconds a snapshot is trusted before a full login is forced
+
+# Only these CDP Cookie fields are valid in Network.setCookies
+_COOKIE_FIELDS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+# Seeds localStorage for one origin before the page's own scripts run
+_LOCAL_STORAGE_SCRIPT = """
+(function (origin, items) {
+    if (location.origin !== origin) return;
+    try {
+        Object.keys(items).forEach(function (key) {
+            if (localStorage.getItem(key) === null) localStorage.setItem(key, items[key]);
+        });
+    } catch (e) {}
+})(%s, %s);
+"""
+
+
+# ---------------------------------------------------------------- encryption
+
+def _dpapi(data, protect):
+    """Encrypt/decrypt bytes with Windows DPAPI for the current user"""
+    import ctypes
+    from ctypes import wintypes
+
+    class DataBlob(ctypes.Structure):
+        _fields_ = [("cbData", wintypes.DWORD), ("pbData", ctypes.POINTER(ctypes.c_char))]
+
+    buffer = ctypes.create_string_buffer(data, len(data))
+    blob_in = DataBlob(len(data), ctypes.cast(buffer, ctypes.POINTER(ctypes.c_char)))
+    blob_out = DataBlob()
+
+    crypt32 = ctypes.windll.crypt32
+    if protect:
+        ok = crypt32.CryptProtectData(ctypes.byref(blob_in), ctypes.c_wchar_p("job-application-automation"),
+                                      None, None, None, 0, ctypes.byref(blob_out))
+    else:
+        ok = crypt32.CryptUnprotectData(ctypes.byref(blob_in), None, None, None, None, 0, ctypes.byref(blob_out))
+    if not ok:
+        raise ctypes.WinError()
+    try:
+        return ctypes.string_at(blob_out.pbData, blob_out.cbData)
+    finally:
+        ctypes.windll.kernel32.LocalFree(blob_out.pbData)
+
+
+KEYRING_SERVICE = "job-application-automation"
+KEYRING_USER = "session-snapshot-key"
+
+
+def _keyring():
+    """The keyring module if it is installed and has a real backend, else None"""
+    try:
+        import keyring
+        from keyring.backends import fail
+    except ImportError:
+        return None
+    try:
+        if isinstance(keyring.get_keyring(), fail.Keyring):
+            return None
+    except Exception:
+        return None
+    return keyring
+
+
+def _key_file(directory, new_key):
+    """Key from snapshot.key (created 0600), kept only for the current user"""
+    key_path = os.path.join(directory, "snapshot.key")
+    if not os.path.exists(key_path):
+        os.makedirs(directory, exist_ok=True)
+        fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as file:
+            file.write(new_key())
+    elif os.name != "nt":
+        os.chmod(key_path, 0o600)  # key files written before this check may be world-readable
+    with open(key_path, "rb") as file:
+        return file.read()
+
+
+def _snapshot_key(directory, new_key):
+    """Fernet key from the OS keyring, moving an existing snapshot.key there; else the key file"""
+    keyring = _keyring()
+    if keyring is None:
+        return _key_file(directory, new_key)
+    key_path = os.path.join(directory, "snapshot.key")
+    try:
+        key = keyring.get_password(KEYRING_SERVICE, KEYRING_USER)
+        if key is not None:
+            # The keyring key belongs to another snapshot directory: this one's snapshots need the file
+            return _key_file(directory, new_key) if os.path.exists(key_path) else key.encode()
+        migrate = os.path.exists(key_path)
+        key = _key_file(directory, new_key).decode() if migrate else new_key().decode()
+        keyring.set_password(KEYRING_SERVICE, KEYRING_USER, key)
+    except Exception as e:
+        print(f"⚠️ OS keyring unavailable ({e}) - keeping the snapshot key in {key_path}")
+        return _key_file(directory, new_key)
+    if migrate:
+        os.remove(key_path)  # only after its key is safely in the keyring
+    return key.encode()
+
+
+def _fernet(directory):
+    """Fernet cipher with a per-install key, or None if cryptography is not installed"""
+    try:
+        from cryptography.fernet import Fernet
+    except ImportError:
+        return None
+    return Fernet(_snapshot_key(directory, Fernet.generate_key))
+
+
+class _Cipher:
+    """Picks DPAPI on Windows, else Fernet, else none (memory-only snapshots)"""
+
+    def __init__(self, directory):
+        self.scheme = None
+        self._fernet = None
+        if os.name == "nt":
+            self.scheme = "dpapi"
+        else:
+            self._fernet = _fernet(directory)
+            if self._fernet is not None:
+                self.scheme = "fernet"
+
+    def encrypt(self, data):
+        if self.scheme == "dpapi":
+            return b"DPAPI1\n" + base64.b64encode(_dpapi(data, protect=True))
+        return b"FERNET1\n" + self._fernet.encrypt(data)
+
+    def decrypt(self, blob):
+        header, _, body = blob.partition(b"\n")
+        if header == b"DPAPI1" and self.scheme == "dpapi":
+            return _dpapi(base64.b64decode(body), protect=False)
+        if header == b"FERNET1" and self.scheme == "fernet":
+            return self._fernet.decrypt(body)
+        raise ValueError(f"snapshot encrypted with unsupported scheme {header.decode(errors='replace')!r}")
+
+
+# ------------------------------------------------------------------- store
+
+def _cookie_param(cookie):
+    """CDP Cookie -> CookieParam; session cookies (expires -1) get no expiry"""
+    param = {field: cookie[field] for field in _COOKIE_FIELDS if field in cookie}
+    if cookie.get("session") or param.get("expires", 0) <= 0:
+        param.pop("expires", None)
+    return param
+
+
+def _safe_name(host):
+    return re.sub(r"[^a-z0-9.-]", "_", host.lower())
+
+
+class SessionStore:
+    """Per-host encrypted cookie/localStorage snapshots"""
+
+    def __init__(self, directory=SNAPSHOT_DIR, ttl=SNAPSHOT_TTL):
+        self.directory = directory
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._memory = {}
+        self._cipher = None
+        self._stats = {"saved": 0, "restored": 0, "rejected": 0, "expired": 0}
+
+    def _get_cipher(self):
+        if self._cipher is None:
+            self._cipher = _Cipher(self.directory)
+            if self._cipher.scheme is None:
+                print("⚠️ No DPAPI or 'cryptography' package available - session snapshots stay in memory only")
+        return self._cipher
+
+    def _path(self, host):
+        return os.path.join(self.directory, _safe_name(host) + ".snapshot")
+
+    def save(self, host, driver):
+        """Snapshot cookies (all domains, so SSO realms come along) and the current origin's localStorage"""
+        try:
+            try:
+                cookies = driver.execute_cdp_cmd("Storage.getCookies", {})["cookies"]
+            except Exception:
+                cookies = driver.execute_cdp_cmd("Network.getAllCookies", {})["cookies"]
+            storage = driver.execute_script(
+                "var items = {};"
+                "for (var i = 0; i < localStorage.length; i++) {"
+                "  var key = localStorage.key(i); items[key] = localStorage.getItem(key);"
+                "}"
+                "return {origin: location.origin, items: items};"
+            ) or {}
+        except Exception as e:
+            print(f"⚠️ Could not snapshot session for {host}: {e}")
+            return False
+
+        snapshot = {
+            "host": host,
+            "created": time.time(),
+            "cookies": [_cookie_param(cookie) for cookie in cookies],
+            "local_storage": storage,
+        }
+
+        with self._lock:
+            self._memory[host] = snapshot
+            self._stats["saved"] += 1
+            cipher = self._get_cipher()
+            if cipher.scheme:
+                try:
+                    os.makedirs(self.directory, exist_ok=True)
+                    temp_path = self._path(host) + ".tmp"
+                    with open(temp_path, "wb") as file:
+                        file.write(cipher.encrypt(json.dumps(snapshot).encode("utf-8")))
+                    os.replace(temp_path, self._path(host))
+                except Exception as e:
+                    print(f"⚠️ Could not write session snapshot for {host}: {e}")
+
+        print(f"💾 Saved session snapshot for {host} ({len(snapshot['cookies'])} cookies, "
+              f"{len(storage.get('items') or {})} localStorage items)")
+        return True
+
+    def load(self, host):
+        """Unexpired snapshot for a host, or None"""
+        with self._lock:
+            snapshot = self._memory.get(host)
+            path = self._path(host)
+            if snapshot is None and os.path.exists(path):
+                try:
+                    cipher = self._get_cipher()
+                    with open(path, "rb") as file:
+                        snapshot = json.loads(cipher.decrypt(file.read()).decode("utf-8"))
+                    self._memory[host] = snapshot
+                except Exception as e:
+                    print(f"⚠️ Ignoring unreadable session snapshot for {host}: {e}")
+                    return None
+
+            if snapshot is None:
+                return None
+            if time.time() - snapshot.get("created", 0) > self.ttl:
+                self._stats["expired"] += 1
+                self._discard_locked(host)
+                print(f"⌛ Session snapshot for {host} expired")
+                return None
+            return snapshot
+
+    def _discard_locked(self, host):
+        self._memory.pop(host, None)
+        try:
+            os.remove(self._path(host))
+        except OSError:
+            pass
+
+    def discard(self, host, rejected=False):
+        """Drop a snapshot, e.g. because the site bounced the restored session to a login page"""
+        with self._lock:
+            if rejected:
+                self._stats["rejected"] += 1
+            self._discard_locked(host)
+
+    def note_restored(self):
+        with self._lock:
+            self._stats["restored"] += 1
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats)
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        s = self.stats()
+        return (
+            f"**Session snapshots** — restored: {s['restored']} · saved: {s['saved']} · "
+            f"rejected: {s['rejected']} · expired: {s['expired']}"
+        )
+
+
+def restore_session(driver, snapshot):
+    """Load a snapshot into the browser before navigating.
+
+    Returns the id of the injected localStorage script so the caller can
+    remove it once the target page has loaded (or None).
+    """
+    cookies = snapshot.get("cookies") or []
+    if cookies:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setCookies", {"cookies": cookies})
+
+    storage = snapshot.get("local_storage") or {}
+    if storage.get("origin") and storage.get("items"):
+        source = _LOCAL_STORAGE_SCRIPT % (json.dumps(storage["origin"]), json.dumps(storage["items"]))
+        result = driver.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument", {"source": source})
+        return result.get("identifier")
+    return None
+
+
+def clear_restore_script(driver, identifier):
+    """Remove the localStorage seeding script added by restore_session"""
+    if identifier:
+        try:
+            driver.execute_cdp_cmd("Page.removeScriptToEvaluateOnNewDocument", {"identifier": identifier})
+        except Exception:
+            pass
+
+
+# Shared store used by the auto-login flow
+SESSION_STORE = SessionStore()
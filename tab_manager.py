@@ -0,0 +1,303 @@
+"""
+Multi-Tab Sessions
+==================
+Opens each URL as a new tab in a pooled automated browser instead of
+navigating away from (or launching a browser for) the previous posting.
+
+Per browser it tracks the tabs it opened and the login realms that browser
+is already signed into, so a second posting on the same SSO realm reuses
+the login (cookies are shared by every tab) after a quick check instead of
+running detection again. A finished tab is where the user goes on to fill
+in the application, so a tab the user clicked or typed in is never closed
+for them and a browser holding tabs is not evicted from the pool. Each
+browser holds at most MAX_TABS_PER_BROWSER tabs: when it is full, tabs the
+user never touched are closed to make room (failed flows at once, others
+after TAB_IDLE_TIMEOUT), and if none can go the new URL is refused rather
+than opened as one tab too many. Browser RSS is sampled per open tab so the
+UI can show memory per opened URL.
+"""
+
+import ipaddress
+import threading
+import time
+import weakref
+from collections import deque
+from urllib.parse import urlparse
+
+from platforms import REGISTRY
+
+MAX_TABS_PER_BROWSER = 8
+TAB_IDLE_TIMEOUT = 10 * 60  # seconds before an untouched finished tab may be closed for a new one
+
+# Marks the tab once the user clicks, scrolls or types in it (sessionStorage survives same-site navigation)
+_TOUCH_SCRIPT = """
+if (!window.__jobautoTouch) {
+    window.__jobautoTouch = true;
+    const mark = (e) => { if (e.isTrusted) sessionStorage.setItem('jobauto-touched', '1'); };
+    for (const type of ['pointerdown', 'keydown', 'wheel']) window.addEventListener(type, mark, true);
+}
+"""
+_TOUCHED_SCRIPT = "return sessionStorage.getItem('jobauto-touched') === '1';"
+
+# What a freshly launched chromedriver window shows before the first navigation
+BLANK_URLS = ("data:,", "about:blank", "chrome://newtab/", "chrome://new-tab-page/")
+
+# Second-level labels under which registrable domains have three labels (jobs.ac.uk)
+_SECOND_LEVEL = {"ac", "co", "com", "edu", "gov", "net", "org"}
+
+MEMORY_SAMPLES = 50
+
+
+def _is_ip(host):
+    try:
+        ipaddress.ip_address(host)
+        return True
+    except ValueError:
+        return False
+
+
+def login_realm(url):
+    """Where a login for this URL is valid: the ATS tenant host or the registrable domain.
+
+    Sites of one organization share an SSO realm (canvas.asu.edu and
+    weblogin.asu.edu -> 'asu.edu'); multi-tenant ATS hosts keep the full host
+    so one tenant's login is not assumed for another, and so do IP literals
+    and single-label hosts (localhost).
+    """
+    host = (urlparse(url if "://" in url else "https://" + url).hostname or "").lower()
+    if "." not in host or _is_ip(host):
+        return host
+    platform = REGISTRY.resolve(url)
+    if platform is not None and platform.name in ("workday", "taleo"):
+        return host
+    labels = host.split(".")
+    keep = 3 if len(labels) >= 3 and labels[-2] in _SECOND_LEVEL and len(labels[-1]) == 2 else 2
+    return ".".join(labels[-keep:])
+
+
+class TabLimitReached(RuntimeError):
+    """The browser is full of tabs the user is still working in"""
+
+
+class _Browser:
+    """Tabs and signed-in realms of one automated browser"""
+
+    def __init__(self):
+        # handle -> {"url", "opened", "finished", "ok", "final_url", "touched"} (finished: time or None)
+        self.tabs = {}
+        self.realms = set()
+
+
+class TabManager:
+    """Opens and tracks tabs in pooled browsers, at most max_tabs per browser"""
+
+    def __init__(self, max_tabs=MAX_TABS_PER_BROWSER, idle_timeout=TAB_IDLE_TIMEOUT):
+        self.max_tabs = max(max_tabs, 1)
+        self.idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        # Entries go away with the driver object, however the pool disposes of it
+        self._browsers = weakref.WeakKeyDictionary()
+        self._per_url_rss = deque(maxlen=MEMORY_SAMPLES)
+        self._stats = {
+            "opened": 0,
+            "closed": 0,
+            "refused": 0,
+            "logins_reused": 0,
+            "logins_rejected": 0,
+        }
+
+    def _browser(self, driver):
+        with self._lock:
+            browser = self._browsers.get(driver)
+            if browser is None:
+                browser = self._browsers[driver] = _Browser()
+            return browser
+
+    # ------------------------------------------------------------------- tabs
+
+    def _prune(self, browser, handles):
+        """Forget tabs the user closed by hand (caller holds the lock)"""
+        for handle in list(browser.tabs):
+            if handle not in handles:
+                del browser.tabs[handle]
+
+    def _closable(self, tab, now):
+        """Whether a tab may be closed for a new one, unless the user touched it (caller holds the lock)"""
+        if tab["finished"] is None or tab["touched"]:
+            return False
+        return not tab["ok"] or now - tab["finished"] > self.idle_timeout
+
+    def _touched(self, driver, tab):
+        """Whether the user clicked, typed in or navigated the current tab (True when unsure)"""
+        try:
+            return driver.current_url != tab["final_url"] or bool(driver.execute_script(_TOUCHED_SCRIPT))
+        except Exception:
+            return True
+
+    def _make_room(self, driver, browser):
+        """Close untouched tabs, failed flows first and then the oldest, until one more fits"""
+        with self._lock:
+            now = time.monotonic()
+            candidates = sorted((tab["ok"], tab["finished"], handle)
+                                for handle, tab in browser.tabs.items() if self._closable(tab, now))
+        for _, _, handle in candidates:
+            with self._lock:
+                if len(browser.tabs) < self.max_tabs:
+                    return
+                tab = browser.tabs.get(handle)
+            if tab is None:
+                continue
+            driver.switch_to.window(handle)
+            if self._touched(driver, tab):
+                with self._lock:
+                    tab["touched"] = True
+                continue
+            if len(driver.window_handles) > 1:
+                driver.close()
+            else:
+                driver.get("about:blank")  # closing the last window would end the browser
+            with self._lock:
+                browser.tabs.pop(handle, None)
+                self._stats["closed"] += 1
+            print(f"🗂️ Closed untouched tab of {tab['url']} to make room")
+
+    def open_tab(self, driver, url):
+        """Switch the driver to a fresh tab for url; returns its handle.
+
+        Raises TabLimitReached if the browser is full and no tab can be closed.
+        """
+        browser = self._browser(driver)
+        with self._lock:
+            self._prune(browser, driver.window_handles)
+            full = len(browser.tabs) >= self.max_tabs
+        if full:
+            self._make_room(driver, browser)
+        handles = driver.window_handles
+        with self._lock:
+            self._prune(browser, handles)
+            tracked = len(browser.tabs)
+            if tracked >= self.max_tabs:
+                self._stats["refused"] += 1
+        if tracked >= self.max_tabs:
+            raise TabLimitReached(f"This browser already holds {tracked} tab(s) you are working in; "
+                                  f"close the applications you are done with and try again")
+        # The current window may be one the user just closed
+        driver.switch_to.window(handles[-1])
+
+        # A new browser's only window is still blank: use it instead of adding a tab
+        handle = None
+        if len(handles) == 1 and handles[0] not in browser.tabs and driver.current_url in BLANK_URLS:
+            handle = handles[0]
+        if handle is None:
+            driver.switch_to.new_window("tab")
+            handle = driver.current_window_handle
+
+        with self._lock:
+            browser.tabs[handle] = {"url": url, "opened": time.monotonic(), "finished": None,
+                                    "ok": None, "final_url": None, "touched": False}
+            self._stats["opened"] += 1
+        return handle
+
+    def finish(self, driver, handle, ok=True):
+        """Mark a tab's flow as done (ok=False: it failed); the driver must still be on the tab.
+
+        The tab stays open, and from now on notices when the user works in it.
+        """
+        try:
+            final_url = driver.current_url
+            driver.execute_script(_TOUCH_SCRIPT)
+        except Exception:
+            final_url = None
+        with self._lock:
+            browser = self._browsers.get(driver)
+            tab = browser.tabs.get(handle) if browser else None
+            if tab is not None:
+                tab.update(finished=time.monotonic(), ok=ok, final_url=final_url)
+
+    def open_tabs(self, driver):
+        with self._lock:
+            browser = self._browsers.get(driver)
+            return len(browser.tabs) if browser else 0
+
+    def has_room(self, driver):
+        """Whether a new tab fits, counting tabs that may be closed for it"""
+        with self._lock:
+            browser = self._browsers.get(driver)
+            if browser is None:
+                return True
+            now = time.monotonic()
+            closable = sum(self._closable(tab, now) for tab in browser.tabs.values())
+            return len(browser.tabs) - closable < self.max_tabs
+
+    def holds_tabs(self, driver):
+        """Whether the user still has tabs of ours open in this browser (False if it is gone)"""
+        try:
+            handles = driver.window_handles
+        except Exception:
+            return False
+        with self._lock:
+            browser = self._browsers.get(driver)
+            if browser is None:
+                return False
+            self._prune(browser, handles)
+            return bool(browser.tabs)
+
+    # ----------------------------------------------------------------- logins
+
+    def is_logged_in(self, driver, realm):
+        """Whether this browser already signed into the realm (in any tab)"""
+        with self._lock:
+            browser = self._browsers.get(driver)
+            return bool(browser and realm in browser.realms)
+
+    def prefer(self, realm):
+        """Pool rank: signed into the realm with room for a tab, then any browser with room"""
+        return lambda driver: self.has_room(driver) * (1 + self.is_logged_in(driver, realm))
+
+    def note_login(self, driver, realm):
+        self._browser(driver).realms.add(realm)
+
+    def note_reused(self, driver, realm, accepted):
+        """Count a realm login reuse; a rejected one is forgotten so the next tab logs in"""
+        browser = self._browser(driver)
+        with self._lock:
+            if accepted:
+                self._stats["logins_reused"] += 1
+            else:
+                self._stats["logins_rejected"] += 1
+                browser.realms.discard(realm)
+
+    # ----------------------------------------------------------------- memory
+
+    def record_memory(self, driver, rss_bytes):
+        """Sample browser RSS divided by the tabs it holds"""
+        tabs = self.open_tabs(driver)
+        if rss_bytes and tabs:
+            with self._lock:
+                self._per_url_rss.append(rss_bytes / tabs)
+
+    # ------------------------------------------------------------------ stats
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            browsers = list(self._browsers.values())
+            stats["browsers"] = len(browsers)
+            stats["open_tabs"] = sum(len(browser.tabs) for browser in browsers)
+            samples = list(self._per_url_rss)
+        stats["rss_per_url_mb"] = sum(samples) / len(samples) / (1024 * 1024) if samples else None
+        return stats
+
+    def format_stats(self):
+        """Markdown summary for the UI"""
+        s = self.stats()
+        rss = f"{s['rss_per_url_mb']:.0f} MB" if s["rss_per_url_mb"] is not None else "n/a"
+        return (
+            f"**Tabs** — open: {s['open_tabs']} in {s['browsers']} browser(s) (max {self.max_tabs} each) · "
+            f"Opened: {s['opened']} · Closed untouched: {s['closed']} · Refused when full: {s['refused']} · "
+            f"Logins reused: {s['logins_reused']} (rejected {s['logins_rejected']}) · RSS per open URL: {rss}"
+        )
+
+
+# Shared tab bookkeeping for the pooled browsers
+TABS = TabManager()
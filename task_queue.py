@@ -0,0 +1,74 @@
+"""
+Browser Task Queue
+==================
+Bounded thread pool that runs blocking Selenium work off the Gradio event
+loop, and keeps track of how many tasks are waiting and for how long.
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+# Recent queue wait times kept for the average shown in the UI
+WAIT_SAMPLES = 50
+
+
+class BrowserTaskQueue:
+    """ThreadPoolExecutor wrapper that reports queue depth and wait time"""
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="browser")
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._running = 0
+        self._waits = deque(maxlen=WAIT_SAMPLES)
+
+    def submit(self, fn, *args, **kwargs):
+        """Queue fn; returns (future, position) where position 0 means it starts right away"""
+        submitted = time.perf_counter()
+        with self._lock:
+            position = max(self._queued + self._running - self.max_workers + 1, 0)
+            self._queued += 1
+
+        def run():
+            waited = time.perf_counter() - submitted
+            with self._lock:
+                self._queued -= 1
+                self._running += 1
+                self._waits.append(waited)
+            try:
+                return fn(waited, *args, **kwargs)
+            finally:
+                with self._lock:
+                    self._running -= 1
+
+        future = self._executor.submit(run)
+        future.add_done_callback(self._forget_cancelled)
+        return future, position
+
+    def _forget_cancelled(self, future):
+        # A task cancelled before it started never ran run(), so it is still counted as waiting
+        if future.cancelled():
+            with self._lock:
+                self._queued -= 1
+
+    def stats(self):
+        with self._lock:
+            waits = list(self._waits)
+            return {
+                "queued": self._queued,
+                "running": self._running,
+                "max_workers": self.max_workers,
+                "avg_wait_seconds": sum(waits) / len(waits) if waits else 0.0,
+            }
+
+    def format_stats(self):
+        """One-line queue summary for status messages"""
+        s = self.stats()
+        return (f"📥 Browser queue: {s['running']}/{s['max_workers']} running, {s['queued']} waiting "
+                f"(avg wait {s['avg_wait_seconds']:.1f}s)")
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,52 @@
+import pytest
+
+from batch_runner import looks_like_url, parse_urls
+
+
+@pytest.mark.parametrize("token", [
+    "https://example.com/jobs/1",
+    "example.com",
+    "localhost:8000/apply",
+    "example.com:8443/x",
+    "https://example.com?id=1",
+    "https://example.com#apply",
+    "http://10.0.0.1/a",
+    "http://[::1]:8080/",
+    "asu.wd1.myworkdayjobs.com/en-US/ASUCareers",
+])
+def test_accepts_urls(token):
+    assert looks_like_url(token)
+
+
+@pytest.mark.parametrize("token", [
+    "",
+    "apply",
+    "e.g.",
+    "me@example.com",
+    "ftp://example.com/file",
+    "example.com:99999/x",
+    "example.com:port/x",
+])
+def test_rejects_non_urls(token):
+    assert not looks_like_url(token)
+
+
+def test_parse_urls_skips_comments_and_splits_separators():
+    text = "# saved postings\nexample.com/a, example.com/b; example.com/c\n\nnot a url"
+    assert parse_urls(text) == ["example.com/a", "example.com/b", "example.com/c"]
+
+
+def test_parse_urls_dedupes_by_canonical_url():
+    text = "\n".join([
+        "https://example.com/jobs/1?utm_source=linkedin",
+        "https://www.example.com/jobs/1#apply",
+        "example.com/jobs/2",
+    ])
+    assert parse_urls(text) == ["https://example.com/jobs/1?utm_source=linkedin", "example.com/jobs/2"]
+
+
+def test_parse_urls_reads_csv_cells(tmp_path):
+    path = tmp_path / "postings.csv"
+    path.write_text('title,url\nEngineer,"localhost:8000/apply"\nAnalyst,https://example.com?id=1\n',
+                    encoding="utf-8")
+    assert parse_urls("", str(path)) == ["localhost:8000/apply", "https://example.com?id=1"]
@@ -0,0 +1,53 @@
+import pytest
+
+from history_store import canonical_url
+
+
+@pytest.mark.parametrize("url, expected", [
+    # Tracking parameters and fragments go, the rest is sorted
+    ("https://www.Example.com/jobs/1?utm_source=x&b=2&a=1#frag", "https://example.com/jobs/1?a=1&b=2"),
+    ("example.com/jobs/1?a=1&b=2", "https://example.com/jobs/1?a=1&b=2"),
+    ("https://boards.greenhouse.io/airbnb/jobs/123?gh_jid=123&gh_src=abc",
+     "https://boards.greenhouse.io/airbnb/jobs/123?gh_jid=123"),
+    ("https://example.com//a//b/", "https://example.com/a/b"),
+    ("https://example.com/", "https://example.com/"),
+])
+def test_canonical_url(url, expected):
+    assert canonical_url(url) == expected
+
+
+def test_workday_external_variants_share_one_key():
+    urls = [
+        "https://asu.wd1.myworkdayjobs.com/en-US/ASUCareers/job/Tempe/Engineer_JR-12345?source=LinkedIn",
+        "https://asu.wd1.myworkdayjobs.com/ASUCareers/job/Tempe-AZ/Engineer_JR-12345/apply",
+    ]
+    assert {canonical_url(url) for url in urls} == {"https://asu.wd1.myworkdayjobs.com/ASUCareers/job/JR-12345"}
+
+
+def test_workday_internal_urls_reduce_to_tenant_and_posting_id():
+    job = "62b26821e81c100205d995488e240000"
+    urls = [
+        f"https://www.myworkday.com/asu/d/wday/vps/INTERNAL_CAREER_SITE_FOR_Students/apply/{job}.htmld",
+        f"https://www.myworkday.com/asu/d/inst/1$9925/9925${job}.htmld",
+    ]
+    assert {canonical_url(url) for url in urls} == {f"https://www.myworkday.com/asu/job/{job}"}
+
+
+def test_different_postings_stay_distinct():
+    assert canonical_url("https://example.com/jobs/1") != canonical_url("https://example.com/jobs/2")
+    assert canonical_url("https://example.com/jobs?id=1") != canonical_url("https://example.com/jobs?id=2")
+
+
+def test_search_returns_host_and_url_matches(tmp_path):
+    from history_store import HistoryStore
+
+    history = HistoryStore(str(tmp_path / "history.db"))
+    history.record("https://asu.wd1.myworkdayjobs.com/ASUCareers/job/Tempe/Engineer_JR-1", "open", "opened", "ok", 1)
+    history.record("https://www.myworkday.com/asu/d/home.htmld", "open", "opened", "ok", 1)
+    history.record("https://example.com/100%_remote", "open", "opened", "ok", 1)
+
+    assert history.search("asu")[1] == 2
+    assert [row["host"] for row in history.search("host:asu")[0]] == ["asu.wd1.myworkdayjobs.com"]
+    assert history.search("100%")[1] == 1
+    assert history.search("0%_r")[1] == 1
+    assert history.search("zzz")[1] == 0
@@ -0,0 +1,55 @@
+import datetime
+
+import pytest
+
+from job_crawler import _posted_date, parse_source
+
+
+@pytest.mark.parametrize("url, key, api", [
+    ("https://boards.greenhouse.io/airbnb", "greenhouse:airbnb",
+     "https://boards-api.greenhouse.io/v1/boards/airbnb/jobs"),
+    ("https://boards.greenhouse.io/embed/job_board?for=stripe", "greenhouse:stripe",
+     "https://boards-api.greenhouse.io/v1/boards/stripe/jobs"),
+    ("https://jobs.lever.co/palantir/abc", "lever:palantir", "https://api.lever.co/v0/postings/palantir?mode=json"),
+    ("https://jobs.eu.lever.co/acme", "lever:acme", "https://api.eu.lever.co/v0/postings/acme?mode=json"),
+    ("https://asu.wd1.myworkdayjobs.com/en-US/ASUCareers", "workday:asu/ASUCareers",
+     "https://asu.wd1.myworkdayjobs.com/wday/cxs/asu/ASUCareers"),
+    ("asu.wd1.myworkdayjobs.com/ASUCareers/job/Tempe/Engineer_JR-1", "workday:asu/ASUCareers",
+     "https://asu.wd1.myworkdayjobs.com/wday/cxs/asu/ASUCareers"),
+    ("https://wd5.myworkdaysite.com/recruiting/acme/External/job/x", "workday:acme/External",
+     "https://wd5.myworkdaysite.com/wday/cxs/acme/External"),
+])
+def test_parse_source(url, key, api):
+    source = parse_source(url)
+    assert (source.key, source.api) == (key, api)
+
+
+def test_workday_site_url_keeps_the_recruiting_prefix():
+    source = parse_source("https://wd5.myworkdaysite.com/recruiting/acme/External")
+    assert source.site_url == "https://wd5.myworkdaysite.com/recruiting/acme/External"
+
+
+@pytest.mark.parametrize("url", [
+    "https://boards.greenhouse.io/embed",
+    "https://jobs.lever.co/",
+    "https://asu.wd1.myworkdayjobs.com/",
+    "https://example.com/jobs",
+])
+def test_parse_source_unsupported(url):
+    assert parse_source(url) is None
+
+
+@pytest.mark.parametrize("text, days", [
+    ("Posted Today", 0),
+    ("Posted Yesterday", 1),
+    ("Posted 3 Days Ago", 3),
+    ("Posted 30+ Days Ago", 30),
+])
+def test_posted_date(text, days):
+    today = datetime.date(2026, 10, 18)
+    assert _posted_date(text, today) == (today - datetime.timedelta(days=days)).isoformat()
+
+
+def test_posted_date_unknown():
+    assert _posted_date("Closing soon") is None
+    assert _posted_date(None) is None
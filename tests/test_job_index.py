@@ -0,0 +1,37 @@
+from job_index import JobIndex, fts_query
+
+
+def test_fts_query_quotes_every_word():
+    assert fts_query("senior engineer") == '"senior" "engineer"'
+
+
+def test_fts_query_drops_query_syntax():
+    assert fts_query('C++ "senior" OR NEAR(x)') == '"C" "senior" "OR" "NEAR" "x"'
+    assert fts_query('a"b') == '"a" "b"'
+
+
+def test_fts_query_empty():
+    assert fts_query("") is None
+    assert fts_query(None) is None
+    assert fts_query("  ,, -- ") is None
+
+
+def test_fts_query_column():
+    assert fts_query("New York", "location") == 'location : ("New" "York")'
+
+
+def test_search_by_keyword_location_and_date(tmp_path):
+    index = JobIndex(str(tmp_path / "jobs.db"))
+    base = {"source": "greenhouse:acme", "platform": "greenhouse", "company": "Acme", "url": "https://x"}
+    index.upsert([
+        {**base, "id": "1", "title": "Senior Engineer", "location": "New York", "posted_at": "2026-10-10"},
+        {**base, "id": "2", "title": "Engineer", "location": "Remote", "posted_at": "2026-09-01"},
+        {**base, "id": "3", "title": "Analyst", "location": "New York", "posted_at": None},
+    ])
+    assert sorted(p["id"] for p in index.search("engineer")) == ["1", "2"]
+    assert [p["id"] for p in index.search("engineer", "new york")] == ["1"]
+    # Postings without a date are kept by a date filter
+    assert sorted(p["id"] for p in index.search(posted_since="2026-10-01")) == ["1", "3"]
+    assert index.search('"unbalanced') == []  # stray quotes never reach FTS5
+    index.close_missing("greenhouse:acme", ["1", "3"])
+    assert [p["id"] for p in index.search("engineer")] == ["1"]
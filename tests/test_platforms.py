@@ -0,0 +1,39 @@
+import pytest
+
+from platforms import PLATFORMS, Platform, PlatformRegistry
+
+
+@pytest.fixture
+def registry():
+    return PlatformRegistry(PLATFORMS)
+
+
+@pytest.mark.parametrize("url, name", [
+    ("https://asu.wd1.myworkday.com/x", "workday"),
+    ("https://www.myworkday.com/asu/d/home.htmld", "workday"),
+    ("asu.wd1.myworkdayjobs.com/ASUCareers", "workday"),
+    ("https://boards.greenhouse.io/airbnb", "greenhouse"),
+    ("https://jobs.eu.lever.co/acme", "lever"),
+    ("https://weblogin.asu.edu/cas/login", "asu_shibboleth"),
+    # Path rules apply on any host
+    ("https://careers.acme.com/careersection/2/jobdetail.ftl", "taleo"),
+    ("https://sso.example.edu/idp/profile/SAML2/Redirect/SSO", "asu_shibboleth"),
+])
+def test_resolve(registry, url, name):
+    assert registry.resolve(url).name == name
+
+
+@pytest.mark.parametrize("url", [
+    "https://example.com",
+    "https://evilgreenhouse.io/x",        # a suffix match must fall on a label boundary
+    "https://example.com/jobs/careersection/2",  # path rules are anchored
+    "",
+])
+def test_resolve_unknown(registry, url):
+    assert registry.resolve(url) is None
+
+
+def test_added_path_rule(registry):
+    registry.register(Platform("icims", "iCIMS", paths=[r"^/jobs/\d+/[^/]+/job"]))
+    assert registry.resolve("https://careers-acme.icims.com/jobs/1234/engineer/job").name == "icims"
+    assert registry.resolve("https://careers.acme.com/careersection/2/x").name == "taleo"
@@ -0,0 +1,111 @@
+import pytest
+
+from tab_manager import TabLimitReached, TabManager, login_realm
+
+
+@pytest.mark.parametrize("url, realm", [
+    ("https://canvas.asu.edu/courses", "asu.edu"),
+    ("https://weblogin.asu.edu/cas/login", "asu.edu"),
+    ("example.com/jobs", "example.com"),
+    ("https://www.jobs.ac.uk/job/1", "jobs.ac.uk"),
+    # Multi-tenant ATS hosts keep the tenant
+    ("https://asu.wd1.myworkdayjobs.com/ASUCareers", "asu.wd1.myworkdayjobs.com"),
+    ("https://acme.taleo.net/careersection/2/jobdetail.ftl", "acme.taleo.net"),
+    # IP literals and single-label hosts are never split into labels
+    ("http://127.0.0.1:8000/apply", "127.0.0.1"),
+    ("http://10.0.0.1/apply", "10.0.0.1"),
+    ("http://[::1]:8080/", "::1"),
+    ("localhost:8000/apply", "localhost"),
+])
+def test_login_realm(url, realm):
+    assert login_realm(url) == realm
+
+
+def test_ip_hosts_do_not_share_a_realm():
+    assert login_realm("http://127.0.0.1/") != login_realm("http://10.0.0.1/")
+
+
+class FakeDriver:
+    """Just enough of a WebDriver for tab bookkeeping; touched tabs report the user's marker"""
+
+    def __init__(self):
+        self.windows = {"w0": "data:,"}
+        self.current = "w0"
+        self.touched = set()
+        self.switch_to = self
+        self._next = 1
+
+    @property
+    def window_handles(self):
+        return list(self.windows)
+
+    @property
+    def current_window_handle(self):
+        return self.current
+
+    @property
+    def current_url(self):
+        return self.windows[self.current]
+
+    def window(self, handle):
+        self.current = handle
+
+    def new_window(self, kind):
+        self.current = f"w{self._next}"
+        self._next += 1
+        self.windows[self.current] = "about:blank"
+
+    def get(self, url):
+        self.windows[self.current] = url
+
+    def close(self):
+        del self.windows[self.current]
+
+    def execute_script(self, script):
+        return self.current in self.touched
+
+
+def _open(tabs, driver, url, ok=True):
+    handle = tabs.open_tab(driver, url)
+    driver.get(url)
+    tabs.finish(driver, handle, ok=ok)
+    return handle
+
+
+def test_failed_untouched_tab_is_closed_for_a_new_one():
+    tabs, driver = TabManager(max_tabs=2), FakeDriver()
+    _open(tabs, driver, "https://a.example/1")
+    failed = _open(tabs, driver, "https://b.example/1", ok=False)
+    assert tabs.has_room(driver)  # the failed tab counts as room
+
+    _open(tabs, driver, "https://c.example/1")
+    assert failed not in driver.windows
+    assert tabs.open_tabs(driver) == 2
+    assert tabs.stats()["closed"] == 1
+
+
+def test_full_browser_of_touched_tabs_refuses_a_new_tab():
+    tabs, driver = TabManager(max_tabs=2, idle_timeout=0), FakeDriver()
+    first = _open(tabs, driver, "https://a.example/1")
+    second = _open(tabs, driver, "https://b.example/1", ok=False)
+    driver.touched.add(first)
+    driver.windows[second] = "https://b.example/login?manual=1"  # the user navigated on
+
+    with pytest.raises(TabLimitReached):
+        tabs.open_tab(driver, "https://c.example/1")
+    assert set(driver.windows) == {first, second}
+    assert tabs.stats()["refused"] == 1
+    assert not tabs.has_room(driver)
+
+
+def test_idle_untouched_tab_is_closed_only_after_the_timeout():
+    tabs, driver = TabManager(max_tabs=1, idle_timeout=3600), FakeDriver()
+    _open(tabs, driver, "https://a.example/1")
+    with pytest.raises(TabLimitReached):
+        tabs.open_tab(driver, "https://b.example/1")
+
+    tabs.idle_timeout = 0
+    handle = _open(tabs, driver, "https://b.example/1")
+    # The last window is blanked and reused rather than closed, which would end the browser
+    assert list(driver.windows) == [handle]
+    assert driver.windows[handle] == "https://b.example/1"
@@ -0,0 +1,164 @@
+"""
+Phase Tracing
+=============
+Lightweight timed spans for the phases of the open/auto-login flow.
+
+Each span is tagged with host and outcome, written to a rotating JSONL file
+through a background queue (so the browser thread never waits on disk I/O),
+and aggregated in memory into per-phase and per-domain percentiles.
+"""
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from collections import Counter, defaultdict, deque
+from contextlib import contextmanager
+
+TRACING_ENABLED = True
+TRACE_FILE = os.path.join("traces", "spans.jsonl")
+TRACE_MAX_BYTES = 5 * 1024 * 1024
+TRACE_BACKUPS = 3
+
+# Durations kept per (phase) and per (phase, host) for percentiles
+SAMPLES_PER_KEY = 1000
+
+
+class SpanRecorder:
+    """Collects finished spans: in-memory percentiles plus a rotating JSONL file"""
+
+    def __init__(self, path=TRACE_FILE, max_bytes=TRACE_MAX_BYTES, backups=TRACE_BACKUPS):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self._lock = threading.Lock()
+        self._by_phase = defaultdict(lambda: deque(maxlen=SAMPLES_PER_KEY))
+        self._by_domain = defaultdict(lambda: deque(maxlen=SAMPLES_PER_KEY))
+        self._outcomes = defaultdict(Counter)
+        self._logger = None
+        self._listener = None
+
+    def _file_logger(self):
+        """Start the background JSONL writer on first use"""
+        if self._logger is None:
+            with self._lock:
+                if self._logger is None:
+                    directory = os.path.dirname(self.path)
+                    if directory:
+                        os.makedirs(directory, exist_ok=True)
+                    handler = logging.handlers.RotatingFileHandler(
+                        self.path, maxBytes=self.max_bytes, backupCount=self.backups, encoding="utf-8"
+                    )
+                    handler.setFormatter(logging.Formatter("%(message)s"))
+                    records = queue.SimpleQueue()
+                    self._listener = logging.handlers.QueueListener(records, handler)
+                    self._listener.start()
+
+                    logger = logging.getLogger("job_automation.spans")
+                    logger.setLevel(logging.INFO)
+                    logger.propagate = False
+                    logger.addHandler(logging.handlers.QueueHandler(records))
+                    self._logger = logger
+        return self._logger
+
+    def record(self, span):
+        phase, host = span["phase"], span.get("host") or ""
+        with self._lock:
+            self._by_phase[phase].append(span["duration_ms"])
+            self._by_domain[(phase, host)].append(span["duration_ms"])
+            self._outcomes[(phase, host)][span["outcome"]] += 1
+        try:
+            self._file_logger().info(json.dumps(span, separators=(",", ":")))
+        except OSError as e:
+            print(f"⚠️ Could not write trace span: {e}")
+
+    def summary(self, by_domain=False):
+        """Rows of [phase, host, count, p50 ms, p95 ms, outcome counts]"""
+        with self._lock:
+            if by_domain:
+                items = [(phase, host, list(samples)) for (phase, host), samples in self._by_domain.items()]
+                outcomes = {key: Counter(counts) for key, counts in self._outcomes.items()}
+            else:
+                items = [(phase, "(all)", list(samples)) for phase, samples in self._by_phase.items()]
+                outcomes = defaultdict(Counter)
+                for (phase, _), counts in self._outcomes.items():
+                    outcomes[(phase, "(all)")].update(counts)
+
+        rows = []
+        for phase, host, samples in sorted(items):
+            samples.sort()
+            rows.append([
+                phase,
+                host,
+                len(samples),
+                round(percentile(samples, 50), 1),
+                round(percentile(samples, 95), 1),
+                ", ".join(f"{outcome}: {count}" for outcome, count in
+                          outcomes.get((phase, host), Counter()).most_common()),
+            ])
+        return rows
+
+    def shutdown(self):
+        """Flush queued spans to disk"""
+        if self._listener is not None:
+            self._listener.stop()
+            self._listener = None
+
+
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_samples:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_samples) + 0.5)) - 1, 0)
+    return sorted_samples[min(rank, len(sorted_samples) - 1)]
+
+
+class Span:
+    """A running span; set .outcome / .tags before it closes"""
+
+    __slots__ = ("phase", "host", "outcome", "tags", "started")
+
+    def __init__(self, phase, host, tags):
+        self.phase = phase
+        self.host = host
+        self.outcome = "ok"
+        self.tags = tags
+        self.started = time.perf_counter()
+
+
+RECORDER = SpanRecorder()
+atexit.register(RECORDER.shutdown)
+
+
+def record_span(phase, started, host="", outcome="ok", **tags):
+    """Record a span timed by the caller (started is a time.perf_counter() value)"""
+    if not TRACING_ENABLED:
+        return
+    record = {
+        "ts": round(time.time(), 3),
+        "phase": phase,
+        "host": host,
+        "outcome": outcome,
+        "duration_ms": round((time.perf_counter() - started) * 1000, 2),
+    }
+    if tags:
+        record["tags"] = tags
+    RECORDER.record(record)
+
+
+@contextmanager
+def span(phase, host="", **tags):
+    """Time a phase: `with span("navigation", host=host) as s: ...`"""
+    current = Span(phase, host, tags)
+    try:
+        yield current
+    except BaseException:
+        if current.outcome == "ok":
+            current.outcome = "error"
+        raise
+    finally:
+        record_span(current.phase, current.started, current.host, current.outcome, **current.tags)